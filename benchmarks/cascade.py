@@ -0,0 +1,65 @@
+"""
+Compare the cost of the inference cascade with the full ensemble: the
+cascade should send far fewer texts to the transformer. That both give the
+same combined labels is checked by tests/test_cascade.py.
+
+Usage:
+    python -m benchmarks.cascade --reviews 10000
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+from opinion_mining.records import Review
+from opinion_mining.sentiment_analysis.sentiment_analyzer import PATH_CHEAP, SentimentAnalyzer
+from .corpus import make_corpus
+
+def make_reviews(size: int, seed: int = 42) -> List[Review]:
+    """Build processed reviews with ratings skewed like a typical product page."""
+    rng = random.Random(seed)
+    reviews = []
+    for text in make_corpus(size, seed):
+        reviews.append(Review(
+            rating=rng.choices([1.0, 2.0, 3.0, 4.0, 5.0], weights=[10, 5, 10, 25, 50])[0],
+            text=text,
+            processed_text=re.sub(r'[^a-z\s]', '', text.lower())
+        ))
+    return reviews
+
+def run(analyzer: SentimentAnalyzer, reviews: List[Review]):
+    # Count the texts that actually reach the model
+    counted = {'texts': 0}
+    run_batch = analyzer._analyze_transformer_batch
+
+    def counting_batch(texts):
+        counted['texts'] += len(texts)
+        return run_batch(texts)
+
+    analyzer._analyze_transformer_batch = counting_batch
+    start = time.perf_counter()
+    analyzed = analyzer.analyze_sentiment([review.copy() for review in reviews])
+    elapsed = time.perf_counter() - start
+    del analyzer._analyze_transformer_batch
+    return analyzed, counted['texts'], elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=10000)
+    args = parser.parse_args()
+
+    reviews = make_reviews(args.reviews)
+    analyzer = SentimentAnalyzer()
+
+    _, full_texts, full_time = run(analyzer, reviews)
+    analyzer.cascade = True
+    cascade, cascade_texts, cascade_time = run(analyzer, reviews)
+
+    cheap = sum(1 for review in cascade if review.sentiment.path == PATH_CHEAP)
+    print(f"reviews:                {len(reviews)}")
+    print(f"full ensemble:          {full_time:.2f}s, {full_texts} texts through the transformer")
+    print(f"cascade:                {cascade_time:.2f}s, {cascade_texts} texts through the transformer")
+    print(f"cheap path:             {cheap} reviews ({cheap / max(len(reviews), 1):.0%})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark the batch ensemble combiner against per-review _combine_sentiments.
+
+That both give the same results, ties included, is checked by
+tests/test_combine.py.
+
+Usage:
+    python -m benchmarks.combine --reviews 100000
+"""
+import argparse
+import random
+import time
+from typing import List
+from opinion_mining.records import Label, Sentiment, SentimentResult
+from opinion_mining.sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
+
+def make_sentiments(size: int, seed: int = 42) -> List[Sentiment]:
+    """Build per-method results with missing methods and many exact ties."""
+    rng = random.Random(seed)
+    # Coarse scores make equal weighted sums (ties) common
+    scores = [0.0, 0.1, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0]
+
+    def result(present: float):
+        if rng.random() > present:
+            return None
+        return SentimentResult(rng.choice(list(Label)), rng.choice(scores + [rng.random()]))
+
+    return [Sentiment(result(0.95), result(0.9), result(0.95)) for _ in range(size)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=100000)
+    args = parser.parse_args()
+
+    sentiments = make_sentiments(args.reviews)
+    analyzer = SentimentAnalyzer()
+
+    start = time.perf_counter()
+    for s in sentiments:
+        analyzer._combine_sentiments(s.textblob, s.transformer, s.rating)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer._combine_batch(sentiments)
+    batch_time = time.perf_counter() - start
+
+    print(f"reviews:                {len(sentiments)}")
+    print(f"_combine_sentiments:    {reference_time:.2f}s ({len(sentiments) / reference_time:,.0f} reviews/s)")
+    print(f"_combine_batch:         {batch_time:.2f}s ({len(sentiments) / batch_time:,.0f} reviews/s)")
+    print(f"speedup:                {reference_time / batch_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
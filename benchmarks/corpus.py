@@ -0,0 +1,41 @@
+"""Deterministic corpora shared by the benchmarks and the parity tests."""
+import random
+from typing import Dict, Iterator, List, Tuple
+from opinion_mining.data_collection.review_scraper import ReviewScraper
+from opinion_mining.records import Review
+
+def _reshuffled(size: int, seed: int) -> Iterator[Tuple[Dict, str]]:
+    # Each item is a random sample review with its sentences reshuffled
+    rng = random.Random(seed)
+    templates = [review for reviews in ReviewScraper().sample_data.values() for review in reviews]
+    for _ in range(size):
+        template = rng.choice(templates)
+        sentences = template['text'].split('. ')
+        rng.shuffle(sentences)
+        yield template, '. '.join(sentences)
+
+def make_corpus(size: int, seed: int = 42) -> List[str]:
+    """Build a deterministic corpus by reshuffling the sentences of the sample reviews."""
+    return [text for _, text in _reshuffled(size, seed)]
+
+def make_reviews(size: int, seed: int = 42) -> List[Review]:
+    """
+    Build make_corpus's texts as reviews.
+
+    Args:
+        size (int): Number of reviews
+        seed (int): Random seed
+
+    Returns:
+        List[Review]: Reviews keeping their template's rating, title, date and verified flag
+    """
+    return [
+        Review(
+            rating=template['rating'],
+            title=template['title'],
+            text=text,
+            date=template['date'],
+            verified=template['verified']
+        )
+        for template, text in _reshuffled(size, seed)
+    ]
@@ -0,0 +1,117 @@
+"""
+Check the import time budget of the web app.
+
+Imports a module in fresh interpreters with ``python -X importtime`` and
+fails if its median cumulative import time exceeds the budget, or if any
+heavy dependency (model runtimes, NLTK, pandas, HTML parsing) is imported
+eagerly instead of on first use.
+
+Usage:
+    python -m benchmarks.import_time --budget-ms 750
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_MODULE = 'opinion_mining.app'
+DEFAULT_BUDGET_MS = 750.0
+DEFAULT_REPEAT = 5
+
+# Loaded by the components that need them, never by importing the app
+LAZY_MODULES = ('transformers', 'torch', 'onnxruntime', 'textblob', 'nltk', 'pandas', 'bs4', 'lxml', 'requests')
+
+_LINE_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def parse_importtime(log: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse the stderr of ``python -X importtime``.
+
+    Args:
+        log (str): Import time log
+
+    Returns:
+        List[Tuple[str, int, int]]: (module, cumulative microseconds, nesting
+            depth) per imported module, in log order
+    """
+    entries = []
+    for match in _LINE_RE.finditer(log):
+        _, cumulative, indent, module = match.groups()
+        entries.append((module, int(cumulative), len(indent) // 2))
+    return entries
+
+def measure(module: str = DEFAULT_MODULE) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        Tuple[float, List]: Cumulative import time of the module (ms) and the
+            parsed import time log
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    entries = parse_importtime(result.stderr)
+    for name, cumulative, depth in entries:
+        if name == module and depth == 0:
+            return cumulative / 1000, entries
+    raise RuntimeError(f"{module} is missing from the import time log")
+
+def eager_imports(entries: List[Tuple[str, int, int]], lazy_modules=LAZY_MODULES) -> List[str]:
+    """Top-level packages in lazy_modules that were imported."""
+    imported = {name.split('.')[0] for name, _, _ in entries}
+    return [name for name in lazy_modules if name in imported]
+
+def slowest_imports(entries: List[Tuple[str, int, int]], module: str, limit: int = 10) -> List[Tuple[str, float]]:
+    """The direct imports of a module with the highest cumulative time (ms)."""
+    children: Dict[str, float] = {}
+    # -X importtime logs a module after its own imports, one level deeper
+    pending = []
+    for name, cumulative, depth in entries:
+        if name == module and depth == 0:
+            children = {child: micros / 1000 for child, micros, child_depth in pending if child_depth == 1}
+            break
+        pending = [] if depth == 0 else pending + [(name, cumulative, depth)]
+    return sorted(children.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default=DEFAULT_MODULE)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+
+    # One untimed import writes the bytecode caches
+    measure(args.module)
+    timings = []
+    for _ in range(max(1, args.repeat)):
+        milliseconds, entries = measure(args.module)
+        timings.append(milliseconds)
+    median = statistics.median(timings)
+
+    print(f"import {args.module}: median {median:.0f} ms over {len(timings)} runs (budget {args.budget_ms:.0f} ms)")
+    for name, milliseconds in slowest_imports(entries, args.module):
+        print(f"  {name:<50} {milliseconds:>8.1f} ms")
+
+    failed = False
+    eager = eager_imports(entries)
+    if eager:
+        print(f"Imported eagerly: {', '.join(eager)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"Import time over budget by {median - args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Benchmark the compiled lexicon scorer against per-review TextBlob.
+
+Polarity parity is checked by tests/test_lexicon_scorer.py.
+
+Usage:
+    python -m benchmarks.lexicon --reviews 100000
+"""
+import argparse
+import re
+import time
+from textblob import TextBlob
+from opinion_mining.sentiment_analysis.lexicon_scorer import LexiconScorer
+from .corpus import make_corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=100000)
+    args = parser.parse_args()
+
+    # Shaped like TextProcessor output: lowercase letters and spaces
+    texts = [re.sub(r'[^a-z\s]', '', text.lower()) for text in make_corpus(args.reviews)]
+
+    start = time.perf_counter()
+    scorer = LexiconScorer()
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        TextBlob(text).sentiment
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scorer.polarity(texts)
+    scorer_time = time.perf_counter() - start
+
+    print(f"reviews:                {len(texts)}")
+    print(f"lexicon compile:        {compile_time:.2f}s (once per analyzer)")
+    print(f"TextBlob:               {reference_time:.2f}s ({len(texts) / reference_time:,.0f} reviews/s)")
+    print(f"LexiconScorer:          {scorer_time:.2f}s ({len(texts) / scorer_time:,.0f} reviews/s)")
+    print(f"speedup:                {reference_time / scorer_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark TextProcessor's batch preprocessing against the per-text reference.
+
+Output parity is checked by tests/test_preprocessing.py.
+
+Usage:
+    python -m benchmarks.preprocessing --reviews 100000
+"""
+import argparse
+import re
+import time
+from nltk.tokenize import word_tokenize
+from opinion_mining.preprocessing.text_processor import TextProcessor
+from .corpus import make_corpus
+
+def reference_preprocess(processor: TextProcessor, text: str) -> str:
+    """The original per-text implementation: regex, word_tokenize and uncached lemmatization."""
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    tokens = word_tokenize(text)
+    tokens = [processor.lemmatizer.lemmatize(token) for token in tokens if token not in processor.stop_words]
+    return ' '.join(tokens)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=100000)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.reviews)
+    processor = TextProcessor()
+
+    start = time.perf_counter()
+    for text in corpus:
+        reference_preprocess(processor, text)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    processor.preprocess_texts(corpus)
+    batch_time = time.perf_counter() - start
+
+    print(f"reviews:         {len(corpus)}")
+    print(f"reference:       {reference_time:.2f}s ({len(corpus) / reference_time:,.0f} reviews/s)")
+    print(f"preprocess_texts {batch_time:.2f}s ({len(corpus) / batch_time:,.0f} reviews/s)")
+    print(f"speedup:         {reference_time / batch_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Measure the memory held by analyzed reviews as Review records versus the
+nested dicts the pipeline used to build.
+
+Usage:
+    python -m benchmarks.records --reviews 100000
+"""
+import argparse
+import random
+import tracemalloc
+from typing import Callable, Dict, List
+from opinion_mining.records import Label, Review, Sentiment, SentimentResult
+from .corpus import make_corpus
+
+def make_rows(size: int, seed: int = 42) -> List[Dict]:
+    """Build the inputs and per-method (label, score) outcomes of analyzed reviews."""
+    rng = random.Random(seed)
+    labels = ['positive', 'negative', 'neutral']
+    rows = []
+    for text in make_corpus(size, seed):
+        rating = rng.choice([1.0, 2.0, 3.0, 4.0, 5.0])
+        rows.append({
+            'rating': rating,
+            'title': text[:30],
+            'text': text,
+            'date': '2024-03-15',
+            'verified': rng.random() < 0.8,
+            'processed_text': text.lower(),
+            'textblob': (rng.choice(labels), rng.random()),
+            'transformer': (rng.choice(labels), rng.random()),
+            'rating_sentiment': ('positive' if rating >= 4 else 'negative' if rating <= 2 else 'neutral', rating / 5)
+        })
+    return rows
+
+def as_dicts(rows: List[Dict]) -> List[Dict]:
+    """The old layout: a dict per review, with copied result dicts repeated under combined['details']."""
+    reviews = []
+    for row in rows:
+        textblob = {'label': row['textblob'][0], 'score': row['textblob'][1]}
+        transformer = {'label': row['transformer'][0], 'score': row['transformer'][1]}
+        rating = {'label': row['rating_sentiment'][0], 'score': row['rating_sentiment'][1]}
+        reviews.append({
+            'rating': row['rating'],
+            'title': row['title'],
+            'text': row['text'],
+            'date': row['date'],
+            'verified': row['verified'],
+            'processed_text': row['processed_text'],
+            'is_potentially_fake': False,
+            'duplicate_cluster_id': None,
+            'sentiment': {
+                'textblob': textblob,
+                'transformer': transformer,
+                'rating': rating,
+                'combined': {
+                    'label': transformer['label'],
+                    'score': transformer['score'],
+                    'details': {
+                        'textblob': dict(textblob),
+                        'transformer': dict(transformer),
+                        'rating': dict(rating)
+                    }
+                }
+            }
+        })
+    return reviews
+
+def as_records(rows: List[Dict]) -> List[Review]:
+    """The record layout: slotted reviews holding shared Label members and immutable results."""
+    reviews = []
+    for row in rows:
+        transformer = SentimentResult(Label.parse(row['transformer'][0]), row['transformer'][1])
+        reviews.append(Review(
+            rating=row['rating'],
+            title=row['title'],
+            text=row['text'],
+            date=row['date'],
+            verified=row['verified'],
+            processed_text=row['processed_text'],
+            is_potentially_fake=False,
+            sentiment=Sentiment(
+                textblob=SentimentResult(Label.parse(row['textblob'][0]), row['textblob'][1]),
+                transformer=transformer,
+                rating=SentimentResult(Label.parse(row['rating_sentiment'][0]), row['rating_sentiment'][1]),
+                combined=transformer
+            )
+        ))
+    return reviews
+
+def measure(build: Callable, rows: List[Dict]) -> int:
+    """Bytes still allocated after building the reviews (the texts are shared, so not counted)."""
+    tracemalloc.start()
+    reviews = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del reviews
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.reviews)
+    dict_bytes = measure(as_dicts, rows)
+    record_bytes = measure(as_records, rows)
+
+    print(f"reviews:                {len(rows)}")
+    print(f"nested dicts:           {dict_bytes / 2 ** 20:.1f} MiB ({dict_bytes / len(rows):.0f} bytes/review)")
+    print(f"Review records:         {record_bytes / 2 ** 20:.1f} MiB ({record_bytes / len(rows):.0f} bytes/review)")
+    print(f"reduction:              {1 - record_bytes / dict_bytes:.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+"""
+Reproducible benchmark suite for preprocessing, inference and /predict.
+
+Every case runs over deterministic synthetic corpora built from the
+ReviewScraper sample reviews, in a fresh process so that peak RSS belongs
+to that case alone. Results are written as JSON; compare two result files
+to fail on regressions.
+
+Usage:
+    python -m benchmarks.suite run --sizes 10 1000 100000 --output results.json
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from opinion_mining.records import Review
+from .corpus import make_reviews
+
+DEFAULT_SIZES = (10, 1000, 100000)
+DEFAULT_BATCH_SIZE = 32
+# /predict runs the whole pipeline per request, so large corpora are capped
+DEFAULT_MAX_REQUESTS = 100
+DEFAULT_THRESHOLD = 0.1
+
+# Recorded with every run, so results from different environments are not compared blindly
+_PACKAGES = ('numpy', 'pandas', 'nltk', 'textblob', 'transformers', 'torch', 'onnxruntime', 'flask')
+
+def _batches(items: List, batch_size: int) -> List[List]:
+    return [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+# Each case builds its components untimed and returns the units of work and
+# a function running one unit, which returns the number of reviews it covered
+
+def _case_preprocess_text(reviews: List[Review], options: Dict):
+    from opinion_mining.preprocessing.text_processor import TextProcessor
+
+    processor = TextProcessor()
+
+    def run(text):
+        processor._preprocess_text(text)
+        return 1
+    return [review.text for review in reviews], run
+
+def _case_detect_fake_reviews(reviews: List[Review], options: Dict):
+    from opinion_mining.preprocessing.text_processor import TextProcessor
+
+    processor = TextProcessor()
+
+    def run(batch):
+        processor.detect_fake_reviews(batch)
+        return len(batch)
+    return _batches(reviews, options['batch_size']), run
+
+def _processed_texts(reviews: List[Review]) -> List[str]:
+    from opinion_mining.preprocessing.text_processor import TextProcessor
+
+    return TextProcessor().preprocess_texts([review.text for review in reviews])
+
+def _case_textblob(reviews: List[Review], options: Dict):
+    from opinion_mining.sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+
+    def run(batch):
+        analyzer._analyze_textblob_batch(batch)
+        return len(batch)
+    return _batches(_processed_texts(reviews), options['batch_size']), run
+
+def _case_transformer(reviews: List[Review], options: Dict):
+    from opinion_mining.sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+    if analyzer.transformer_analyzer is None:
+        raise RuntimeError("transformer model could not be loaded")
+
+    def run(batch):
+        analyzer._run_transformer_batch(batch)
+        return len(batch)
+    return _batches(_processed_texts(reviews), options['batch_size']), run
+
+def _case_rating(reviews: List[Review], options: Dict):
+    from opinion_mining.sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+
+    def run(batch):
+        for rating in batch:
+            analyzer._get_rating_sentiment(rating)
+        return len(batch)
+    return _batches([review.rating for review in reviews], options['batch_size']), run
+
+def _case_predict(reviews: List[Review], options: Dict):
+    from flask import template_rendered
+    from opinion_mining.app import app
+
+    client = app.test_client()
+    # /predict reports failures on the rendered page with HTTP 200, so the
+    # template context is checked instead of the status code
+    errors = []
+
+    def record_error(sender, template, context, **extra):
+        if context.get('error'):
+            errors.append(context['error'])
+    template_rendered.connect(record_error, app, weak=False)
+
+    def run(text):
+        response = client.post('/predict', data={'review_text': text})
+        if response.status_code != 200:
+            raise RuntimeError(f"/predict returned {response.status_code}")
+        if errors:
+            raise RuntimeError(f"/predict failed: {errors[-1]}")
+        return 1
+    return [review.text for review in reviews[:options['max_requests']]], run
+
+CASES: Dict[str, Callable] = {
+    'preprocess_text': _case_preprocess_text,
+    'detect_fake_reviews': _case_detect_fake_reviews,
+    'textblob': _case_textblob,
+    'transformer': _case_transformer,
+    'rating': _case_rating,
+    'predict': _case_predict
+}
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+def run_case(case: str, size: int, options: Dict) -> Dict:
+    """
+    Time one case over a corpus of the given size.
+
+    Args:
+        case (str): Name in CASES
+        size (int): Corpus size
+        options (Dict): batch_size, max_requests and seed
+
+    Returns:
+        Dict: Throughput (reviews/s), p50/p95/p99 latency per unit of work (ms),
+            and the process's peak RSS (MB)
+    """
+    reviews = make_reviews(size, options['seed'])
+    units, run = CASES[case](reviews, options)
+    if not units:
+        return {'case': case, 'size': size, 'skipped': 'empty corpus'}
+
+    # One untimed unit loads lazy state (lexicons, model graphs, caches)
+    run(units[0])
+
+    latencies = []
+    items = 0
+    start = time.perf_counter()
+    for unit in units:
+        unit_start = time.perf_counter()
+        items += run(unit)
+        latencies.append(time.perf_counter() - unit_start)
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99]).tolist()
+    return {
+        'case': case,
+        'size': size,
+        'units': len(units),
+        'reviews': items,
+        'seconds': elapsed,
+        'throughput': items / elapsed if elapsed else None,
+        'latency_ms': {'p50': p50, 'p95': p95, 'p99': p99},
+        'peak_rss_mb': _peak_rss_mb()
+    }
+
+def _stdout_to_stderr():
+    # The app logs to stdout, where the report may be printed; redirecting
+    # the descriptor also covers handlers created before this runs
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+def _run_isolated(case: str, size: int, options: Dict) -> Dict:
+    # A fresh interpreter per case keeps peak RSS and warm caches from
+    # leaking between cases
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn'),
+                             initializer=_stdout_to_stderr) as executor:
+        try:
+            return executor.submit(run_case, case, size, options).result()
+        except Exception as e:
+            return {'case': case, 'size': size, 'skipped': str(e)}
+
+def environment() -> Dict:
+    """Interpreter, platform and dependency versions of this run."""
+    versions = {}
+    for package in _PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'packages': versions
+    }
+
+def run_suite(cases: List[str], sizes: List[int], options: Dict) -> Dict:
+    results = []
+    for case in cases:
+        for size in sizes:
+            result = _run_isolated(case, size, options)
+            if 'skipped' in result:
+                print(f"{case:<20} {size:>7}  skipped: {result['skipped']}", file=sys.stderr)
+            else:
+                print(f"{case:<20} {size:>7}  {result['throughput']:>12,.0f} reviews/s  "
+                      f"p95 {result['latency_ms']['p95']:.3f} ms  {result['peak_rss_mb']:.0f} MB", file=sys.stderr)
+            results.append(result)
+    return {'environment': environment(), 'options': options, 'results': results}
+
+def _changes(baseline: Dict, current: Dict) -> List[Tuple[str, float]]:
+    # Relative change of each metric, signed so that positive is worse
+    changes = []
+    if baseline.get('throughput') and current.get('throughput'):
+        changes.append(('throughput', baseline['throughput'] / current['throughput'] - 1))
+    for percentile in ('p50', 'p95', 'p99'):
+        before, after = baseline['latency_ms'][percentile], current['latency_ms'][percentile]
+        if before:
+            changes.append((percentile, after / before - 1))
+    if baseline.get('peak_rss_mb'):
+        changes.append(('peak_rss', current['peak_rss_mb'] / baseline['peak_rss_mb'] - 1))
+    return changes
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD,
+            metrics: Optional[List[str]] = None) -> List[str]:
+    """
+    Find regressions between two suite results.
+
+    Args:
+        baseline (Dict): Earlier run_suite output
+        current (Dict): Later run_suite output
+        threshold (float): Tolerated relative slowdown / growth (0.1 = 10%)
+        metrics (List[str]): Metrics to check (default: throughput, p95 and peak_rss)
+
+    Returns:
+        List[str]: One description per regression (empty if none)
+    """
+    metrics = metrics or ['throughput', 'p95', 'peak_rss']
+    after = {(result['case'], result['size']): result for result in current['results']}
+    regressions = []
+    for result in baseline['results']:
+        key = (result['case'], result['size'])
+        if 'skipped' in result:
+            continue
+        # A case that stopped running is worse than any slowdown
+        if key not in after:
+            regressions.append(f"{key[0]} (size {key[1]}): missing from the current run")
+            continue
+        if 'skipped' in after[key]:
+            regressions.append(f"{key[0]} (size {key[1]}): skipped in the current run ({after[key]['skipped']})")
+            continue
+        for metric, change in _changes(result, after[key]):
+            if metric in metrics and change > threshold:
+                regressions.append(f"{key[0]} (size {key[1]}): {metric} {change:+.1%} worse")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the suite and write JSON results')
+    run_parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    run_parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    run_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    run_parser.add_argument('--max-requests', type=int, default=DEFAULT_MAX_REQUESTS)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--output', help='JSON file (default: stdout)')
+
+    compare_parser = commands.add_parser('compare', help='Fail if results regressed against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.add_argument('--metrics', nargs='+', choices=['throughput', 'p50', 'p95', 'p99', 'peak_rss'])
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        options = {'batch_size': args.batch_size, 'max_requests': args.max_requests, 'seed': args.seed}
+        report = json.dumps(run_suite(args.cases, args.sizes, options), indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(report + '\n')
+        else:
+            print(report)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold, args.metrics)
+    for regression in regressions:
+        print(regression)
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
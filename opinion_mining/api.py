@@ -0,0 +1,290 @@
+import json
+import os
+import secrets
+from typing import Dict, Iterator, List, Optional
+from flask import Blueprint, Response, jsonify, request, stream_with_context, url_for
+from .jobs import KIND_REVIEWS, KIND_URL, SUCCEEDED
+from .records import Review
+from .registry import get_analyzer, get_job_store, get_job_workers, get_processor
+from .streaming import RunningSummary, StreamingPipeline, result_record
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+jobs_api = Blueprint('jobs', __name__, url_prefix='/jobs')
+
+DEFAULT_MAX_BODY_BYTES = 16 * 2 ** 20
+DEFAULT_MAX_REVIEWS = 10000
+DEFAULT_MAX_JOB_REVIEWS = 100000
+
+JSON_TYPES = ('application/json',)
+NDJSON_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/json-seq')
+
+class ApiError(Exception):
+    """A request the API rejects, with the HTTP status to reject it with."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+@api.errorhandler(ApiError)
+@jobs_api.errorhandler(ApiError)
+def handle_api_error(error: ApiError):
+    return jsonify({'error': str(error)}), error.status
+
+def _limits(max_reviews_env: str = 'API_MAX_REVIEWS', max_reviews: int = DEFAULT_MAX_REVIEWS) -> Dict[str, int]:
+    return {
+        'max_body_bytes': int(os.environ.get('API_MAX_BODY_BYTES', DEFAULT_MAX_BODY_BYTES)),
+        'max_reviews': int(os.environ.get(max_reviews_env, max_reviews))
+    }
+
+def _check_content_length(limits: Dict[str, int]):
+    if request.content_length is not None and request.content_length > limits['max_body_bytes']:
+        raise ApiError(f"Request body exceeds {limits['max_body_bytes']} bytes", 413)
+
+def review_from_json(data, position: int) -> Review:
+    """
+    Validate one review of a request body.
+
+    Args:
+        data: Decoded JSON value
+        position (int): Index of the review in the body, for error messages
+
+    Returns:
+        Review: Review with rating 0.0 and empty fields where they were left out
+
+    Raises:
+        ApiError: If the value is not an object with a string text and a numeric rating
+    """
+    if not isinstance(data, dict):
+        raise ApiError(f"Review {position} must be a JSON object")
+    text = data.get('text')
+    if not isinstance(text, str):
+        raise ApiError(f"Review {position} needs a string 'text'")
+    rating = data.get('rating')
+    if rating is None:
+        rating = 0.0
+    elif isinstance(rating, bool) or not isinstance(rating, (int, float)):
+        raise ApiError(f"Review {position} has a non-numeric 'rating'")
+    return Review(
+        rating=float(rating),
+        title=str(data.get('title') or ''),
+        text=text,
+        date=str(data.get('date') or ''),
+        verified=bool(data.get('verified', False))
+    )
+
+def _read_json_body(stream, limits: Dict[str, int]):
+    # A JSON document has to be parsed whole; the body limit bounds it
+    body = stream.read(limits['max_body_bytes'] + 1)
+    if len(body) > limits['max_body_bytes']:
+        raise ApiError(f"Request body exceeds {limits['max_body_bytes']} bytes", 413)
+    try:
+        return json.loads(body) if body else []
+    except ValueError as e:
+        raise ApiError(f"Invalid JSON: {str(e)}")
+
+def _json_reviews(data, limits: Dict[str, int]) -> List[Review]:
+    if isinstance(data, dict):
+        data = data.get('reviews')
+    if not isinstance(data, list):
+        raise ApiError("Body must be a JSON array of reviews or an object with a 'reviews' array")
+    if len(data) > limits['max_reviews']:
+        raise ApiError(f"Request has more than {limits['max_reviews']} reviews", 413)
+    return [review_from_json(item, position) for position, item in enumerate(data)]
+
+def iter_ndjson_reviews(stream, limits: Dict[str, int]) -> Iterator[Review]:
+    """
+    Parse reviews from an NDJSON body as it is read.
+
+    Lines are only read when the pipeline asks for the next review, so a
+    large body is never held in memory. Limits are checked as lines arrive.
+
+    Args:
+        stream: Binary request body
+        limits (Dict[str, int]): max_body_bytes and max_reviews
+
+    Yields:
+        Review: Reviews, in body order
+
+    Raises:
+        ApiError: On invalid lines or once a limit is exceeded
+    """
+    received = 0
+    position = 0
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        received += len(line)
+        if received > limits['max_body_bytes']:
+            raise ApiError(f"Request body exceeds {limits['max_body_bytes']} bytes", 413)
+        if not line.strip():
+            continue
+        if position >= limits['max_reviews']:
+            raise ApiError(f"Request has more than {limits['max_reviews']} reviews", 413)
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            raise ApiError(f"Invalid JSON in review {position}: {str(e)}")
+        yield review_from_json(data, position)
+        position += 1
+
+def _stream_results(pipeline: StreamingPipeline, reviews) -> Iterator[str]:
+    # The pipeline's bounded queues only drain as fast as this generator is
+    # consumed, i.e. as fast as the client reads the response
+    summary = RunningSummary()
+    try:
+        for index, review in enumerate(pipeline.iter_results(reviews)):
+            summary.update(review)
+            yield json.dumps(result_record(index, review), default=str) + '\n'
+    except ApiError as e:
+        # Raised while reading an NDJSON body; the results so far were already sent
+        yield json.dumps({'error': str(e), 'status': e.status}) + '\n'
+        return
+    except Exception as e:
+        logger.error(f"Error streaming analysis results: {str(e)}", exc_info=True)
+        yield json.dumps({'error': f"Analysis failed: {str(e)}", 'status': 500}) + '\n'
+        return
+    yield json.dumps({'summary': summary.as_dict()}) + '\n'
+
+@api.route('/analyze', methods=['POST'])
+def analyze():
+    """
+    Analyze many reviews and stream the results as NDJSON.
+
+    Accepts a JSON array of reviews (or {"reviews": [...]}) or NDJSON, one
+    review per line; each review needs a 'text' and may have a 'rating',
+    'title', 'date' and 'verified'. Each result line has the review's index
+    in the request, and the last line is {"summary": {...}}.
+    """
+    limits = _limits()
+    _check_content_length(limits)
+
+    content_type = request.mimetype
+    if content_type in JSON_TYPES:
+        reviews = _json_reviews(_read_json_body(request.stream, limits), limits)
+    elif content_type in NDJSON_TYPES:
+        reviews = iter_ndjson_reviews(request.stream, limits)
+    else:
+        raise ApiError(f"Unsupported content type {content_type!r}; send application/json or application/x-ndjson", 415)
+
+    pipeline = StreamingPipeline(
+        get_processor(),
+        get_analyzer(),
+        batch_size=int(os.environ.get('STREAM_BATCH_SIZE', 64)),
+        queue_size=int(os.environ.get('STREAM_QUEUE_SIZE', 4))
+    )
+    logger.info(f"Streaming bulk analysis ({content_type})")
+    return Response(
+        stream_with_context(_stream_results(pipeline, reviews)),
+        mimetype='application/x-ndjson',
+        # Keep reverse proxies from buffering the whole stream
+        headers={'X-Accel-Buffering': 'no'}
+    )
+
+def _job_links(job_id: str) -> Dict[str, str]:
+    return {
+        'status': url_for('jobs.job_status', job_id=job_id),
+        'results': url_for('jobs.job_results', job_id=job_id)
+    }
+
+def _url_job_payload(data: Dict, limits: Dict[str, int]) -> Dict:
+    product_url = data.get('product_url')
+    if not isinstance(product_url, str) or not product_url:
+        raise ApiError("'product_url' must be a non-empty string")
+    max_reviews = data.get('max_reviews', limits['max_reviews'])
+    if isinstance(max_reviews, bool) or not isinstance(max_reviews, int) or max_reviews < 1:
+        raise ApiError("'max_reviews' must be a positive integer")
+    if max_reviews > limits['max_reviews']:
+        raise ApiError(f"'max_reviews' is larger than {limits['max_reviews']}", 413)
+    incremental = data.get('incremental', False)
+    if not isinstance(incremental, bool):
+        raise ApiError("'incremental' must be a boolean")
+    return {'product_url': product_url, 'max_reviews': max_reviews, 'incremental': incremental}
+
+@jobs_api.route('', methods=['POST'])
+def submit_job():
+    """
+    Queue a product URL or a batch of reviews for analysis by the job workers.
+
+    Accepts {"product_url": ..., "max_reviews": ..., "incremental": ...},
+    {"reviews": [...]} (or a JSON array of reviews), or NDJSON reviews.
+    Responds 202 with the job's status, the URLs to poll it and fetch its
+    results, and the token to send with those requests as
+    "Authorization: Bearer <token>".
+    """
+    limits = _limits('JOBS_MAX_REVIEWS', DEFAULT_MAX_JOB_REVIEWS)
+    _check_content_length(limits)
+
+    content_type = request.mimetype
+    data = None
+    if content_type in NDJSON_TYPES:
+        reviews = list(iter_ndjson_reviews(request.stream, limits))
+    elif content_type in JSON_TYPES:
+        data = _read_json_body(request.stream, limits)
+        if not (isinstance(data, dict) and 'product_url' in data):
+            reviews = _json_reviews(data, limits)
+    else:
+        raise ApiError(f"Unsupported content type {content_type!r}; send application/json or application/x-ndjson", 415)
+
+    # Only the submitter, holding this token, can see the job and its results
+    token = secrets.token_urlsafe(32)
+    if isinstance(data, dict) and 'product_url' in data:
+        job = get_job_store().submit(KIND_URL, _url_job_payload(data, limits), token=token)
+    else:
+        job = get_job_store().submit(KIND_REVIEWS, {'reviews': [review.to_dict() for review in reviews]},
+                                     total=len(reviews), token=token)
+    # Builds this process's worker threads on first use (none with JOBS_WORKERS=0)
+    get_job_workers().notify()
+    logger.info(f"Queued job {job.id} ({job.kind})")
+
+    links = _job_links(job.id)
+    response = jsonify({'job': job.to_dict(), 'token': token, 'links': links})
+    response.status_code = 202
+    response.headers['Location'] = links['status']
+    return response
+
+def _job_token() -> Optional[str]:
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    return token.strip() if scheme.lower() == 'bearer' else None
+
+def _get_job(job_id: str):
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise ApiError(f"Unknown job {job_id}", 404)
+    if not job.owned_by(_job_token()):
+        raise ApiError(f"Job {job_id} belongs to another client", 403)
+    return job
+
+@jobs_api.route('/<job_id>', methods=['GET'])
+def job_status(job_id: str):
+    """Status and progress of a job (processed reviews, total if known)."""
+    job = _get_job(job_id)
+    return jsonify({'job': job.to_dict(), 'links': _job_links(job.id)})
+
+@jobs_api.route('/<job_id>/results', methods=['GET'])
+def job_results(job_id: str):
+    """
+    Stream a finished job's results as NDJSON, like /api/v1/analyze.
+
+    Query parameters offset and limit select a range of results; the last
+    line is {"summary": {...}}. Responds 409 while the job has not succeeded.
+    """
+    job = _get_job(job_id)
+    if job.status != SUCCEEDED:
+        return jsonify({'error': f"Job {job.id} is {job.status}", 'job': job.to_dict()}), 409
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', None, type=int)
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ApiError("'offset' and 'limit' must not be negative")
+
+    store = get_job_store()
+
+    def generate():
+        for result in store.iter_results(job.id, offset=offset, limit=limit):
+            yield result + '\n'
+        yield json.dumps({'summary': job.summary}) + '\n'
+
+    return Response(generate(), mimetype='application/x-ndjson', headers={'X-Accel-Buffering': 'no'})
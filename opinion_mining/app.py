@@ -1,22 +1,56 @@
-from flask import Flask, render_template, request, jsonify
-from .data_collection.review_scraper import ReviewScraper
-from .preprocessing.text_processor import TextProcessor
-from .sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
-from .utils.logger import setup_logger
+from flask import Flask, Response, g, render_template, request, jsonify
+from .api import api, jobs_api
+from .records import Label, Review
+from .registry import registry, env_flag, get_scraper, get_processor, get_analyzer
+from .utils.logger import request_id, setup_logger
+from .utils.metrics import ENABLED as METRICS_ENABLED, instrumented, metrics
 import json
 import os
-import traceback
+import uuid
 
 # Get the absolute path to the templates directory
 template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'templates'))
 app = Flask(__name__, template_folder=template_dir)
+app.register_blueprint(api)
+app.register_blueprint(jobs_api)
 logger = setup_logger()
 
+# Load and warm the shared models once per worker instead of on first request
+if env_flag('WARM_START'):
+    registry.warm_up()
+
+@app.before_request
+def bind_request_id():
+    # Reuse the caller's id (e.g. from a load balancer) so log lines can be correlated
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.request_id_token = request_id.set(g.request_id)
+
+@app.after_request
+def add_request_id_header(response):
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    return response
+
+@app.teardown_request
+def unbind_request_id(exc):
+    # Streamed responses tear the request down again once the stream ends
+    token = g.pop('request_id_token', None)
+    if token is not None:
+        request_id.reset(token)
+
 @app.route('/')
 def home():
     return render_template('index.html')
 
+@app.route('/metrics')
+def metrics_endpoint():
+    # Prometheus text format; per worker process
+    if not METRICS_ENABLED:
+        return Response("Metrics are disabled\n", status=404, mimetype='text/plain')
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/predict', methods=['GET', 'POST'])
+@instrumented('predict')
 def predict():
     if request.method == 'POST':
         try:
@@ -26,10 +60,10 @@ def predict():
             
             logger.info(f"Received request - URL: {product_url}, Text: {review_text[:50]}...")
             
-            # Initialize components
-            scraper = ReviewScraper()
-            processor = TextProcessor()
-            analyzer = SentimentAnalyzer()
+            # Get shared components
+            scraper = get_scraper()
+            processor = get_processor()
+            analyzer = get_analyzer()
             
             # Collect reviews
             reviews = []
@@ -40,55 +74,51 @@ def predict():
             elif review_text:
                 logger.info("Processing direct review text input")
                 # Create a single review from the text input
-                reviews = [{
-                    'rating': 0.0,  # Default rating for text input
-                    'title': 'User Review',
-                    'text': review_text,
-                    'date': '2024-03-15',
-                    'verified': False
-                }]
+                reviews = [Review(
+                    rating=0.0,  # Default rating for text input
+                    title='User Review',
+                    text=review_text,
+                    date='2024-03-15',
+                    verified=False
+                )]
                 logger.info("Created single review from text input")
             
             if not reviews:
                 logger.warning("No reviews found")
                 return render_template('predict.html', error="No reviews found. Please try again.")
             
-            # Process and analyze reviews
+            # Process all review texts in one batch
+            processed_texts = processor.preprocess_texts([review.text for review in reviews])
             processed_reviews = []
-            sentiments = []
-            
-            for i, review in enumerate(reviews):
-                try:
-                    # Process review text
-                    processed_text = processor._preprocess_text(review['text'])
-                    processed_reviews.append({
-                        'original': review['text'],
-                        'processed': processed_text,
-                        'rating': review['rating'],
-                        'title': review['title'],
-                        'date': review['date'],
-                        'verified': review['verified']
-                    })
-                    
-                    # Analyze sentiment
-                    review_data = [{
-                        'processed_text': processed_text,
-                        'rating': review['rating']
-                    }]
-                    sentiment_results = analyzer.analyze_sentiment(review_data)
-                    sentiment = sentiment_results[0]['sentiment']['combined']['label']
-                    sentiments.append(sentiment)
-                    logger.info(f"Processed review {i+1}/{len(reviews)} - Sentiment: {sentiment}")
-                except Exception as e:
-                    logger.error(f"Error processing review {i+1}: {str(e)}")
-                    logger.error(traceback.format_exc())
-                    raise
+            
+            for review, processed_text in zip(reviews, processed_texts):
+                review.processed_text = processed_text
+                processed_reviews.append({
+                    'original': review.text,
+                    'processed': processed_text,
+                    'rating': review.rating,
+                    'title': review.title,
+                    'date': review.date,
+                    'verified': review.verified
+                })
+            
+            # Analyze sentiment for all reviews in one batched pass
+            sentiment_results = analyzer.analyze_sentiment(reviews)
+            labels = []
+            
+            for i, result in enumerate(sentiment_results):
+                label = result.sentiment.combined.label
+                labels.append(label)
+                logger.info(f"Processed review {i+1}/{len(reviews)} - Sentiment: {label}", extra={'log_class': 'review'})
+            
+            # The template renders labels as strings
+            sentiments = [str(label) for label in labels]
             
             # Calculate statistics
             total_reviews = len(reviews)
-            positive_count = sum(1 for s in sentiments if s == 'positive')
-            negative_count = sum(1 for s in sentiments if s == 'negative')
-            neutral_count = sum(1 for s in sentiments if s == 'neutral')
+            positive_count = labels.count(Label.POSITIVE)
+            negative_count = labels.count(Label.NEGATIVE)
+            neutral_count = labels.count(Label.NEUTRAL)
             
             # Calculate percentages
             positive_percent = (positive_count / total_reviews) * 100
@@ -96,7 +126,7 @@ def predict():
             neutral_percent = (neutral_count / total_reviews) * 100
             
             # Calculate average rating
-            avg_rating = sum(review['rating'] for review in reviews) / total_reviews
+            avg_rating = sum(review.rating for review in reviews) / total_reviews
             
             # Generate insights
             insights = []
@@ -131,8 +161,8 @@ def predict():
             return render_template('predict.html', results=results)
             
         except Exception as e:
-            logger.error(f"Error processing request: {str(e)}")
-            logger.error(traceback.format_exc())
+            # The traceback is formatted by the handler (off-thread with LOG_ASYNC)
+            logger.error(f"Error processing request: {str(e)}", exc_info=True)
             return render_template('predict.html', error=f"An error occurred: {str(e)}")
     
     return render_template('predict.html')
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import time
+from typing import List, NamedTuple, Optional, Tuple
+from ..records import Review
+from ..utils.sqlite_store import SQLiteConnections
+
+# Hashes of the newest reviews kept as the high-water mark
+MAX_WATERMARK = 50
+
+def review_hash(review: Review) -> str:
+    """
+    Content hash identifying a review across crawls.
+
+    Args:
+        review (Review): Review data
+
+    Returns:
+        str: Hex digest of the review's date, rating, title and text
+    """
+    content = json.dumps(
+        [review.date, review.rating, review.title, review.text],
+        ensure_ascii=False
+    )
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+class Checkpoint(NamedTuple):
+    # High-water mark of the last completed crawl
+    seen: Tuple[str, ...]
+    newest_date: Optional[str]
+    # Progress of an unfinished crawl: last completed page, reviews of the
+    # page after it already returned (when a crawl stopped at max_reviews
+    # mid-page), and the newest reviews it found, which become the
+    # high-water mark once it completes
+    page: int
+    pending_seen: Tuple[str, ...]
+    pending_date: Optional[str]
+    offset: int = 0
+
+EMPTY_CHECKPOINT = Checkpoint((), None, 0, (), None, 0)
+
+class CheckpointStore:
+    """
+    Per-product crawl checkpoints for incremental scraping.
+
+    A completed crawl leaves a high-water mark (hashes and date of the
+    newest reviews), so the next crawl can stop as soon as it reaches
+    reviews it has already seen. An unfinished crawl records its last
+    completed page (and how far into the next page a crawl that stopped at
+    its review limit got), so it resumes instead of restarting.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): Path of the SQLite checkpoint file
+        """
+        self.db_path = db_path
+        self._db = SQLiteConnections(
+            db_path,
+            'CREATE TABLE IF NOT EXISTS checkpoints ('
+            'product TEXT PRIMARY KEY, seen TEXT NOT NULL, newest_date TEXT, page INTEGER NOT NULL, '
+            'pending_seen TEXT NOT NULL, pending_date TEXT, "offset" INTEGER NOT NULL DEFAULT 0, '
+            'updated_at REAL NOT NULL);'
+        )
+
+    def load(self, product: str) -> Checkpoint:
+        """
+        Load a product's checkpoint.
+
+        Args:
+            product (str): Product URL
+
+        Returns:
+            Checkpoint: The stored checkpoint, or an empty one
+        """
+        row = self._db.connection().execute(
+            'SELECT seen, newest_date, page, pending_seen, pending_date, "offset" FROM checkpoints WHERE product = ?',
+            (product,)
+        ).fetchone()
+        if row is None:
+            return EMPTY_CHECKPOINT
+        seen, newest_date, page, pending_seen, pending_date, offset = row
+        return Checkpoint(tuple(json.loads(seen)), newest_date, page, tuple(json.loads(pending_seen)), pending_date,
+                          offset)
+
+    def save_progress(self, product: str, checkpoint: Checkpoint, page: int,
+                      pending_seen: List[str], pending_date: Optional[str], offset: int = 0):
+        """
+        Record how far an unfinished crawl got.
+
+        Args:
+            product (str): Product URL
+            checkpoint (Checkpoint): Checkpoint the crawl started from
+            page (int): Last completed page
+            pending_seen (List[str]): Hashes of the newest reviews found by this crawl
+            pending_date (str): Newest review date found by this crawl (ISO format)
+            offset (int): Reviews of the page after ``page`` already returned
+        """
+        self._save(product, checkpoint._replace(
+            page=page, pending_seen=tuple(pending_seen), pending_date=pending_date, offset=offset
+        ))
+
+    def complete(self, product: str, checkpoint: Checkpoint, newest_seen: List[str], newest_date: Optional[str]):
+        """
+        Move the high-water mark after a crawl reached the end, already-seen
+        reviews or its since date.
+
+        Args:
+            product (str): Product URL
+            checkpoint (Checkpoint): Checkpoint the crawl started from
+            newest_seen (List[str]): Hashes of the newest reviews found by this crawl
+            newest_date (str): Newest review date found by this crawl (ISO format)
+        """
+        seen = list(newest_seen) + [digest for digest in checkpoint.seen if digest not in newest_seen]
+        if checkpoint.newest_date and (not newest_date or checkpoint.newest_date > newest_date):
+            newest_date = checkpoint.newest_date
+        self._save(product, Checkpoint(tuple(seen[:MAX_WATERMARK]), newest_date, 0, (), None, 0))
+
+    def reset(self, product: str):
+        """Delete a product's checkpoint so the next crawl starts from scratch."""
+        with self._db.connection() as connection:
+            connection.execute('DELETE FROM checkpoints WHERE product = ?', (product,))
+
+    def _save(self, product: str, checkpoint: Checkpoint):
+        with self._db.connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO checkpoints '
+                '(product, seen, newest_date, page, pending_seen, pending_date, "offset", updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (product, json.dumps(list(checkpoint.seen)), checkpoint.newest_date, checkpoint.page,
+                 json.dumps(list(checkpoint.pending_seen)), checkpoint.pending_date, checkpoint.offset, time.time())
+            )
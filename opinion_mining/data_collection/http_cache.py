@@ -0,0 +1,115 @@
+import re
+import time
+import zlib
+from typing import List, NamedTuple, Optional, Tuple
+from ..utils.logger import setup_logger
+from ..utils.sqlite_store import SQLiteConnections
+
+logger = setup_logger()
+
+# The first review page changes as new reviews arrive; later pages rarely do
+DEFAULT_TTL_RULES = [(r'pageNumber=1$', 3600.0)]
+DEFAULT_TTL = 86400.0
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has not been recorded."""
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of HTTP responses for the scraper.
+
+    Bodies are stored zlib-compressed in SQLite together with their ETag
+    and Last-Modified headers. Fresh entries are served without touching
+    the network; stale ones are revalidated with a conditional GET, so an
+    unchanged page costs a 304 instead of a full download.
+
+    In offline mode the cache is replayed as-is and never goes to the
+    network, which also makes a recorded cache a deterministic fixture
+    store for tests.
+    """
+
+    def __init__(self, db_path: str, ttl_rules: Optional[List[Tuple[str, float]]] = None,
+                 default_ttl: float = DEFAULT_TTL, offline: bool = False):
+        """
+        Args:
+            db_path (str): Path of the SQLite cache file
+            ttl_rules (List[Tuple[str, float]]): (URL regex, TTL in seconds) pairs; the
+                first pattern found in a URL sets its TTL
+            default_ttl (float): TTL for URLs matching no rule
+            offline (bool): Serve only from the cache, never from the network
+        """
+        self.db_path = db_path
+        self.default_ttl = default_ttl
+        self.offline = offline
+        rules = DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules
+        self.ttl_rules = [(re.compile(pattern), float(ttl)) for pattern, ttl in rules]
+        self._db = SQLiteConnections(
+            db_path,
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL);'
+        )
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Look up a recorded response.
+
+        Args:
+            url (str): Request URL
+
+        Returns:
+            CachedResponse: The recorded response, or None
+        """
+        row = self._db.connection().execute(
+            'SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return CachedResponse(zlib.decompress(body), etag, last_modified, fetched_at)
+
+    def store(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Record a full response.
+
+        Args:
+            url (str): Request URL
+            body (bytes): Response body
+            etag (str): ETag header, if any
+            last_modified (str): Last-Modified header, if any
+        """
+        with self._db.connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (url, body, etag, last_modified, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url, zlib.compress(body), etag, last_modified, time.time())
+            )
+
+    def touch(self, url: str):
+        """Mark a recorded response as revalidated (e.g. after a 304)."""
+        with self._db.connection() as connection:
+            connection.execute('UPDATE responses SET fetched_at = ? WHERE url = ?', (time.time(), url))
+
+    def ttl_for(self, url: str) -> float:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def is_fresh(self, url: str, entry: CachedResponse) -> bool:
+        return time.time() - entry.fetched_at < self.ttl_for(url)
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse) -> dict:
+        """Headers asking the server to answer 304 if the page has not changed."""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
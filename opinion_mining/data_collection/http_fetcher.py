@@ -0,0 +1,205 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from .http_cache import CacheMiss, ResponseCache
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Statuses that mean "slow down" rather than "this page is broken"
+THROTTLE_STATUSES = (429, 503)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with an adaptive refill rate.
+
+    The rate is halved whenever the server signals throttling and recovers
+    gradually towards the configured maximum on successful requests.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, min_rate: float = 0.05):
+        """
+        Args:
+            rate (float): Maximum sustained requests per second
+            capacity (float): Maximum burst size
+            min_rate (float): Lower bound for the adaptive rate
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = max(self._blocked_until - now, (1.0 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def throttle(self, delay: float):
+        """
+        Back off after a throttling response.
+
+        Args:
+            delay (float): Seconds during which no request may be sent
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self.rate = max(self.min_rate, self.rate / 2.0)
+            self._tokens = 0.0
+
+    def recover(self):
+        """Raise the rate again after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+class HttpFetcher:
+    """
+    Fetches pages over a pooled keep-alive session under a per-host rate limit.
+
+    Requests to the same host share one token bucket, so pages can be
+    fetched from several threads at once without exceeding the limit.
+    Throttling responses (429/503) trigger an exponential backoff, honouring
+    Retry-After when the server sends it, instead of fixed sleeps.
+    """
+
+    def __init__(self, headers: Optional[Dict] = None, requests_per_second: float = 0.5, burst: int = 2,
+                 max_connections: int = 8, max_retries: int = 4, backoff_base: float = 2.0,
+                 backoff_max: float = 60.0, timeout: float = 30.0, cache: Optional[ResponseCache] = None):
+        """
+        Args:
+            headers (Dict): Headers sent with every request
+            requests_per_second (float): Sustained request rate per host
+            burst (int): Requests per host that may be sent back to back
+            max_connections (int): Keep-alive connections kept per host
+            max_retries (int): Retries after a throttling response
+            backoff_base (float): Initial backoff in seconds, doubled per retry
+            backoff_max (float): Maximum backoff in seconds
+            timeout (float): Request timeout in seconds
+            cache (ResponseCache): Optional on-disk response cache
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.cache = cache
+
+        # requests is imported with the first fetcher, not with the scraper modules
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._stats = {'downloads': 0, 'cache_hits': 0, 'not_modified': 0}
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Fetch a URL, waiting for the host's rate limit and retrying when throttled.
+
+        Args:
+            url (str): URL to fetch
+
+        Returns:
+            bytes: Response body
+        """
+        cached = None
+        headers = {}
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None and (self.cache.offline or self.cache.is_fresh(url, cached)):
+                self._count('cache_hits')
+                return cached.body
+            if self.cache.offline:
+                raise CacheMiss(f"No recorded response for {url}")
+            if cached is not None:
+                headers = ResponseCache.conditional_headers(cached)
+
+        bucket = self._bucket(url)
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+            if response.status_code in THROTTLE_STATUSES and attempt < self.max_retries:
+                delay = self._backoff(response, attempt)
+                logger.warning(f"Throttled ({response.status_code}) on {url}, backing off {delay:.1f}s")
+                bucket.throttle(delay)
+                continue
+
+            if response.status_code == 304 and cached is not None:
+                bucket.recover()
+                self.cache.touch(url)
+                self._count('not_modified')
+                return cached.body
+
+            response.raise_for_status()
+            bucket.recover()
+            self._count('downloads')
+            if self.cache is not None:
+                self.cache.store(
+                    url,
+                    response.content,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+            return response.content
+
+    def stats(self) -> Dict:
+        """Return download, cache hit and 304 counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        self.session.close()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, capacity=self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def _backoff(self, response: 'requests.Response', attempt: int) -> float:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after).timestamp()
+                    return min(self.backoff_max, max(0.0, retry_at - time.time()))
+                except (TypeError, ValueError):
+                    pass
+        # Exponential backoff with jitter so workers do not retry in lockstep
+        delay = self.backoff_base * (2 ** attempt)
+        return min(self.backoff_max, delay * random.uniform(0.5, 1.5))
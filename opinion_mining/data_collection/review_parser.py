@@ -0,0 +1,130 @@
+import re
+from datetime import date, datetime
+from importlib.util import find_spec
+from typing import List, Optional
+from ..records import Review
+
+# Checked without importing lxml; BeautifulSoup loads it on the first parse
+PARSER = 'lxml' if find_spec('lxml') is not None else 'html.parser'
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+# e.g. "Reviewed in the United States on March 15, 2024"
+_LONG_DATE_RE = re.compile(r'([A-Z][a-z]+) (\d{1,2}), (\d{4})')
+
+# Only the review containers are built into the tree
+_REVIEW_CONTAINER = ('div', {'data-hook': 'review'})
+
+# (tag name, data-hook) -> review field
+_FIELDS = {
+    ('i', 'review-star-rating'): 'rating',
+    ('a', 'review-title'): 'title',
+    ('span', 'review-body'): 'text',
+    ('span', 'review-date'): 'date',
+    ('span', 'avp-badge'): 'verified'
+}
+
+def clean_text(text) -> str:
+    """
+    Strip HTML tags and collapse whitespace.
+
+    Args:
+        text: A string or a parsed element (its text content is used)
+
+    Returns:
+        str: Cleaned text
+    """
+    if text is None:
+        return ""
+    if not isinstance(text, str):
+        text = text.get_text()
+    if not text:
+        return ""
+    text = _TAG_RE.sub('', text)
+    return ' '.join(text.split())
+
+def extract_rating(element) -> float:
+    """
+    Extract the first number from a rating element.
+
+    Args:
+        element: Parsed rating element, or None
+
+    Returns:
+        float: Rating, or 0.0 if none was found
+    """
+    if element:
+        match = _NUMBER_RE.search(element.get_text().strip())
+        if match:
+            return float(match.group(1))
+    return 0.0
+
+def parse_review_date(text) -> Optional[date]:
+    """
+    Parse a review date as shown on the page or in the sample data.
+
+    Args:
+        text: Date text (e.g. "2024-03-15" or "Reviewed in ... on March 15, 2024"),
+            or a date/datetime
+
+    Returns:
+        date: Parsed date, or None if it could not be recognised
+    """
+    if isinstance(text, datetime):
+        return text.date()
+    if isinstance(text, date):
+        return text
+    if not text:
+        return None
+    try:
+        match = _ISO_DATE_RE.search(text)
+        if match:
+            return datetime.strptime(match.group(0), '%Y-%m-%d').date()
+        match = _LONG_DATE_RE.search(text)
+        if match:
+            return datetime.strptime(' '.join(match.groups()), '%B %d %Y').date()
+    except ValueError:
+        pass
+    return None
+
+def parse_review_page(content) -> List[Review]:
+    """
+    Extract reviews from an Amazon review page.
+
+    Only the ``data-hook="review"`` containers are parsed, and each
+    container's fields are collected in a single walk over its descendants.
+
+    Args:
+        content (bytes | str): Page HTML
+
+    Returns:
+        List[Review]: Reviews, in page order
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(content, PARSER, parse_only=SoupStrainer(*_REVIEW_CONTAINER))
+    reviews = []
+
+    for container in soup.find_all('div', attrs={'data-hook': 'review'}):
+        found = {}
+        for element in container.descendants:
+            attrs = getattr(element, 'attrs', None)
+            if not attrs:
+                continue
+            field = _FIELDS.get((element.name, attrs.get('data-hook')))
+            # Like find(), the first matching element wins
+            if field and field not in found:
+                found[field] = element
+                if len(found) == len(_FIELDS):
+                    break
+
+        reviews.append(Review(
+            rating=extract_rating(found.get('rating')),
+            title=clean_text(found.get('title')),
+            text=clean_text(found.get('text')),
+            date=clean_text(found.get('date')),
+            verified='verified' in found
+        ))
+
+    return reviews
@@ -1,11 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from typing import List, Dict
-import time
-import random
+from typing import List, Iterator, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import threading
+from .checkpoints import review_hash
+from .http_fetcher import HttpFetcher
+from .review_parser import clean_text, extract_rating, parse_review_date, parse_review_page
+from ..records import Review
 from ..utils.logger import setup_logger
-import re
+from ..utils.metrics import instrumented
 
 logger = setup_logger()
 
@@ -14,10 +17,30 @@ class ReviewScraper:
     A class to scrape product reviews from various e-commerce platforms.
     """
     
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+    DEFAULT_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    def __init__(self, live=False, fetcher=None, prefetch_pages=3, parse_workers=0, checkpoints=None):
+        """
+        Args:
+            live (bool): Scrape product URLs instead of returning sample data
+            fetcher (HttpFetcher): Fetcher for review pages (default: pooled, rate limited)
+            prefetch_pages (int): Review pages fetched in parallel ahead of parsing
+            parse_workers (int): Processes parsing pages while others download
+                (0 parses in the fetching threads)
+            checkpoints (CheckpointStore): Per-product crawl checkpoints used by
+                incremental crawls, which only return reviews not seen by an
+                earlier incremental crawl
+        """
+        self.headers = dict(self.DEFAULT_HEADERS)
+        self.live = live
+        self.fetcher = fetcher or HttpFetcher(headers=self.headers)
+        self.checkpoints = checkpoints
+        self.prefetch_pages = max(1, prefetch_pages)
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        self._parse_pool_lock = threading.Lock()
         # Sample data for different product categories
         self.sample_data = {
             'electronics': [
@@ -254,32 +277,80 @@ class ReviewScraper:
             ]
         }
     
-    def collect_reviews(self, product_url=None, max_reviews=10):
+    @instrumented('scrape', items=len)
+    def collect_reviews(self, product_url=None, max_reviews=10, since=None, incremental=False):
         """
         Collect reviews from a product URL or return sample data
         
         Args:
             product_url (str): URL of the product to analyze
             max_reviews (int): Maximum number of reviews to return (default: 10)
+            since (date | str): Only return reviews from this date on (default: all)
+            incremental (bool): Continue from the product's checkpoint, returning
+                only reviews earlier incremental crawls did not (needs checkpoints)
             
         Returns:
-            List[Dict]: List of review dictionaries
+            List[Review]: Collected reviews
         """
         try:
-            if product_url:
+            since = self._parse_since(since)
+            if product_url and self.live:
+                logger.info(f"Scraping reviews from: {product_url}")
+                return list(self._iter_amazon_reviews(product_url, since, max_reviews, incremental))
+            elif product_url:
                 # Extract category from URL
                 category = self._extract_category(product_url)
                 logger.info(f"Using sample data for category: {category}")
-                reviews = self.sample_data.get(category, self.sample_data['default'])
+                reviews = self._sample_reviews(category, since)
                 # Return only the requested number of reviews
                 return reviews[:max_reviews]
             else:
                 logger.info("No URL provided, using default sample data")
-                return self.sample_data['default'][:max_reviews]
+                return self._sample_reviews('default', since)[:max_reviews]
         except Exception as e:
             logger.error(f"Error collecting reviews: {str(e)}")
             return []
 
+    def iter_reviews(self, product_url=None, max_reviews=None, since=None, incremental=False):
+        """
+        Yield reviews one at a time instead of building the whole list.
+        
+        Args:
+            product_url (str): URL of the product to analyze
+            max_reviews (int): Maximum number of reviews to yield (default: all)
+            since (date | str): Only yield reviews from this date on (default: all)
+            incremental (bool): Continue from the product's checkpoint, yielding
+                only reviews earlier incremental crawls did not (needs checkpoints)
+            
+        Yields:
+            Review: Reviews (fresh objects, safe to mutate)
+        """
+        since = self._parse_since(since)
+        if product_url and self.live:
+            yield from self._iter_amazon_reviews(product_url, since, max_reviews, incremental)
+            return
+        category = self._extract_category(product_url) if product_url else 'default'
+        yield from self._sample_reviews(category, since)[:max_reviews]
+
+    def _parse_since(self, since):
+        if since is None:
+            return None
+        parsed = parse_review_date(since)
+        if parsed is None:
+            raise ValueError(f"Unrecognised since date: {since!r}")
+        return parsed
+
+    def _sample_reviews(self, category, since) -> List[Review]:
+        reviews = [Review.from_dict(data) for data in self.sample_data.get(category, self.sample_data['default'])]
+        if since is None:
+            return reviews
+        return [review for review in reviews if self._is_since(review, since)]
+
+    def _is_since(self, review, since) -> bool:
+        # Reviews with an unrecognised date are kept rather than silently dropped
+        review_date = parse_review_date(review.date)
+        return review_date is None or review_date >= since
+
     def _extract_category(self, url):
         """
         Extract product category from URL
@@ -293,34 +364,30 @@ class ReviewScraper:
             return 'books'
         return 'default'
 
+    def close(self):
+        """Shut down the page parsing processes, if any."""
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+
     def _clean_text(self, text):
         """
-        Clean review text
+        Clean review text (a string or an HTML element)
         """
-        if not text:
-            return ""
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        return text.strip()
+        return clean_text(text)
 
     def _extract_rating(self, rating_element):
         """
         Extract rating from HTML element
         """
         try:
-            if rating_element:
-                rating_text = rating_element.get_text().strip()
-                # Extract first number from text
-                rating_match = re.search(r'(\d+(?:\.\d+)?)', rating_text)
-                if rating_match:
-                    return float(rating_match.group(1))
+            return extract_rating(rating_element)
         except Exception as e:
             logger.error(f"Error extracting rating: {str(e)}")
         return 0.0
     
-    def _scrape_amazon(self, product_url: str) -> List[Dict]:
+    def _scrape_amazon(self, product_url: str) -> List[Review]:
         """
         Scrape reviews from Amazon.
         
@@ -328,45 +395,156 @@ class ReviewScraper:
             product_url (str): URL of the Amazon product
             
         Returns:
-            List[Dict]: List of dictionaries containing review data
+            List[Review]: Scraped reviews
         """
-        reviews = []
-        page = 1
+        return list(self._iter_amazon_reviews(product_url))
+    
+    def _review_page_url(self, product_url: str, page: int, newest_first: bool = False) -> str:
+        sort = "&sortBy=recent" if newest_first else ""
+        return f"{product_url}/ref=cm_cr_arp_d_paging_btm_next_{page}?ie=UTF8&reviewerType=all_reviews{sort}&pageNumber={page}"
+    
+    def _iter_amazon_reviews(self, product_url: str, since=None, max_reviews=None,
+                             incremental=False) -> Iterator[Review]:
+        """
+        Yield reviews from Amazon page by page.
         
-        while True:
-            try:
-                # Construct review URL
-                review_url = f"{product_url}/ref=cm_cr_arp_d_paging_btm_next_{page}?ie=UTF8&reviewerType=all_reviews&pageNumber={page}"
-                
-                # Add delay to avoid rate limiting
-                time.sleep(random.uniform(1, 3))
-                
-                response = requests.get(review_url, headers=self.headers)
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract reviews
-                review_elements = soup.find_all('div', {'data-hook': 'review'})
-                
-                if not review_elements:
-                    break
-                    
-                for review in review_elements:
-                    review_data = {
-                        'rating': self._extract_rating(review.find('i', {'data-hook': 'review-star-rating'})),
-                        'title': self._clean_text(review.find('a', {'data-hook': 'review-title'})),
-                        'text': self._clean_text(review.find('span', {'data-hook': 'review-body'})),
-                        'date': self._clean_text(review.find('span', {'data-hook': 'review-date'})),
-                        'verified': bool(review.find('span', {'data-hook': 'avp-badge'}))
-                    }
-                    reviews.append(review_data)
-                
-                page += 1
+        Incremental crawls (with checkpoints) go newest first and stop at the
+        first review already seen by an earlier incremental crawl; an
+        interrupted crawl resumes after its last completed page, and a crawl
+        that stopped at ``max_reviews`` resumes after the last review it
+        returned. With ``since``, crawling stops at the first review older
+        than that date.
+        
+        Args:
+            product_url (str): URL of the Amazon product
+            since (date): Only yield reviews from this date on
+            max_reviews (int): Maximum number of reviews to yield (default: all)
+            incremental (bool): Crawl from the product's checkpoint
+            
+        Yields:
+            Review: Scraped reviews
+        """
+        if max_reviews is not None and max_reviews <= 0:
+            return
+        
+        if not incremental or self.checkpoints is None:
+            yielded = 0
+            for _, page_reviews in self._iter_review_pages(product_url, 1, newest_first=since is not None):
+                if not page_reviews:
+                    return
+                for review in page_reviews:
+                    if since is not None and not self._is_since(review, since):
+                        return
+                    yield review
+                    yielded += 1
+                    if yielded == max_reviews:
+                        return
+            return
+        
+        checkpoint = self.checkpoints.load(product_url)
+        if checkpoint.page or checkpoint.offset:
+            logger.info(f"Resuming crawl of {product_url} at page {checkpoint.page + 1}, review {checkpoint.offset + 1}")
+        seen = set(checkpoint.seen)
+        newest_seen = list(checkpoint.pending_seen)
+        newest_date = checkpoint.pending_date
+        yielded = 0
+        
+        for page, page_reviews in self._iter_review_pages(product_url, checkpoint.page + 1, newest_first=True):
+            if not page_reviews:
+                self.checkpoints.complete(product_url, checkpoint, newest_seen, newest_date)
+                return
+            # Reviews an earlier bounded crawl already returned from this page
+            skip = checkpoint.offset if page == checkpoint.page + 1 else 0
+            for position, review in enumerate(page_reviews[skip:], skip + 1):
+                digest = review_hash(review)
+                review_date = parse_review_date(review.date)
+                if digest in seen or (review_date and checkpoint.newest_date
+                                      and review_date.isoformat() < checkpoint.newest_date):
+                    logger.info(f"Reached previously seen reviews of {product_url} on page {page}")
+                    self.checkpoints.complete(product_url, checkpoint, newest_seen, newest_date)
+                    return
+                if since is not None and review_date is not None and review_date < since:
+                    # Reviews older than since are left out on purpose, so the
+                    # crawl counts as complete
+                    self.checkpoints.complete(product_url, checkpoint, newest_seen, newest_date)
+                    return
+                if page == 1:
+                    newest_seen.append(digest)
+                    if review_date and (not newest_date or review_date.isoformat() > newest_date):
+                        newest_date = review_date.isoformat()
+                yield review
+                yielded += 1
+                if yielded == max_reviews:
+                    # The next crawl continues with the following review
+                    if position < len(page_reviews):
+                        self.checkpoints.save_progress(product_url, checkpoint, page - 1, newest_seen, newest_date,
+                                                       offset=position)
+                    else:
+                        self.checkpoints.save_progress(product_url, checkpoint, page, newest_seen, newest_date)
+                    return
+            self.checkpoints.save_progress(product_url, checkpoint, page, newest_seen, newest_date)
+    
+    def _iter_review_pages(self, product_url: str, first_page: int,
+                           newest_first: bool = False) -> Iterator[Tuple[int, List[Review]]]:
+        """
+        Yield parsed review pages in order.
+        
+        The next few pages are fetched in parallel while the current one is
+        parsed; the fetcher's per-host rate limit keeps the crawl polite.
+        The first page without reviews is yielded as an empty list and ends
+        the crawl; a failed page ends it without being yielded.
+        
+        Args:
+            product_url (str): URL of the Amazon product
+            first_page (int): Number of the first page to fetch
+            newest_first (bool): Request pages sorted by review date
+            
+        Yields:
+            Tuple[int, List[Review]]: Page number and its reviews
+        """
+        pool = ThreadPoolExecutor(max_workers=self.prefetch_pages)
+        pending = deque()
+        next_page = first_page
+        
+        try:
+            while True:
+                # Keep the prefetch window full
+                while len(pending) < self.prefetch_pages:
+                    url = self._review_page_url(product_url, next_page, newest_first)
+                    pending.append((next_page, pool.submit(self._fetch_and_parse, url)))
+                    next_page += 1
                 
-            except Exception as e:
-                logger.error(f"Error scraping Amazon page {page}: {str(e)}")
-                break
+                page, future = pending.popleft()
+                try:
+                    page_reviews = future.result()
+                except Exception as e:
+                    logger.error(f"Error scraping Amazon page {page}: {str(e)}")
+                    return
                 
-        return reviews
+                yield page, page_reviews
+                if not page_reviews:
+                    return
+        finally:
+            # Pages prefetched past the end are not needed
+            for _, future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+    
+    def _fetch_and_parse(self, url: str) -> List[Review]:
+        content = self.fetcher.fetch(url)
+        if self.parse_workers:
+            # Parse in another process so this thread's GIL time stays free for I/O
+            return self._get_parse_pool().submit(parse_review_page, content).result()
+        return parse_review_page(content)
+    
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._parse_pool
     
     def _extract_title(self, review_element) -> str:
         """Extract title from review element."""
@@ -0,0 +1,419 @@
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+from .records import Review
+from .streaming import RunningSummary, StreamingPipeline, result_record
+from .utils.logger import request_id, setup_logger
+from .utils.sqlite_store import SQLiteConnections
+
+logger = setup_logger()
+
+DEFAULT_DB_PATH = os.path.join('data', 'jobs.db')
+
+KIND_URL = 'url'
+KIND_REVIEWS = 'reviews'
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+# Status columns; the payload is only read when a job is claimed
+_COLUMNS = ('id', 'kind', 'status', 'product_url', 'total', 'processed', 'summary', 'error',
+            'attempts', 'worker', 'created_at', 'started_at', 'finished_at', 'updated_at', 'owner')
+
+def token_hash(token: str) -> str:
+    """Digest under which a job's access token is stored."""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+class JobLost(RuntimeError):
+    """Raised when a worker no longer owns the job it is running, e.g. after it was queued again."""
+
+class Job(NamedTuple):
+    """A submitted analysis and its progress."""
+    id: str
+    kind: str
+    status: str
+    product_url: Optional[str]
+    total: Optional[int]
+    processed: int
+    summary: Optional[Dict]
+    error: Optional[str]
+    attempts: int
+    worker: Optional[str]
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    updated_at: float
+    # token_hash of the submitter's access token, None for jobs open to anyone
+    owner: Optional[str]
+    # Only set on claimed jobs
+    payload: Optional[Dict] = None
+
+    @classmethod
+    def from_row(cls, row, payload: Optional[str] = None) -> 'Job':
+        values = dict(zip(_COLUMNS, row))
+        values['summary'] = json.loads(values['summary']) if values['summary'] else None
+        values['payload'] = json.loads(payload) if payload is not None else None
+        return cls(**values)
+
+    def owned_by(self, token: Optional[str]) -> bool:
+        """Whether token is the access token the job was submitted with."""
+        if self.owner is None:
+            return True
+        return token is not None and hmac.compare_digest(self.owner, token_hash(token))
+
+    def to_dict(self) -> Dict:
+        """Status view of the job; the submitted reviews are left out."""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'product_url': self.product_url,
+            'total': self.total,
+            'processed': self.processed,
+            'summary': self.summary,
+            'error': self.error,
+            'attempts': self.attempts,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+class JobStore:
+    """
+    Persistent queue of analysis jobs and their results.
+
+    Jobs and per-review results live in SQLite, so any process using the
+    same file (web workers submitting and polling, job workers executing)
+    sees the same queue, and results survive restarts.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, stale_after: float = 600.0, max_attempts: int = 3):
+        """
+        Args:
+            db_path (str): Path of the SQLite job database
+            stale_after (float): Seconds without progress after which a running
+                job's worker is presumed dead and the job is queued again
+            max_attempts (int): Times a job is started before it is failed
+        """
+        self.db_path = db_path
+        self.stale_after = stale_after
+        self.max_attempts = max(1, max_attempts)
+        self._db = SQLiteConnections(
+            db_path,
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, product_url TEXT, payload TEXT NOT NULL, '
+            'total INTEGER, processed INTEGER NOT NULL DEFAULT 0, summary TEXT, error TEXT, '
+            'attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, created_at REAL NOT NULL, '
+            'started_at REAL, finished_at REAL, updated_at REAL NOT NULL, owner TEXT);'
+            'CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);'
+            'CREATE TABLE IF NOT EXISTS job_results ('
+            'job_id TEXT NOT NULL, idx INTEGER NOT NULL, result TEXT NOT NULL, PRIMARY KEY (job_id, idx));'
+        )
+
+    def submit(self, kind: str, payload: Dict, total: Optional[int] = None, token: Optional[str] = None) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind (str): KIND_URL (payload: product_url, max_reviews, incremental)
+                or KIND_REVIEWS (payload: reviews as dicts)
+            payload (Dict): Job input
+            total (int): Number of reviews, if known up front
+            token (str): Access token of the submitting client; only its hash
+                is stored (default: the job is open to anyone)
+
+        Returns:
+            Job: The queued job
+        """
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._db.connection() as connection:
+            connection.execute(
+                'INSERT INTO jobs (id, kind, status, product_url, payload, total, created_at, updated_at, owner) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, kind, QUEUED, payload.get('product_url'), json.dumps(payload), total, now, now,
+                 token_hash(token) if token is not None else None)
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job's status and progress, without its payload.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            Job: The job (payload None), or None if it does not exist
+        """
+        row = self._db.connection().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """
+        Take the oldest queued job and mark it running.
+
+        Running jobs without progress for stale_after seconds are queued
+        again first (or failed after max_attempts).
+
+        Args:
+            worker (str): Id of the claiming worker
+
+        Returns:
+            Job: The claimed job with its payload, or None if the queue is empty
+        """
+        connection = self._db.connection()
+        now = time.time()
+        with connection:
+            # Serializes claims across threads and processes
+            connection.execute('BEGIN IMMEDIATE')
+            stale = now - self.stale_after
+            connection.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? '
+                'WHERE status = ? AND updated_at < ? AND attempts >= ?',
+                (FAILED, 'Worker stopped responding', now, now, RUNNING, stale, self.max_attempts)
+            )
+            connection.execute(
+                'UPDATE jobs SET status = ?, worker = NULL, updated_at = ? WHERE status = ? AND updated_at < ?',
+                (QUEUED, now, RUNNING, stale)
+            )
+            row = connection.execute(
+                'SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id = row[0]
+            # Results of an earlier, interrupted attempt are recomputed
+            connection.execute('DELETE FROM job_results WHERE job_id = ?', (job_id,))
+            connection.execute(
+                'UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, processed = 0, '
+                'started_at = ?, updated_at = ? WHERE id = ?',
+                (RUNNING, worker, now, now, job_id)
+            )
+            row = connection.execute(
+                f"SELECT {', '.join(_COLUMNS)}, payload FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return Job.from_row(row[:-1], payload=row[-1])
+
+    def add_results(self, job: Job, records: List[Dict]):
+        """
+        Store analyzed reviews of a running job and advance its progress.
+
+        Args:
+            job (Job): The job as claimed by this worker
+            records (List[Dict]): result_record output, each with its index
+
+        Raises:
+            JobLost: If the job was queued again or claimed by another worker;
+                nothing is stored
+        """
+        with self._db.connection() as connection:
+            updated = connection.execute(
+                'UPDATE jobs SET processed = processed + ?, updated_at = ? '
+                'WHERE id = ? AND status = ? AND worker = ? AND attempts = ?',
+                (len(records), time.time(), job.id, RUNNING, job.worker, job.attempts)
+            ).rowcount
+            if not updated:
+                raise JobLost(f"Worker {job.worker} no longer owns job {job.id}")
+            connection.executemany(
+                'INSERT OR REPLACE INTO job_results (job_id, idx, result) VALUES (?, ?, ?)',
+                [(job.id, record['index'], json.dumps(record, default=str)) for record in records]
+            )
+
+    def finish(self, job: Job, summary: Dict) -> bool:
+        """Mark a claimed job succeeded; False if this worker no longer owns it."""
+        return self._complete(job, SUCCEEDED, summary=json.dumps(summary))
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Mark a claimed job failed; False if this worker no longer owns it."""
+        return self._complete(job, FAILED, error=error)
+
+    def _complete(self, job: Job, status: str, summary: Optional[str] = None, error: Optional[str] = None) -> bool:
+        now = time.time()
+        with self._db.connection() as connection:
+            return connection.execute(
+                'UPDATE jobs SET status = ?, summary = ?, error = ?, finished_at = ?, updated_at = ? '
+                'WHERE id = ? AND status = ? AND worker = ? AND attempts = ?',
+                (status, summary, error, now, now, job.id, RUNNING, job.worker, job.attempts)
+            ).rowcount > 0
+
+    def iter_results(self, job_id: str, offset: int = 0, limit: Optional[int] = None,
+                     page_size: int = 1000) -> Iterator[str]:
+        """
+        Read stored results in index order, one page of rows at a time.
+
+        Args:
+            job_id (str): Job id
+            offset (int): Index of the first result
+            limit (int): Maximum number of results (default: all)
+            page_size (int): Rows fetched per query
+
+        Yields:
+            str: Each result as a JSON string
+        """
+        end = offset + limit if limit is not None else None
+        start = offset
+        while end is None or start < end:
+            size = page_size if end is None else min(page_size, end - start)
+            rows = self._db.connection().execute(
+                'SELECT idx, result FROM job_results WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?',
+                (job_id, start, size)
+            ).fetchall()
+            for _, result in rows:
+                yield result
+            if len(rows) < size:
+                return
+            start = rows[-1][0] + 1
+
+class JobWorkerPool:
+    """
+    Threads executing queued jobs outside the request cycle.
+
+    Each thread claims the oldest queued job, streams its reviews through
+    the preprocessing and sentiment pipeline and stores the results in
+    batches, which also records progress. Any number of pools, in web
+    workers or in dedicated processes, can share one JobStore.
+    """
+
+    def __init__(self, store: JobStore, components: Callable[[str], Any], workers: int = 1,
+                 poll_interval: float = 1.0, batch_size: int = 64, queue_size: int = 4):
+        """
+        Args:
+            store (JobStore): Job queue
+            components (Callable): Returns the shared component of a name
+                ('scraper', 'processor', 'analyzer'), e.g. registry.get
+            workers (int): Number of worker threads (0 only submits)
+            poll_interval (float): Seconds an idle thread waits before checking
+                the queue again
+            batch_size (int): Reviews per pipeline batch and per results write
+            queue_size (int): Maximum batches waiting between pipeline stages
+        """
+        self.store = store
+        self.components = components
+        self.poll_interval = poll_interval
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads = []
+        for number in range(max(0, workers)):
+            thread = threading.Thread(target=self._run, args=(f"{socket.gethostname()}:{os.getpid()}:{number}",),
+                                      name=f'job-worker-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self):
+        """Wake idle threads, e.g. right after a job was submitted."""
+        self._wake.set()
+
+    def close(self):
+        """Stop the threads once their current jobs are done."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _run(self, worker: str):
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim(worker)
+            except Exception as e:
+                logger.error(f"Error claiming a job: {str(e)}")
+                job = None
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self.run_job(job)
+
+    def run_job(self, job: Job):
+        """
+        Execute a claimed job and record its outcome.
+
+        Args:
+            job (Job): Job in the running state
+        """
+        # Log records of the job carry its id like a request id
+        token = request_id.set(job.id)
+        logger.info(f"Running job {job.id} ({job.kind})")
+        try:
+            pipeline = StreamingPipeline(
+                self.components('processor'),
+                self.components('analyzer'),
+                batch_size=self.batch_size,
+                queue_size=self.queue_size
+            )
+            summary = RunningSummary()
+            records = []
+            for index, review in enumerate(pipeline.iter_results(self._job_reviews(job))):
+                summary.update(review)
+                records.append(result_record(index, review))
+                if len(records) >= self.batch_size:
+                    self.store.add_results(job, records)
+                    records = []
+            if records:
+                self.store.add_results(job, records)
+            if self.store.finish(job, summary.as_dict()):
+                logger.info(f"Finished job {job.id}: {summary.total} reviews")
+            else:
+                logger.warning(f"Discarding finished job {job.id}: worker {job.worker} no longer owns it")
+        except JobLost as e:
+            # Another attempt owns the job now; stop without touching it
+            logger.warning(f"Stopping job {job.id}: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error running job {job.id}: {str(e)}", exc_info=True)
+            if not self.store.fail(job, str(e)):
+                logger.warning(f"Not failing job {job.id}: worker {job.worker} no longer owns it")
+        finally:
+            request_id.reset(token)
+
+    def _job_reviews(self, job: Job) -> Iterator[Review]:
+        if job.kind == KIND_URL:
+            return self.components('scraper').iter_reviews(
+                product_url=job.payload['product_url'],
+                max_reviews=job.payload.get('max_reviews'),
+                incremental=job.payload.get('incremental', False)
+            )
+        return (Review.from_dict(review) for review in job.payload['reviews'])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .registry import get_job_store, registry
+
+    parser = argparse.ArgumentParser(description="Run job workers outside the web server")
+    parser.add_argument('command', choices=['worker'])
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('JOBS_WORKERS', 1)) or 1)
+    parser.add_argument('--poll-interval', type=float, default=float(os.environ.get('JOBS_POLL_INTERVAL', 1.0)))
+    args = parser.parse_args(argv)
+
+    pool = JobWorkerPool(
+        get_job_store(),
+        registry.get,
+        workers=args.workers,
+        poll_interval=args.poll_interval,
+        batch_size=int(os.environ.get('STREAM_BATCH_SIZE', 64)),
+        queue_size=int(os.environ.get('STREAM_QUEUE_SIZE', 4))
+    )
+    logger.info(f"Job workers started: {args.workers}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        logger.info("Stopping job workers")
+        pool.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,9 @@
 import os
 from dotenv import load_dotenv
-from opinion_mining.data_collection.review_scraper import ReviewScraper
-from opinion_mining.preprocessing.text_processor import TextProcessor
-from opinion_mining.sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
+from opinion_mining.records import Label
+from opinion_mining.registry import build_processor, get_scraper, get_analyzer
+from opinion_mining.result_store import ARROW_EXTENSIONS, ResultWriter
+from opinion_mining.streaming import NDJSONSink, StreamingPipeline
 from opinion_mining.utils.logger import setup_logger
 
 # Load environment variables
@@ -16,17 +17,24 @@ def main():
     Main execution function for the Opinion Mining project.
     """
     try:
-        # Initialize components
-        scraper = ReviewScraper()
-        processor = TextProcessor()
-        analyzer = SentimentAnalyzer()
+        # Get shared components
+        scraper = get_scraper()
+        # Offline runs preprocess on every core unless PREPROCESS_WORKERS is set
+        processor = build_processor(default_workers=0)
+        analyzer = get_analyzer()
 
         # Example product URL (replace with actual product URL)
         product_url = "https://www.amazon.com/product-reviews/B084DWCZY6"
         
+        # Stream results to a file with bounded memory when an output path is configured
+        stream_output = os.environ.get('STREAM_OUTPUT')
+        if stream_output:
+            run_streaming(scraper, processor, analyzer, product_url, stream_output)
+            return
+        
         # Example workflow
         logger.info("Starting review collection...")
-        reviews = scraper.collect_reviews(product_url=product_url)
+        reviews = scraper.collect_reviews(product_url=product_url, incremental=True)
         
         if not reviews:
             logger.warning("No reviews were collected. Please check the product URL and try again.")
@@ -41,9 +49,10 @@ def main():
         sentiment_results = analyzer.analyze_sentiment(processed_reviews)
         
         # Print summary
-        positive_count = sum(1 for r in sentiment_results if r['sentiment']['combined']['label'] == 'positive')
-        negative_count = sum(1 for r in sentiment_results if r['sentiment']['combined']['label'] == 'negative')
-        neutral_count = sum(1 for r in sentiment_results if r['sentiment']['combined']['label'] == 'neutral')
+        labels = [r.sentiment.combined.label for r in sentiment_results if r.sentiment.combined is not None]
+        positive_count = labels.count(Label.POSITIVE)
+        negative_count = labels.count(Label.NEGATIVE)
+        neutral_count = labels.count(Label.NEUTRAL)
         
         logger.info(f"Analysis complete! Results:")
         logger.info(f"Positive reviews: {positive_count}")
@@ -54,5 +63,37 @@ def main():
         logger.error(f"An error occurred: {str(e)}")
         raise
 
+def run_streaming(scraper, processor, analyzer, product_url, output_path):
+    """
+    Run the pipeline in streaming mode, writing each analyzed review to a file.
+    
+    Reviews are checked for fakes on the way. Paths ending in .parquet,
+    .arrow, .feather or .ipc get a columnar result store; anything else gets
+    NDJSON.
+    """
+    pipeline = StreamingPipeline(
+        processor,
+        analyzer,
+        batch_size=int(os.environ.get('STREAM_BATCH_SIZE', 64)),
+        queue_size=int(os.environ.get('STREAM_QUEUE_SIZE', 4)),
+        detect_fake=True
+    )
+    if output_path.lower().endswith(('.parquet',) + ARROW_EXTENSIONS):
+        sink = ResultWriter(output_path, row_group_size=int(os.environ.get('RESULT_ROW_GROUP_SIZE', 65536)))
+    else:
+        sink = NDJSONSink(output_path)
+    
+    logger.info(f"Streaming analyzed reviews to {output_path}...")
+    try:
+        summary = pipeline.run(scraper.iter_reviews(product_url=product_url, incremental=True), sink=sink.write)
+    finally:
+        sink.close()
+    
+    logger.info(f"Analysis complete! Results:")
+    logger.info(f"Positive reviews: {summary['positive_count']}")
+    logger.info(f"Negative reviews: {summary['negative_count']}")
+    logger.info(f"Neutral reviews: {summary['neutral_count']}")
+    return summary
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
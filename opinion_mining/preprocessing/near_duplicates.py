@@ -0,0 +1,179 @@
+import re
+import zlib
+from itertools import chain
+from typing import List, Optional
+import numpy as np
+
+_TOKEN_RE = re.compile(rb'[a-z0-9]+')
+
+def _random_words(rng: np.random.RandomState, size: int) -> np.ndarray:
+    return rng.randint(0, 1 << 62, size=size, dtype=np.int64).astype(np.uint64) << np.uint64(2)
+
+class NearDuplicateDetector:
+    """
+    Clusters near-identical texts with MinHash signatures and LSH banding.
+
+    Each text is reduced to a set of word shingles and summarised by a
+    MinHash signature whose agreement rate estimates the Jaccard similarity
+    between two texts. Signatures are split into bands; texts sharing a
+    band land in the same bucket and become candidates, so only bucket
+    members are ever compared and the work grows linearly with the number
+    of texts instead of quadratically.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 3, min_tokens: int = 5, batch_size: int = 10000, seed: int = 1):
+        """
+        Args:
+            threshold (float): Estimated Jaccard similarity at which two texts are duplicates
+            num_perm (int): MinHash signature length
+            bands (int): LSH bands; must divide num_perm. More bands catch lower
+                similarities at the cost of more candidates
+            shingle_size (int): Words per shingle
+            min_tokens (int): Texts with fewer words are never clustered
+            batch_size (int): Texts hashed at a time, bounding memory use
+            seed (int): Seed for the hash functions
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_tokens = min_tokens
+        self.batch_size = max(1, batch_size)
+
+        # Multiply-shift hash family: h(x) = (a * x + b) >> 32 with odd a,
+        # wrapping at 64 bits, so no modulo is needed
+        rng = np.random.RandomState(seed)
+        self._a = _random_words(rng, num_perm) | np.uint64(1)
+        self._b = _random_words(rng, num_perm)
+        self._shingle_mix = _random_words(rng, 1)[0] | np.uint64(1)
+        # Odd multipliers folding a band's rows into one 64-bit bucket key
+        self._band_mix = _random_words(rng, self.rows) | np.uint64(1)
+
+    def cluster(self, texts: List[str]) -> List[Optional[int]]:
+        """
+        Assign cluster ids to near-duplicate texts.
+
+        Args:
+            texts (List[str]): Texts to compare
+
+        Returns:
+            List[Optional[int]]: Cluster id per text, numbered in order of first
+                appearance, or None for texts without a near duplicate
+        """
+        n = len(texts)
+        if n < 2:
+            return [None] * n
+
+        signatures, valid = self.signatures(texts)
+        parent = list(range(n))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        candidates = np.flatnonzero(valid)
+        for band in range(self.bands):
+            band_rows = signatures[candidates, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            with np.errstate(over='ignore'):
+                keys = (band_rows * self._band_mix).sum(axis=1)
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            ends = np.r_[starts[1:], len(order)]
+            for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+                # Verify members against the bucket's first text only, keeping
+                # large buckets of identical copies linear
+                members = candidates[order[start:end]]
+                head = members[0]
+                similarity = (signatures[members[1:]] == signatures[head]).mean(axis=1)
+                for member in members[1:][similarity >= self.threshold]:
+                    root_a, root_b = find(head), find(member)
+                    if root_a != root_b:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        sizes = {}
+        roots = [find(i) for i in range(n)]
+        for root in roots:
+            sizes[root] = sizes.get(root, 0) + 1
+
+        cluster_ids = {}
+        result = []
+        for root in roots:
+            if sizes[root] < 2:
+                result.append(None)
+                continue
+            if root not in cluster_ids:
+                cluster_ids[root] = len(cluster_ids)
+            result.append(cluster_ids[root])
+        return result
+
+    def signatures(self, texts: List[str]):
+        """
+        Compute MinHash signatures.
+
+        Args:
+            texts (List[str]): Texts to hash
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (n, num_perm) uint32 signatures and a
+                mask of texts long enough to be compared
+        """
+        signatures = np.full((len(texts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        valid = np.zeros(len(texts), dtype=bool)
+
+        for batch_start in range(0, len(texts), self.batch_size):
+            batch = texts[batch_start:batch_start + self.batch_size]
+            shingles, offsets, rows = self._shingle_hashes(batch)
+            if not len(rows):
+                continue
+            rows = batch_start + rows
+            valid[rows] = True
+            # One permutation at a time over the whole batch keeps the
+            # intermediate array the size of the batch's shingles
+            for j in range(self.num_perm):
+                hashed = (self._a[j] * shingles + self._b[j]) >> np.uint64(32)
+                signatures[rows, j] = np.minimum.reduceat(hashed, offsets)
+
+        return signatures, valid
+
+    def _shingle_hashes(self, texts: List[str]):
+        # Hash every token once, then combine consecutive token hashes into
+        # shingle hashes with array arithmetic
+        token_lists = [
+            _TOKEN_RE.findall(text.lower().encode('utf-8')) if isinstance(text, str) else []
+            for text in texts
+        ]
+        counts = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        rows = np.flatnonzero(counts >= self.min_tokens)
+        if not len(rows):
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64), rows
+
+        counts = counts[rows]
+        tokens = np.fromiter(
+            chain.from_iterable(map(zlib.crc32, token_lists[row]) for row in rows),
+            dtype=np.uint64, count=int(counts.sum())
+        )
+        starts = np.r_[0, np.cumsum(counts)[:-1]]
+        position = np.arange(len(tokens)) - np.repeat(starts, counts)
+        remaining = np.repeat(counts, counts) - position
+
+        with np.errstate(over='ignore'):
+            combined = np.zeros(len(tokens), dtype=np.uint64)
+            for shift in range(self.shingle_size):
+                shifted = np.zeros(len(tokens), dtype=np.uint64)
+                shifted[:len(tokens) - shift] = tokens[shift:]
+                # Texts shorter than a shingle form a single shingle
+                shifted[remaining <= shift] = 0
+                combined = combined * self._shingle_mix + shifted
+
+        # A text with n tokens has max(1, n - shingle_size + 1) shingles
+        keep = (remaining >= self.shingle_size) | (position == 0)
+        shingle_counts = np.maximum(1, counts - self.shingle_size + 1)
+        offsets = np.r_[0, np.cumsum(shingle_counts)[:-1]]
+        return combined[keep], offsets, rows
@@ -0,0 +1,112 @@
+import argparse
+import os
+import sys
+from typing import List, Optional
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+DEFAULT_DATA_DIR = os.path.join('models', 'nltk_data')
+
+# NLTK package -> resource path that TextProcessor loads. Tokenization is a
+# plain split (see text_processor._TOKENIZER_SPLITS), so punkt is not needed
+RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet'
+}
+
+def use_data_dir(data_dir: Optional[str] = None) -> str:
+    """
+    Make NLTK look in the local data directory before its default locations.
+
+    Args:
+        data_dir (str): NLTK data directory (default: DEFAULT_DATA_DIR)
+
+    Returns:
+        str: Absolute path of the data directory
+    """
+    import nltk
+
+    data_dir = os.path.abspath(data_dir or DEFAULT_DATA_DIR)
+    if data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    return data_dir
+
+def missing_resources(data_dir: Optional[str] = None) -> List[str]:
+    """
+    List the NLTK packages that cannot be found locally; never downloads.
+
+    Args:
+        data_dir (str): NLTK data directory (default: DEFAULT_DATA_DIR)
+
+    Returns:
+        List[str]: Names of the missing packages in RESOURCES
+    """
+    import nltk
+
+    use_data_dir(data_dir)
+    missing = []
+    for package, resource in RESOURCES.items():
+        try:
+            # Also finds corpora that are installed zipped only
+            nltk.data.find(resource)
+        except LookupError:
+            missing.append(package)
+    return missing
+
+def require_resources(data_dir: Optional[str] = None):
+    """
+    Resolve the NLTK resources from local data, failing instead of downloading.
+
+    Args:
+        data_dir (str): NLTK data directory (default: DEFAULT_DATA_DIR)
+
+    Raises:
+        LookupError: If any resource in RESOURCES is not installed
+    """
+    missing = missing_resources(data_dir)
+    if missing:
+        raise LookupError(
+            f"NLTK resources {missing} not found in {os.path.abspath(data_dir or DEFAULT_DATA_DIR)} "
+            f"or NLTK's default locations; install them with: "
+            f"python -m opinion_mining.preprocessing.nltk_resources download --data-dir {data_dir or DEFAULT_DATA_DIR}"
+        )
+
+def download_resources(data_dir: Optional[str] = None) -> bool:
+    """
+    Download the NLTK resources into the local data directory.
+
+    Args:
+        data_dir (str): NLTK data directory (default: DEFAULT_DATA_DIR)
+
+    Returns:
+        bool: True if every package was downloaded (or already present)
+    """
+    import nltk
+
+    data_dir = use_data_dir(data_dir)
+    os.makedirs(data_dir, exist_ok=True)
+    ok = True
+    for package in RESOURCES:
+        if not nltk.download(package, download_dir=data_dir, quiet=True, raise_on_error=False):
+            logger.error(f"Error downloading NLTK package {package} into {data_dir}")
+            ok = False
+    return ok
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Install or check the NLTK data used for preprocessing")
+    parser.add_argument('command', choices=['download', 'check'])
+    parser.add_argument('--data-dir', default=os.environ.get('NLTK_DATA_DIR', DEFAULT_DATA_DIR))
+    args = parser.parse_args(argv)
+
+    if args.command == 'download' and not download_resources(args.data_dir):
+        return 1
+    missing = missing_resources(args.data_dir)
+    if missing:
+        logger.error(f"Missing NLTK resources: {missing}")
+        return 1
+    print(f"NLTK resources available: {sorted(RESOURCES)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
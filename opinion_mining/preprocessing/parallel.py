@@ -0,0 +1,71 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+class ChunkedProcessPool:
+    """
+    Runs a function over chunks of a list in a pool of worker processes and
+    merges the per-chunk results back in input order.
+
+    The pool is created on first use and kept for later calls, so the
+    initializer (e.g. loading stopwords and the lemmatizer) runs once per
+    worker process rather than once per chunk.
+    """
+
+    def __init__(self, n_workers: Optional[int] = None, chunk_size: int = 1000,
+                 initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        """
+        Args:
+            n_workers (int): Number of worker processes (default: CPU count)
+            chunk_size (int): Number of items sent to a worker at a time
+            initializer (Callable): Function run once in each worker process
+            initargs (Tuple): Arguments for the initializer
+        """
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def map(self, fn: Callable[[List[Any]], List[Any]], items: Sequence[Any]) -> List[Any]:
+        """
+        Apply a chunk function to all items.
+
+        Args:
+            fn (Callable): Picklable function mapping a list of items to a list of results
+            items (Sequence): Items to process
+
+        Returns:
+            List: Concatenated results, in the same order as the items
+        """
+        executor = self._get_executor()
+        futures = [
+            executor.submit(fn, list(items[start:start + self.chunk_size]))
+            for start in range(0, len(items), self.chunk_size)
+        ]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def close(self):
+        """Shut down the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawn rather than fork: the parent may hold model threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.n_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self.initializer,
+                    initargs=self.initargs
+                )
+            return self._executor
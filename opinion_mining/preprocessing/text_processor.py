@@ -1,56 +1,167 @@
 import re
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from typing import List, Dict
-import pandas as pd
+from typing import List
+import numpy as np
+from .near_duplicates import NearDuplicateDetector
+from .nltk_resources import require_resources
+from .parallel import ChunkedProcessPool
+from ..records import Review
 from ..utils.logger import setup_logger
-
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('wordnet')
+from ..utils.metrics import instrumented
 
 logger = setup_logger()
 
+# Everything except ASCII letters and whitespace is stripped
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+
+# Same pattern with the batch separator kept, for preprocessing many texts at once
+_NON_ALPHA_BATCH_RE = re.compile(r'[^a-zA-Z\s\x00]')
+_BATCH_SEPARATOR = '\x00'
+
+# On text reduced to letters and whitespace, NLTK's word_tokenize only
+# differs from str.split() by splitting these contractions
+_TOKENIZER_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na')
+}
+
+# Fake review heuristics, in the order _check_fake_review applies them
+FAKE_REVIEW_RULES = ('extreme_rating', 'short_text', 'repetitive_text', 'unverified')
+
+# Per-process TextProcessor used by pool workers
+_worker_processor = None
+
+def _init_worker(lemma_cache_size: int, nltk_data_dir: str):
+    global _worker_processor
+    _worker_processor = TextProcessor(lemma_cache_size=lemma_cache_size, nltk_data_dir=nltk_data_dir)
+
+def _preprocess_chunk(texts: List[str]) -> List[str]:
+    return _worker_processor.preprocess_texts(texts)
+
+def _check_fake_chunk(reviews: List[Review]) -> List[bool]:
+    return _worker_processor._fake_review_mask(reviews).tolist()
+
 class TextProcessor:
     """
     A class for preprocessing text data from product reviews.
     """
     
-    def __init__(self):
+    def __init__(self, lemma_cache_size: int = 100000, n_workers: int = 1, chunk_size: int = 1000,
+                 duplicate_threshold: float = 0.8, nltk_data_dir: str = None):
+        """
+        Args:
+            lemma_cache_size (int): Maximum number of distinct tokens whose
+                stopword/lemma outcome is memoized
+            n_workers (int): Worker processes for large review lists (1 disables
+                parallel mode, 0 uses every CPU)
+            chunk_size (int): Reviews sent to a worker at a time; lists no
+                longer than this are processed in-process
+            duplicate_threshold (float): Estimated Jaccard similarity at which
+                reviews are clustered as near duplicates (0 disables clustering)
+            nltk_data_dir (str): Local NLTK data directory (default:
+                nltk_resources.DEFAULT_DATA_DIR); resources are never downloaded here
+            
+        Raises:
+            LookupError: If the stopwords or WordNet data are not installed
+        """
+        # NLTK is only imported once a processor is built, not with this module
+        require_resources(nltk_data_dir)
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+        
+        self.nltk_data_dir = nltk_data_dir
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
+        self.lemma_cache_size = lemma_cache_size
+        # token -> lemma, or '' for stopwords
+        self._lemma_cache = {}
+        self.n_workers = n_workers
+        self.chunk_size = max(1, chunk_size)
+        self._pool = None
+        self.duplicate_detector = NearDuplicateDetector(threshold=duplicate_threshold) if duplicate_threshold else None
+    
+    def close(self):
+        """Shut down the worker processes, if any."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+    
+    def _use_pool(self, count: int) -> bool:
+        return self.n_workers != 1 and count > self.chunk_size
+    
+    def _get_pool(self) -> ChunkedProcessPool:
+        if self._pool is None:
+            self._pool = ChunkedProcessPool(
+                n_workers=self.n_workers or None,
+                chunk_size=self.chunk_size,
+                initializer=_init_worker,
+                initargs=(self.lemma_cache_size, self.nltk_data_dir)
+            )
+        return self._pool
         
-    def preprocess_reviews(self, reviews: List[Dict]) -> List[Dict]:
+    @instrumented('preprocess', items=len)
+    def preprocess_reviews(self, reviews: List[Review]) -> List[Review]:
         """
-        Preprocess a list of review dictionaries.
+        Preprocess a list of reviews.
         
         Args:
-            reviews (List[Dict]): List of review dictionaries
+            reviews (List[Review]): Reviews to preprocess
             
         Returns:
-            List[Dict]: List of preprocessed review dictionaries
+            List[Review]: The reviews with valid text, with processed_text set
         """
         processed_reviews = []
         
         for review in reviews:
             try:
-                processed_text = self._preprocess_text(review['text'])
-                review['processed_text'] = processed_text
+                if not isinstance(review.text, str):
+                    raise TypeError(f"review text must be a string, not {type(review.text).__name__}")
                 processed_reviews.append(review)
             except Exception as e:
                 logger.error(f"Error preprocessing review: {str(e)}")
                 continue
+        
+        texts = [review.text for review in processed_reviews]
+        if self._use_pool(len(texts)):
+            processed_texts = self._get_pool().map(_preprocess_chunk, texts)
+        else:
+            processed_texts = self.preprocess_texts(texts)
+        for review, processed_text in zip(processed_reviews, processed_texts):
+            review.processed_text = processed_text
                 
         return processed_reviews
     
+    @instrumented('preprocess_texts', items=len)
+    def preprocess_texts(self, texts: List[str]) -> List[str]:
+        """
+        Preprocess many text strings at once.
+        
+        Produces exactly the same output as calling _preprocess_text on each
+        text, but lowercases and strips the whole batch in one pass, tokenizes
+        on whitespace and memoizes the stopword/lemma outcome per token.
+        
+        Args:
+            texts (List[str]): Input texts to preprocess
+            
+        Returns:
+            List[str]: Preprocessed texts, in input order
+        """
+        if not texts:
+            return []
+        
+        joined = _BATCH_SEPARATOR.join(texts)
+        if joined.count(_BATCH_SEPARATOR) == len(texts) - 1:
+            cleaned = _NON_ALPHA_BATCH_RE.sub('', joined.lower()).split(_BATCH_SEPARATOR)
+        else:
+            # A text contains the separator itself; clean each text on its own
+            cleaned = [_NON_ALPHA_RE.sub('', text.lower()) for text in texts]
+        
+        return [self._normalize_tokens(text) for text in cleaned]
+    
+    @instrumented('preprocess_text')
     def _preprocess_text(self, text: str) -> str:
         """
         Preprocess a single text string.
@@ -61,62 +172,166 @@ class TextProcessor:
         Returns:
             str: Preprocessed text
         """
-        # Convert to lowercase
-        text = text.lower()
+        # Convert to lowercase, then remove special characters and numbers
+        text = _NON_ALPHA_RE.sub('', text.lower())
         
-        # Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        return self._normalize_tokens(text)
+    
+    def _normalize_tokens(self, text: str) -> str:
+        """
+        Tokenize cleaned text, remove stopwords and lemmatize.
         
-        # Tokenize
-        tokens = word_tokenize(text)
+        Args:
+            text (str): Lowercased text containing only letters and whitespace
+            
+        Returns:
+            str: Space-joined lemmas
+        """
+        cache = self._lemma_cache
+        lemmas = []
         
-        # Remove stopwords and lemmatize
-        tokens = [self.lemmatizer.lemmatize(token) 
-                 for token in tokens 
-                 if token not in self.stop_words]
+        for token in text.split():
+            parts = _TOKENIZER_SPLITS.get(token)
+            for part in parts or (token,):
+                lemma = cache.get(part)
+                if lemma is None:
+                    lemma = '' if part in self.stop_words else self.lemmatizer.lemmatize(part)
+                    if len(cache) < self.lemma_cache_size:
+                        cache[part] = lemma
+                if lemma:
+                    lemmas.append(lemma)
         
         # Join tokens back into text
-        return ' '.join(tokens)
+        return ' '.join(lemmas)
     
-    def detect_fake_reviews(self, reviews: List[Dict]) -> List[Dict]:
+    @instrumented('detect_fake_reviews', items=len)
+    def detect_fake_reviews(self, reviews: List[Review]) -> List[Review]:
         """
         Detect potential fake reviews using various heuristics.
         
+        Besides the per-review checks, near-identical reviews (copy-pasted or
+        templated campaigns) are clustered across the whole list: each review
+        gets a ``duplicate_cluster_id`` (None if it has no near duplicate) and
+        clustered reviews are flagged as potentially fake.
+        
         Args:
-            reviews (List[Dict]): List of review dictionaries
+            reviews (List[Review]): Reviews to check
             
         Returns:
-            List[Dict]: List of reviews with fake review detection results
+            List[Review]: The same reviews with the detection results set
         """
-        for review in reviews:
-            review['is_potentially_fake'] = self._check_fake_review(review)
+        if self._use_pool(len(reviews)):
+            # Only ship the fields the heuristics look at to the workers
+            flags = self._get_pool().map(
+                _check_fake_chunk,
+                [Review(rating=review.rating, text=review.text, verified=review.verified) for review in reviews]
+            )
+        else:
+            flags = self._fake_review_mask(reviews).tolist()
+        
+        if self.duplicate_detector is not None:
+            cluster_ids = self.duplicate_detector.cluster([review.text for review in reviews])
+        else:
+            cluster_ids = [None] * len(reviews)
+        
+        for review, flag, cluster_id in zip(reviews, flags, cluster_ids):
+            review.is_potentially_fake = flag or cluster_id is not None
+            review.duplicate_cluster_id = cluster_id
         return reviews
     
-    def _check_fake_review(self, review: Dict) -> bool:
+    def fake_review_flags(self, reviews: List[Review]) -> 'pandas.DataFrame':
+        """
+        Evaluate every fake review heuristic for many reviews at once.
+        
+        Reviews are loaded into columns (each text is split once) and each
+        heuristic is a vectorized expression over them, so it is visible which
+        rules fired. The outcome matches _check_fake_review review for review.
+        
+        Args:
+            reviews (List[Review]): Reviews to check
+            
+        Returns:
+            pd.DataFrame: One row per review with the input columns (rating,
+                word_count, unique_words, verified), a boolean column per rule in
+                FAKE_REVIEW_RULES, is_potentially_fake, and fake_rule (the first
+                rule that fired, or None)
+        """
+        import pandas as pd
+        
+        ratings, verified = self._rating_columns(reviews)
+        word_counts, unique_words = self._word_columns(reviews)
+        frame = pd.DataFrame({
+            'rating': ratings,
+            'word_count': word_counts,
+            'unique_words': unique_words,
+            'verified': verified
+        })
+        frame['extreme_rating'] = frame['rating'].isin([1, 5])
+        frame['short_text'] = frame['word_count'] < 5
+        # unique / count < 0.5 without dividing by an empty text's zero count
+        frame['repetitive_text'] = frame['unique_words'] * 2 < frame['word_count']
+        frame['unverified'] = ~frame['verified']
+        
+        rule_flags = frame[list(FAKE_REVIEW_RULES)].to_numpy()
+        frame['is_potentially_fake'] = rule_flags.any(axis=1)
+        frame['fake_rule'] = pd.Series(
+            np.select(list(rule_flags.T), FAKE_REVIEW_RULES, default=None) if len(frame) else [],
+            dtype=object
+        )
+        return frame
+    
+    def _fake_review_mask(self, reviews: List[Review]) -> np.ndarray:
+        # Same outcome as fake_review_flags, but texts are only split for
+        # reviews that the rating and verified rules have not already flagged
+        ratings, verified = self._rating_columns(reviews)
+        fake = ratings.isin([1, 5]).to_numpy() | ~verified
+        undecided = np.flatnonzero(~fake)
+        word_counts, unique_words = self._word_columns([reviews[i] for i in undecided])
+        fake[undecided] = (word_counts < 5) | (unique_words * 2 < word_counts)
+        return fake
+    
+    def _rating_columns(self, reviews: List[Review]):
+        import pandas as pd
+        
+        ratings = pd.Series([review.rating for review in reviews], dtype=object).infer_objects()
+        verified = np.fromiter((bool(review.verified) for review in reviews), dtype=bool, count=len(reviews))
+        return ratings, verified
+    
+    def _word_columns(self, reviews: List[Review]):
+        # .split() and .lower().split() yield the same number of words
+        word_counts = []
+        unique_words = []
+        for review in reviews:
+            words = review.text.lower().split()
+            word_counts.append(len(words))
+            unique_words.append(len(set(words)))
+        return np.array(word_counts, dtype=np.int64), np.array(unique_words, dtype=np.int64)
+    
+    def _check_fake_review(self, review: Review) -> bool:
         """
         Check if a review is potentially fake using various heuristics.
         
         Args:
-            review (Dict): Review dictionary
+            review (Review): Review to check
             
         Returns:
             bool: True if review is potentially fake, False otherwise
         """
         # Check for extreme ratings
-        if review['rating'] in [1, 5]:
+        if review.rating in [1, 5]:
             return True
             
         # Check for very short reviews
-        if len(review['text'].split()) < 5:
+        if len(review.text.split()) < 5:
             return True
             
         # Check for repetitive text
-        words = review['text'].lower().split()
+        words = review.text.lower().split()
         if len(set(words)) / len(words) < 0.5:
             return True
             
         # Check for verified purchase status
-        if not review.get('verified', False):
+        if not review.verified:
             return True
             
-        return False 
\ No newline at end of file
+        return False
\ No newline at end of file
@@ -0,0 +1,157 @@
+from enum import IntEnum
+from typing import Any, Dict, NamedTuple, Optional
+
+class Label(IntEnum):
+    """
+    Sentiment label. Members are singletons, so every result shares them.
+
+    The numbering is also the column order used wherever per-label scores
+    are kept in arrays; on ties the lowest value wins.
+    """
+    POSITIVE = 0
+    NEGATIVE = 1
+    NEUTRAL = 2
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    @classmethod
+    def parse(cls, value) -> 'Label':
+        """Convert 'positive', 'POSITIVE' or a Label to a Label."""
+        if isinstance(value, cls):
+            return value
+        return cls[value.upper()]
+
+class SentimentResult(NamedTuple):
+    """
+    Label and score from one sentiment method.
+
+    Results are immutable, so reviews with the same text (or the same
+    rating) share one instance instead of each holding a copy.
+    """
+    label: Label
+    score: float
+
+    def to_dict(self) -> Dict:
+        return {'label': str(self.label), 'score': self.score}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> Optional['SentimentResult']:
+        if data is None:
+            return None
+        return cls(Label.parse(data['label']), data['score'])
+
+def _export(result: Optional[SentimentResult]) -> Optional[Dict]:
+    return result.to_dict() if result is not None else None
+
+# Methods of a Sentiment, in field order
+SENTIMENT_METHODS = ('textblob', 'transformer', 'rating', 'combined')
+
+class Sentiment(NamedTuple):
+    """
+    Results of every method for one review, None where a method failed (or
+    was skipped), and the path the analyzer took to the combined result.
+    """
+    textblob: Optional[SentimentResult] = None
+    transformer: Optional[SentimentResult] = None
+    rating: Optional[SentimentResult] = None
+    combined: Optional[SentimentResult] = None
+    path: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """
+        Export in the nested dict layout, with the per-method results
+        repeated under combined['details'].
+        """
+        combined = _export(self.combined)
+        if combined is not None:
+            combined['details'] = {
+                'textblob': _export(self.textblob),
+                'transformer': _export(self.transformer),
+                'rating': _export(self.rating)
+            }
+        return {
+            'textblob': _export(self.textblob),
+            'transformer': _export(self.transformer),
+            'rating': _export(self.rating),
+            'combined': combined,
+            'path': self.path
+        }
+
+class Review:
+    """
+    One product review as it moves through the pipeline.
+
+    The scraper fills the review fields, TextProcessor adds processed_text
+    and the fake review flags, and SentimentAnalyzer attaches a Sentiment.
+    Fields live in __slots__ rather than a per-review dict. Item access
+    (review['text'], review.get('rating')) is supported for code and
+    templates written against the old dict reviews, and to_dict() exports
+    the old nested layout.
+    """
+
+    __slots__ = ('rating', 'title', 'text', 'date', 'verified', 'processed_text',
+                 'is_potentially_fake', 'duplicate_cluster_id', 'sentiment')
+
+    def __init__(self, rating: float = 0.0, title: str = '', text: str = '', date: str = '',
+                 verified: bool = False, processed_text: Optional[str] = None,
+                 is_potentially_fake: Optional[bool] = None, duplicate_cluster_id: Optional[int] = None,
+                 sentiment: Optional[Sentiment] = None):
+        self.rating = rating
+        self.title = title
+        self.text = text
+        self.date = date
+        self.verified = verified
+        self.processed_text = processed_text
+        self.is_potentially_fake = is_potentially_fake
+        self.duplicate_cluster_id = duplicate_cluster_id
+        self.sentiment = sentiment
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Review':
+        """Build a review from a dict, ignoring keys that are not review fields."""
+        review = cls(**{key: value for key, value in data.items() if key in cls.__slots__ and key != 'sentiment'})
+        sentiment = data.get('sentiment')
+        if isinstance(sentiment, dict):
+            sentiment = Sentiment(
+                *(SentimentResult.from_dict(sentiment.get(method)) for method in SENTIMENT_METHODS),
+                path=sentiment.get('path')
+            )
+        review.sentiment = sentiment
+        return review
+
+    def to_dict(self) -> Dict:
+        """Export as a plain dict (e.g. for templates, JSON or pandas)."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['sentiment'] = self.sentiment.to_dict() if self.sentiment is not None else None
+        return data
+
+    def copy(self) -> 'Review':
+        return Review(**{name: getattr(self, name) for name in self.__slots__})
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Review):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Review(rating={self.rating!r}, title={self.title!r}, date={self.date!r})"
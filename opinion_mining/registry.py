@@ -0,0 +1,281 @@
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from .data_collection.review_scraper import ReviewScraper
+from .data_collection.http_fetcher import HttpFetcher
+from .data_collection.http_cache import ResponseCache, DEFAULT_TTL
+from .data_collection.checkpoints import CheckpointStore
+from .preprocessing.text_processor import TextProcessor
+from .sentiment_analysis.sentiment_analyzer import SentimentAnalyzer, DEFAULT_MODEL
+from .sentiment_analysis.result_cache import SentimentCache
+from .jobs import DEFAULT_DB_PATH as DEFAULT_JOBS_DB_PATH, JobStore, JobWorkerPool
+from .records import Review
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+class ComponentRegistry:
+    """
+    A thread-safe, process-wide registry of pipeline components.
+
+    Each component is built once per process (i.e. once per gunicorn worker)
+    and the same instance is handed to every caller until it is reloaded or
+    evicted.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._warmers: Dict[str, Optional[Callable[[Any], None]]] = {}
+        self._warm_start: Dict[str, bool] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any], warmer: Optional[Callable[[Any], None]] = None,
+                 warm_start: bool = True):
+        """
+        Register a component factory.
+
+        Args:
+            name (str): Component name
+            factory (Callable): Zero-argument callable building the component
+            warmer (Callable): Optional callable run once on a fresh instance
+            warm_start (bool): Whether warm_up() builds it by default; components
+                with side effects (e.g. starting threads) are only built on use
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._warmers[name] = warmer
+            self._warm_start[name] = warm_start
+            self._locks.setdefault(name, threading.Lock())
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        Return the shared instance of a component, building it on first use.
+
+        Args:
+            name (str): Component name
+
+        Returns:
+            Any: The shared component instance
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        # Per-component lock so a slow model load does not block other components
+        with self._component_lock(name):
+            instance = self._instances.get(name)
+            if instance is None:
+                instance = self._build(name, warm=False)
+                self._instances[name] = instance
+            return instance
+
+    def warm_up(self, names: Optional[List[str]] = None):
+        """
+        Build components ahead of the first request and run a dummy inference.
+
+        Args:
+            names (List[str]): Components to warm (default: all registered with warm_start)
+        """
+        for name in names or [name for name in self._factories if self._warm_start[name]]:
+            with self._component_lock(name):
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._build(name, warm=False)
+                    self._instances[name] = instance
+                self._warm(name, instance)
+
+    def reload(self, name: str, warm: bool = True) -> Any:
+        """
+        Build a fresh instance of a component and swap it in.
+
+        The new instance is built while the old one keeps serving requests,
+        so rolling a model version does not require restarting workers.
+
+        Args:
+            name (str): Component name
+            warm (bool): Whether to warm the new instance before swapping it in
+
+        Returns:
+            Any: The new component instance
+        """
+        with self._component_lock(name):
+            instance = self._build(name, warm=warm)
+            previous = self._instances.get(name)
+            self._instances[name] = instance
+            logger.info(f"Reloaded component: {name}")
+        self._close(name, previous)
+        return instance
+
+    def evict(self, name: Optional[str] = None):
+        """
+        Drop cached component instances; they are rebuilt on next use.
+
+        Args:
+            name (str): Component to evict (default: all components)
+        """
+        names = [name] if name else list(self._factories)
+        for component in names:
+            with self._component_lock(component):
+                previous = self._instances.pop(component, None)
+            if previous is not None:
+                logger.info(f"Evicted component: {component}")
+                self._close(component, previous)
+
+    def loaded(self) -> List[str]:
+        """Return the names of components that are currently built."""
+        return [name for name in self._factories if name in self._instances]
+
+    def _component_lock(self, name: str) -> threading.Lock:
+        if name not in self._factories:
+            raise KeyError(f"Unknown component: {name}")
+        return self._locks[name]
+
+    def _build(self, name: str, warm: bool) -> Any:
+        logger.info(f"Loading component: {name}")
+        instance = self._factories[name]()
+        if warm:
+            self._warm(name, instance)
+        return instance
+
+    def _close(self, name: str, instance: Any):
+        # Release background resources held by a replaced instance
+        close = getattr(instance, 'close', None)
+        if instance is None or close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.error(f"Error closing component {name}: {str(e)}")
+
+    def _warm(self, name: str, instance: Any):
+        warmer = self._warmers.get(name)
+        if warmer is None:
+            return
+        try:
+            warmer(instance)
+            logger.info(f"Warmed up component: {name}")
+        except Exception as e:
+            logger.error(f"Error warming up component {name}: {str(e)}")
+
+def env_flag(name: str) -> bool:
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+def _build_analyzer() -> SentimentAnalyzer:
+    # Read at build time so a reload picks up a new model version
+    analyzer = SentimentAnalyzer(
+        model_name=os.environ.get('SENTIMENT_MODEL', DEFAULT_MODEL),
+        batch_size=int(os.environ.get('SENTIMENT_BATCH_SIZE', 32)),
+        backend=os.environ.get('SENTIMENT_BACKEND', 'torch'),
+        onnx_model_dir=os.environ.get('ONNX_MODEL_DIR'),
+        intra_op_threads=int(os.environ.get('ONNX_INTRA_OP_THREADS', 0)) or None,
+        model_version=os.environ.get('SENTIMENT_MODEL_VERSION', ''),
+        cascade=env_flag('SENTIMENT_CASCADE'),
+        weights=json.loads(os.environ['SENTIMENT_WEIGHTS']) if os.environ.get('SENTIMENT_WEIGHTS') else None
+    )
+    if env_flag('SENTIMENT_CACHE'):
+        analyzer.cache = SentimentCache(
+            namespace=analyzer.cache_namespace,
+            max_entries=int(os.environ.get('SENTIMENT_CACHE_SIZE', 10000)),
+            db_path=os.environ.get('SENTIMENT_CACHE_PATH') or None
+        )
+    if env_flag('MICROBATCH'):
+        analyzer.enable_microbatching(
+            max_batch_size=int(os.environ.get('MICROBATCH_MAX_SIZE', 32)),
+            max_wait_ms=float(os.environ.get('MICROBATCH_MAX_WAIT_MS', 5.0))
+        )
+    return analyzer
+
+def _build_response_cache() -> Optional[ResponseCache]:
+    path = os.environ.get('SCRAPER_CACHE_PATH')
+    if not path:
+        return None
+    ttls = os.environ.get('SCRAPER_CACHE_TTLS')
+    return ResponseCache(
+        path,
+        ttl_rules=list(json.loads(ttls).items()) if ttls else None,
+        default_ttl=float(os.environ.get('SCRAPER_CACHE_DEFAULT_TTL', DEFAULT_TTL)),
+        offline=env_flag('SCRAPER_OFFLINE')
+    )
+
+def _build_scraper() -> ReviewScraper:
+    fetcher = HttpFetcher(
+        headers=ReviewScraper.DEFAULT_HEADERS,
+        requests_per_second=float(os.environ.get('SCRAPER_REQUESTS_PER_SECOND', 0.5)),
+        max_connections=int(os.environ.get('SCRAPER_MAX_CONNECTIONS', 8)),
+        cache=_build_response_cache()
+    )
+    checkpoint_path = os.environ.get('SCRAPER_CHECKPOINT_PATH')
+    return ReviewScraper(
+        live=env_flag('SCRAPER_LIVE'),
+        fetcher=fetcher,
+        prefetch_pages=int(os.environ.get('SCRAPER_PREFETCH_PAGES', 3)),
+        parse_workers=int(os.environ.get('SCRAPER_PARSE_WORKERS', 0)),
+        checkpoints=CheckpointStore(checkpoint_path) if checkpoint_path else None
+    )
+
+def build_processor(default_workers: int = 1) -> TextProcessor:
+    """
+    Build a TextProcessor configured from the environment.
+
+    Args:
+        default_workers (int): Worker processes when PREPROCESS_WORKERS is unset
+
+    Returns:
+        TextProcessor: A new processor, not shared through the registry
+    """
+    return TextProcessor(
+        n_workers=int(os.environ.get('PREPROCESS_WORKERS', default_workers)),
+        chunk_size=int(os.environ.get('PREPROCESS_CHUNK_SIZE', 1000)),
+        duplicate_threshold=float(os.environ.get('DUPLICATE_THRESHOLD', 0.8)),
+        nltk_data_dir=os.environ.get('NLTK_DATA_DIR')
+    )
+
+def _warm_processor(processor: TextProcessor):
+    processor._preprocess_text("Warming up the text processor.")
+
+def _warm_analyzer(analyzer: SentimentAnalyzer):
+    analyzer.analyze_sentiment([Review(rating=5.0, processed_text='warming up the model')])
+
+def _build_job_store() -> JobStore:
+    return JobStore(
+        os.environ.get('JOBS_DB_PATH') or DEFAULT_JOBS_DB_PATH,
+        stale_after=float(os.environ.get('JOBS_STALE_SECONDS', 600)),
+        max_attempts=int(os.environ.get('JOBS_MAX_ATTEMPTS', 3))
+    )
+
+def _build_job_workers() -> JobWorkerPool:
+    return JobWorkerPool(
+        get_job_store(),
+        registry.get,
+        workers=int(os.environ.get('JOBS_WORKERS', 1)),
+        poll_interval=float(os.environ.get('JOBS_POLL_INTERVAL', 1.0)),
+        batch_size=int(os.environ.get('STREAM_BATCH_SIZE', 64)),
+        queue_size=int(os.environ.get('STREAM_QUEUE_SIZE', 4))
+    )
+
+registry = ComponentRegistry()
+registry.register('scraper', _build_scraper)
+registry.register('processor', build_processor, _warm_processor)
+registry.register('analyzer', _build_analyzer, _warm_analyzer)
+registry.register('job_store', _build_job_store, warm_start=False)
+# Starts worker threads, so only on the first /jobs request
+registry.register('job_workers', _build_job_workers, warm_start=False)
+
+def get_scraper() -> ReviewScraper:
+    return registry.get('scraper')
+
+def get_processor() -> TextProcessor:
+    return registry.get('processor')
+
+def get_analyzer() -> SentimentAnalyzer:
+    return registry.get('analyzer')
+
+def get_job_store() -> JobStore:
+    return registry.get('job_store')
+
+def get_job_workers() -> JobWorkerPool:
+    return registry.get('job_workers')
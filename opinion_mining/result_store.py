@@ -0,0 +1,210 @@
+import hashlib
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+from .records import SENTIMENT_METHODS, Label, Review, Sentiment
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Indexed by Label value, so a label's dictionary index is the label itself
+LABELS = tuple(str(label) for label in Label)
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+DEFAULT_ROW_GROUP_SIZE = 65536
+
+def _pyarrow():
+    # pyarrow is an optional dependency, only needed when results are stored
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "The result store requires pyarrow; install it with `pip install 'opinion_mining[arrow]'`"
+        ) from e
+    return pyarrow
+
+def result_schema():
+    """
+    Typed columnar schema of an analyzed review.
+
+    Labels are dictionary-encoded against the fixed LABELS, so each one
+    costs a byte per row and every row group shares the same dictionary.
+    """
+    pa = _pyarrow()
+    label = pa.dictionary(pa.int8(), pa.string())
+    fields = [
+        pa.field('text_hash', pa.string()),
+        pa.field('rating', pa.float32()),
+        pa.field('date', pa.string()),
+        pa.field('verified', pa.bool_()),
+        pa.field('is_potentially_fake', pa.bool_()),
+        pa.field('duplicate_cluster_id', pa.int64()),
+        pa.field('sentiment_path', pa.string())
+    ]
+    for method in SENTIMENT_METHODS:
+        fields.append(pa.field(f'{method}_label', label))
+        fields.append(pa.field(f'{method}_score', pa.float32()))
+    return pa.schema(fields)
+
+def text_hash(text: Optional[str]) -> Optional[str]:
+    """Stable hash identifying a review text without storing it."""
+    if text is None:
+        return None
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def flatten_review(review: Review) -> Dict:
+    """
+    Flatten an analyzed review into one row of the result schema.
+
+    Args:
+        review (Review): Review analyzed by SentimentAnalyzer
+
+    Returns:
+        Dict: Column name -> value (labels as Label)
+    """
+    row = {
+        'text_hash': text_hash(review.text),
+        'rating': review.rating,
+        'date': review.date,
+        'verified': review.verified,
+        'is_potentially_fake': review.is_potentially_fake,
+        'duplicate_cluster_id': review.duplicate_cluster_id
+    }
+    sentiment = review.sentiment or Sentiment()
+    row['sentiment_path'] = sentiment.path
+    for method, result in zip(SENTIMENT_METHODS, sentiment):
+        row[f'{method}_label'] = result.label if result is not None else None
+        row[f'{method}_score'] = result.score if result is not None else None
+    return row
+
+def _file_format(path: str) -> str:
+    return 'arrow' if path.lower().endswith(ARROW_EXTENSIONS) else 'parquet'
+
+class ResultWriter:
+    """
+    Writes analyzed reviews to a columnar Parquet or Arrow IPC file.
+
+    Reviews are flattened as they arrive and written one row group (Arrow
+    record batch) at a time, so memory stays bounded by the row group size.
+    The format follows the file extension: .arrow/.feather/.ipc write Arrow
+    IPC, anything else Parquet.
+    """
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE, compression: Optional[str] = None):
+        """
+        Args:
+            path (str): Output file
+            row_group_size (int): Reviews per row group / record batch
+            compression (str): Parquet codec (default: zstd), or Arrow IPC buffer
+                codec (default: none, which keeps memory-mapped reads zero-copy)
+        """
+        pa = _pyarrow()
+        self.path = path
+        self.format = _file_format(path)
+        self.row_group_size = max(1, row_group_size)
+        self.schema = result_schema()
+        self.rows_written = 0
+        self._rows: List[Dict] = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.format == 'parquet':
+            self._writer = pa.parquet.ParquetWriter(path, self.schema, compression=compression or 'zstd')
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = pa.ipc.new_file(
+                self._sink, self.schema, options=pa.ipc.IpcWriteOptions(compression=compression)
+            )
+
+    def write(self, review: Review):
+        """Add one analyzed review (usable as a StreamingPipeline sink)."""
+        self._rows.append(flatten_review(review))
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def write_many(self, reviews: Iterable[Review]):
+        for review in reviews:
+            self.write(review)
+
+    def close(self):
+        """Write the last row group and finalize the file."""
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        if self.format == 'arrow':
+            self._sink.close()
+        self._writer = None
+        logger.info(f"Wrote {self.rows_written} analyzed reviews to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        pa = _pyarrow()
+        label_values = pa.array(LABELS)
+        columns = []
+        for field in self.schema:
+            values = [row[field.name] for row in self._rows]
+            if pa.types.is_dictionary(field.type):
+                indices = pa.array([int(value) if value is not None else None for value in values],
+                                   type=pa.int8())
+                columns.append(pa.DictionaryArray.from_arrays(indices, label_values))
+            else:
+                columns.append(pa.array(values, type=field.type))
+        batch = pa.RecordBatch.from_arrays(columns, schema=self.schema)
+        if self.format == 'parquet':
+            self._writer.write_batch(batch, row_group_size=self.row_group_size)
+        else:
+            self._writer.write_batch(batch)
+        self.rows_written += len(self._rows)
+        self._rows = []
+
+def read_results(path: str, columns: Optional[List[str]] = None):
+    """
+    Open a result file as an Arrow table backed by a memory map.
+
+    Arrow IPC files are mapped without copying, so only the pages of the
+    columns actually touched are read from disk. Parquet is decoded, but
+    only for the requested columns.
+
+    Args:
+        path (str): Result file written by ResultWriter
+        columns (List[str]): Columns to load (default: all)
+
+    Returns:
+        pyarrow.Table: The stored results
+    """
+    pa = _pyarrow()
+    if _file_format(path) == 'parquet':
+        return pa.parquet.read_table(path, columns=columns, memory_map=True)
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return table.select(columns) if columns else table
+
+def iter_result_batches(path: str, columns: Optional[List[str]] = None) -> Iterator:
+    """
+    Scan a result file one row group (record batch) at a time.
+
+    Args:
+        path (str): Result file written by ResultWriter
+        columns (List[str]): Columns to load (default: all)
+
+    Yields:
+        pyarrow.RecordBatch: Stored results, in write order
+    """
+    pa = _pyarrow()
+    if _file_format(path) == 'parquet':
+        parquet_file = pa.parquet.ParquetFile(path, memory_map=True)
+        for index in range(parquet_file.num_row_groups):
+            yield from parquet_file.read_row_group(index, columns=columns).to_batches()
+        return
+    reader = pa.ipc.open_file(pa.memory_map(path, 'r'))
+    for index in range(reader.num_record_batches):
+        batch = reader.get_batch(index)
+        yield batch.select(columns) if columns else batch
@@ -0,0 +1,192 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+from ..utils.logger import setup_logger
+from ..utils.metrics import ENABLED as METRICS_ENABLED, metrics
+
+logger = setup_logger()
+
+_STOP = object()
+
+QUEUE_DEPTH = metrics.gauge(
+    'opinion_mining_scheduler_queue_depth', 'Texts waiting for the micro-batching scheduler'
+)
+BATCH_FILL = metrics.gauge(
+    'opinion_mining_scheduler_batch_fill', 'Average fraction of max_batch_size filled by scheduled batches'
+)
+
+class InferenceScheduler:
+    """
+    Dynamic micro-batching scheduler for model inference.
+
+    Texts submitted by concurrent callers are queued and run through the
+    model together. A batch is flushed when it reaches ``max_batch_size``
+    texts or when the oldest queued text has waited ``max_wait_ms``, and
+    each result is routed back to the future of the caller that submitted it.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[str]], List[Dict]],
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        """
+        Args:
+            batch_fn (Callable): Function mapping a list of texts to a list of results
+            max_batch_size (int): Maximum number of texts per batch
+            max_wait_ms (float): Maximum time a text waits for a batch to fill
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._running = True
+
+        self._worker = threading.Thread(target=self._run, name='inference-scheduler', daemon=True)
+        self._worker.start()
+
+        if METRICS_ENABLED:
+            QUEUE_DEPTH.set_function(self.queue_depth)
+            BATCH_FILL.set_function(self.batch_fill)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def submit(self, texts: List[str]) -> List[Future]:
+        """
+        Queue texts for inference.
+
+        Args:
+            texts (List[str]): Input texts
+
+        Returns:
+            List[Future]: One future per text, resolving to its result
+        """
+        futures = []
+        with self._submit_lock:
+            if not self._running:
+                raise RuntimeError("Inference scheduler has been shut down")
+            enqueued_at = time.monotonic()
+            for text in texts:
+                future = Future()
+                self._queue.put((text, future, enqueued_at))
+                futures.append(future)
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+        return futures
+
+    def infer(self, texts: List[str]) -> List[Dict]:
+        """
+        Queue texts for inference and wait for their results.
+
+        Args:
+            texts (List[str]): Input texts
+
+        Returns:
+            List[Dict]: Results in the same order as the input texts
+        """
+        return [future.result() for future in self.submit(texts)]
+
+    def queue_depth(self) -> int:
+        """Number of texts waiting to be batched."""
+        return self._queue.qsize()
+
+    def batch_fill(self) -> float:
+        """Average fraction of max_batch_size filled by the batches run so far."""
+        with self._stats_lock:
+            return self._items / (self._batches * self.max_batch_size) if self._batches else 0.0
+
+    def metrics(self) -> Dict:
+        """
+        Report queue and batching statistics.
+
+        Returns:
+            Dict: Queue depth, batch counts and average batch fill
+        """
+        with self._stats_lock:
+            batches = self._batches
+            items = self._items
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self._max_queue_depth,
+                'batches': batches,
+                'items': items,
+                'errors': self._errors,
+                'avg_batch_size': items / batches if batches else 0.0,
+                'avg_batch_fill': items / (batches * self.max_batch_size) if batches else 0.0,
+                'avg_queue_wait_ms': (self._total_wait / items) * 1000.0 if items else 0.0
+            }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting texts; texts already queued are still processed.
+
+        Args:
+            wait (bool): Whether to block until the queue has drained
+        """
+        with self._submit_lock:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put(_STOP)
+        if wait:
+            self._worker.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            # The oldest text in the batch bounds how long we wait
+            deadline = item[2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List):
+        # Drop texts whose callers have cancelled in the meantime
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        started = time.monotonic()
+        try:
+            results = self.batch_fn([text for text, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Expected {len(batch)} results, got {len(results)}")
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            logger.error(f"Error in scheduled batch inference: {str(e)}")
+            with self._stats_lock:
+                self._errors += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+        with self._stats_lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._total_wait += sum(started - enqueued_at for _, _, enqueued_at in batch)
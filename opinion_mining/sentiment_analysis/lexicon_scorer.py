@@ -0,0 +1,214 @@
+import argparse
+import re
+import sys
+from itertools import chain
+from typing import Dict, List, Optional
+import numpy as np
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Same negations as TextBlob's English pattern analyzer
+NEGATIONS = ('no', 'not', 'never', "n't")
+
+# Polarities agree with TextBlob to within float rounding (the scorer
+# performs the same operations in the same order, so in practice they are
+# identical); the parity check fails beyond this
+DEFAULT_TOLERANCE = 1e-9
+
+# Texts made of letters and whitespace (e.g. TextProcessor output) tokenize
+# the way TextBlob does with a plain split; anything else is scored by TextBlob
+_PLAIN_TEXT_RE = re.compile(r'[A-Za-z \t\n\r\f\v]*')
+
+def _pattern_sentiment():
+    # TextBlob's English analyzer; importing it is cheap, the lexicon itself
+    # is parsed on first use
+    from textblob.en import sentiment
+    return sentiment
+
+class LexiconScorer:
+    """
+    Batch polarity scorer over TextBlob's English sentiment lexicon.
+
+    The lexicon is compiled once into a vocabulary and arrays of polarity,
+    intensity and modifier flags. A batch of texts is turned into one array
+    of token ids, and TextBlob's handling of intensifiers ("very good"),
+    negations ("not good", "really not good") and negated intensifiers is
+    evaluated for every token at once with prefix scans, instead of walking
+    each text in Python.
+
+    Polarity matches TextBlob(text).sentiment.polarity to within
+    DEFAULT_TOLERANCE. Texts containing anything other than letters and
+    whitespace (punctuation, emoticons, contractions) are passed to TextBlob
+    unchanged, so they match exactly.
+    """
+
+    def __init__(self):
+        lexicon = _pattern_sentiment()
+        words = sorted(word for word in lexicon.keys() if ' ' not in word)
+        size = len(words)
+
+        # Negations are not lexicon words but still get ids; the extra last
+        # row describes unknown tokens, which are looked up as id -1
+        self.vocabulary = np.array(words + list(NEGATIONS), dtype=object)
+        self._ids = {word: i for i, word in enumerate(self.vocabulary)}
+        rows = size + len(NEGATIONS) + 1
+
+        self._known = np.zeros(rows, dtype=bool)
+        self._polarity = np.zeros(rows, dtype=np.float64)
+        self._intensity = np.ones(rows, dtype=np.float64)
+        self._modifier = np.zeros(rows, dtype=bool)
+        self._adverb = np.zeros(rows, dtype=bool)
+        self._negation = np.zeros(rows, dtype=bool)
+
+        for i, word in enumerate(words):
+            entry = lexicon[word]
+            polarity, _, intensity = entry[None]
+            self._known[i] = True
+            self._polarity[i] = polarity
+            self._intensity[i] = intensity
+            self._modifier[i] = 'RB' in entry
+            self._adverb[i] = word.endswith('ly')
+        for word in NEGATIONS:
+            if word in lexicon:
+                raise ValueError(f"Negation {word!r} is a lexicon word")
+            self._negation[self._ids[word]] = True
+
+    def polarity(self, texts: List[str]) -> np.ndarray:
+        """
+        Compute TextBlob polarity for many texts.
+
+        Args:
+            texts (List[str]): Input texts
+
+        Returns:
+            np.ndarray: Polarity in [-1, 1] per text (0.0 for texts without sentiment words)
+        """
+        polarity = np.zeros(len(texts), dtype=np.float64)
+        plain = []
+        for i, text in enumerate(texts):
+            if _PLAIN_TEXT_RE.fullmatch(text):
+                plain.append(i)
+            else:
+                polarity[i] = _pattern_sentiment()(text)[0]
+        if plain:
+            polarity[plain] = self._plain_polarity([texts[i].lower().split() for i in plain])
+        return polarity
+
+    def _plain_polarity(self, token_lists: List[List[str]]) -> np.ndarray:
+        n = len(token_lists)
+        counts = np.fromiter(map(len, token_lists), dtype=np.int64, count=n)
+        total = int(counts.sum())
+        if not total:
+            return np.zeros(n, dtype=np.float64)
+
+        tokens = list(chain.from_iterable(token_lists))
+        ids = np.fromiter((self._ids.get(token, -1) for token in tokens), dtype=np.int64, count=total)
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=total)
+        text_of = np.repeat(np.arange(n), counts)
+        text_start = np.repeat(np.cumsum(counts) - counts, counts)
+        position = np.arange(total)
+
+        known = self._known[ids]
+        negation = self._negation[ids]
+
+        def last_before(events):
+            # Index of the latest event strictly before each token within
+            # the same text, or -1
+            marked = np.where(events, position, -1)
+            latest = np.r_[-1, np.maximum.accumulate(marked)[:-1]]
+            return np.where(latest >= text_start, latest, -1)
+
+        # The modifier state is set or cleared by every known word. An
+        # unknown word of more than two letters clears it, except that a
+        # negation after an -ly modifier attaches to it ("really not good")
+        last_known = last_before(known)
+        ly_modifier = np.r_[self._modifier[ids] & self._adverb[ids], False]
+        attaches = ~known & negation & ly_modifier[last_known]
+        clears_modifier = ~known & (lengths > 2) & ~attaches
+        modifier_event = last_before(known | clears_modifier)
+        modifier_active = np.r_[known & self._modifier[ids], False][modifier_event]
+        attaches &= modifier_active
+
+        # The negation state is set by an unknown negation that did not
+        # attach to a modifier, and cleared by known words and by other
+        # unknown words longer than one letter
+        sets_negation = ~known & negation & ~attaches
+        negation_event = last_before(known | (~known & negation) | (~known & (lengths > 1)))
+        negated = np.r_[sets_negation, False][negation_event]
+
+        # Each known word starts a new assessment unless a modifier precedes
+        # it, in which case it is merged into the modifier's assessment
+        words = np.flatnonzero(known)
+        if not len(words):
+            return np.zeros(n, dtype=np.float64)
+        word_polarity = self._polarity[ids[words]]
+        word_intensity = self._intensity[ids[words]]
+        word_negated = negated[words]
+        starts = ~modifier_active[words]
+        intensity = np.where(word_negated, 1.0 / word_intensity, word_intensity)
+        previous_intensity = np.r_[1.0, intensity[:-1]]
+        scores = np.where(starts, word_polarity, np.clip(word_polarity * previous_intensity, -1.0, 1.0))
+
+        assessment_of = np.cumsum(starts) - 1
+        first = np.flatnonzero(starts)
+        last = np.r_[first[1:], len(words)] - 1
+        assessment_negated = np.logical_or.reduceat(word_negated, first)
+        # An attached negation negates the assessment of the last known word
+        word_rank = np.cumsum(known) - 1
+        assessment_negated[assessment_of[word_rank[last_known[np.flatnonzero(attaches)]]]] = True
+
+        assessment_scores = scores[last]
+        assessment_scores = np.where(assessment_negated, assessment_scores * -0.5, assessment_scores)
+        assessment_text = text_of[words[first]]
+        sums = np.bincount(assessment_text, weights=assessment_scores, minlength=n)
+        assessments = np.bincount(assessment_text, minlength=n)
+        return sums / np.maximum(assessments, 1)
+
+def check_parity(scorer: LexiconScorer, texts: Optional[List[str]] = None) -> Dict:
+    """
+    Compare LexiconScorer with TextBlob on a corpus.
+
+    Args:
+        scorer (LexiconScorer): Scorer under test
+        texts (List[str]): Corpus to compare on (default: PARITY_CORPUS and the
+            scraper's sample reviews, raw and lowercased without punctuation)
+
+    Returns:
+        Dict: Label agreement rate (at the ±0.3 thresholds) and polarity differences
+    """
+    from textblob import TextBlob
+
+    if texts is None:
+        from ..data_collection.review_scraper import ReviewScraper
+        from .onnx_backend import PARITY_CORPUS
+
+        raw = [review['text'] for reviews in ReviewScraper().sample_data.values() for review in reviews]
+        texts = PARITY_CORPUS + raw + [re.sub(r'[^a-z\s]', '', text.lower()) for text in raw]
+
+    got = scorer.polarity(texts)
+    expected = np.array([TextBlob(text).sentiment.polarity for text in texts], dtype=np.float64)
+    labels = lambda polarity: np.select([polarity > 0.3, polarity < -0.3], [1, -1], 0)
+    diffs = np.abs(got - expected)
+    return {
+        'texts': len(texts),
+        'label_agreement': float(np.mean(labels(got) == labels(expected))) if len(texts) else 1.0,
+        'max_score_diff': float(diffs.max()) if len(texts) else 0.0,
+        'mean_score_diff': float(diffs.mean()) if len(texts) else 0.0
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the lexicon scorer against TextBlob")
+    parser.add_argument('--max-score-diff', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = check_parity(LexiconScorer())
+    print(report)
+
+    if report['label_agreement'] < 1.0 or report['max_score_diff'] > args.max_score_diff:
+        logger.error("Lexicon scorer does not match TextBlob within tolerance")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
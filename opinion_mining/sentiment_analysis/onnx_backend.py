@@ -0,0 +1,261 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Union
+import numpy as np
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+DEFAULT_MODEL_DIR = os.path.join('models', 'onnx')
+
+# Fixed corpus for comparing backends; covers positive, negative and mixed reviews
+PARITY_CORPUS = [
+    "this laptop exceeded all my expectations the battery life is outstanding",
+    "overall solid laptop performance good display crisp however fan get quite loud",
+    "laptop started issue within first week screen occasionally flicker battery drain quickly",
+    "worst laptop ever owned overheats constantly keyboard unresponsive screen dead pixel",
+    "laptop work well basic task struggle demanding application battery life average",
+    "jean fit perfectly incredibly comfortable material highquality denim feel durable",
+    "material thin feel cheap stitching coming undone two wash not worth money",
+    "jean okay price material decent exceptional fit alright stretch wearing",
+    "book absolutely brilliant storytelling captivating character development outstanding",
+    "story slow character flat plot predictable writing style dull",
+    "book didnt live hype story confusing hard follow would not recommend",
+    "product work limitation quality decent minor issue price fair",
+    "exactly looking quality exceptional performance outstanding worth every penny",
+    "product overpriced doesnt work advertised quality poor broke quickly",
+    "good product overall quality reliable work well would buy",
+    "product okay nothing special quality average work fine better option available",
+]
+
+def _model_path(model_dir: str, model_name: str, quantized: bool) -> str:
+    safe_name = model_name.replace('/', '--')
+    suffix = '-int8' if quantized else ''
+    return os.path.join(model_dir, f"{safe_name}{suffix}.onnx")
+
+def _export_command(model_name: str, model_dir: str, quantized: bool) -> str:
+    command = f"python -m opinion_mining.sentiment_analysis.onnx_backend export --model {model_name} --model-dir {model_dir}"
+    return command if quantized else command + " --no-quantize"
+
+@contextmanager
+def _export_lock(model_dir: str):
+    # Serializes exports into the same directory across processes
+    import fcntl
+
+    with open(os.path.join(model_dir, '.export.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def export_onnx_model(model_name: str, model_dir: str = DEFAULT_MODEL_DIR, quantize: bool = True,
+                      opset: int = 14) -> str:
+    """
+    Export a sequence classification model to ONNX, optionally with dynamic int8 quantization.
+
+    Meant to run at build time. The files are written to a temporary
+    directory and moved into place under a lock, so concurrent exports and
+    workers loading the model never see a partially written file.
+
+    Args:
+        model_name (str): Hugging Face model name
+        model_dir (str): Directory to write the ONNX files to
+        quantize (bool): Whether to apply dynamic int8 quantization
+        opset (int): ONNX opset version
+
+    Returns:
+        str: Path of the exported (and quantized) model
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    with _export_lock(model_dir):
+        staging_dir = tempfile.mkdtemp(prefix='.export-', dir=model_dir)
+        try:
+            staged_path = _export_to(model_name, staging_dir, quantize, opset)
+            path = os.path.join(model_dir, os.path.basename(staged_path))
+            for name in os.listdir(staging_dir):
+                os.replace(os.path.join(staging_dir, name), os.path.join(model_dir, name))
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    return path
+
+def _export_to(model_name: str, model_dir: str, quantize: bool, opset: int) -> str:
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    fp32_path = _model_path(model_dir, model_name, quantized=False)
+
+    logger.info(f"Exporting {model_name} to ONNX: {fp32_path}")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    dummy = tokenizer(["exporting the sentiment model"], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask') if name in dummy]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['logits'] = {0: 'batch'}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=['logits'],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = _model_path(model_dir, model_name, quantized=True)
+    logger.info(f"Quantizing ONNX model to int8: {int8_path}")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+class OnnxSentimentPipeline:
+    """
+    Drop-in replacement for the Hugging Face sentiment-analysis pipeline that
+    runs an (int8 quantized) ONNX export of the model on ONNX Runtime.
+
+    Calling it returns the same ``[{'label': ..., 'score': ...}]`` output as
+    the torch pipeline. The model must have been exported beforehand (see
+    the ``export`` command); it is never exported while serving.
+    """
+
+    def __init__(self, model_name: str, model_dir: str = DEFAULT_MODEL_DIR, quantize: bool = True,
+                 intra_op_threads: Optional[int] = None, max_length: int = 512):
+        """
+        Args:
+            model_name (str): Hugging Face model name (used for the tokenizer and labels)
+            model_dir (str): Directory holding the ONNX export
+            quantize (bool): Whether to use the dynamically quantized int8 model
+            intra_op_threads (int): ONNX Runtime intra-op threads (default: runtime's choice)
+            max_length (int): Maximum number of tokens per text
+
+        Raises:
+            FileNotFoundError: If the model has not been exported to model_dir
+        """
+        path = _model_path(model_dir, model_name, quantized=quantize)
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"ONNX model {path} not found; export it at build time with: "
+                f"{_export_command(model_name, model_dir, quantize)}"
+            )
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "The ONNX backend requires onnxruntime; install it with `pip install 'opinion_mining[onnx]'`"
+            ) from e
+        from transformers import AutoConfig, AutoTokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.model_path = path
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.id2label = AutoConfig.from_pretrained(model_name).id2label
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.input_names = [item.name for item in self.session.get_inputs()]
+        logger.info(f"Loaded ONNX sentiment model: {path}")
+
+    def __call__(self, inputs: Union[str, List[str]], batch_size: Optional[int] = None, **kwargs) -> List[Dict]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        batch_size = batch_size or len(texts) or 1
+        results = []
+
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors='np'
+            )
+            feed = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            logits = self.session.run(None, feed)[0]
+
+            # Softmax, shifted for numerical stability
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs = exp / exp.sum(axis=1, keepdims=True)
+            for row in probs:
+                idx = int(row.argmax())
+                results.append({'label': self.id2label[idx], 'score': float(row[idx])})
+
+        return results
+
+def check_parity(candidate, reference, texts: Optional[List[str]] = None) -> Dict:
+    """
+    Compare two sentiment pipelines on a fixed corpus.
+
+    Args:
+        candidate: Pipeline under test (e.g. OnnxSentimentPipeline)
+        reference: Reference pipeline (e.g. the torch pipeline)
+        texts (List[str]): Corpus to compare on (default: PARITY_CORPUS)
+
+    Returns:
+        Dict: Label agreement rate and score differences
+    """
+    texts = texts or PARITY_CORPUS
+    candidate_results = candidate(texts)
+    reference_results = reference(texts)
+
+    agreements = 0
+    score_diffs = []
+    for got, expected in zip(candidate_results, reference_results):
+        if got['label'].lower() == expected['label'].lower():
+            agreements += 1
+            score_diffs.append(abs(got['score'] - expected['score']))
+
+    return {
+        'texts': len(texts),
+        'label_agreement': agreements / len(texts),
+        'max_score_diff': max(score_diffs) if score_diffs else 0.0,
+        'mean_score_diff': float(np.mean(score_diffs)) if score_diffs else 0.0
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .sentiment_analyzer import DEFAULT_MODEL
+
+    parser = argparse.ArgumentParser(description="Export the sentiment model to ONNX and check parity")
+    parser.add_argument('command', choices=['export', 'parity'])
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--model-dir', default=DEFAULT_MODEL_DIR)
+    parser.add_argument('--no-quantize', action='store_true')
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--min-agreement', type=float, default=0.95)
+    parser.add_argument('--max-score-diff', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        path = export_onnx_model(args.model, args.model_dir, quantize=not args.no_quantize)
+        print(path)
+        return 0
+
+    from transformers import pipeline
+
+    onnx_pipeline = OnnxSentimentPipeline(
+        args.model, args.model_dir, quantize=not args.no_quantize, intra_op_threads=args.threads
+    )
+    torch_pipeline = pipeline("sentiment-analysis", model=args.model)
+    report = check_parity(onnx_pipeline, torch_pipeline)
+    print(report)
+
+    if report['label_agreement'] < args.min_agreement or report['max_score_diff'] > args.max_score_diff:
+        logger.error("ONNX backend does not match the torch backend within tolerance")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from ..records import SentimentResult
+from ..utils.logger import setup_logger
+from ..utils.metrics import ENABLED as METRICS_ENABLED, metrics
+from ..utils.sqlite_store import SQLiteConnections
+
+logger = setup_logger()
+
+CACHE_HIT_RATE = metrics.gauge(
+    'opinion_mining_sentiment_cache_hit_rate', 'Fraction of sentiment cache lookups served from memory or disk'
+)
+CACHE_ENTRIES = metrics.gauge(
+    'opinion_mining_sentiment_cache_memory_entries', 'Entries in the in-memory tier of the sentiment cache'
+)
+
+def _encode(value: Dict[str, Optional[SentimentResult]]) -> str:
+    return json.dumps({name: result.to_dict() if result is not None else None for name, result in value.items()})
+
+def _decode(value: str) -> Dict[str, Optional[SentimentResult]]:
+    return {name: SentimentResult.from_dict(result) for name, result in json.loads(value).items()}
+
+def _hit_rate(stats: Dict) -> float:
+    lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+    return (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+
+class SentimentCache:
+    """
+    Content-addressed cache of text-level sentiment results.
+
+    Entries are keyed by a hash of the processed text together with the
+    model name and weights version, so rolling a model never serves stale
+    results. Lookups go through a bounded in-memory LRU first and then an
+    optional SQLite store, which survives restarts and is shared by all
+    gunicorn workers on a host.
+    """
+
+    def __init__(self, namespace: str = '', max_entries: int = 10000, db_path: Optional[str] = None):
+        """
+        Args:
+            namespace (str): Model identity mixed into every key
+            max_entries (int): Maximum number of entries in the memory tier
+            db_path (str): Path of the SQLite store (default: memory tier only)
+        """
+        self.namespace = namespace
+        self.max_entries = max(0, max_entries)
+        self.db_path = db_path
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'writes': 0,
+            'errors': 0
+        }
+
+        self._db = SQLiteConnections(
+            db_path,
+            'CREATE TABLE IF NOT EXISTS sentiment_cache '
+            '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL);'
+        ) if db_path else None
+
+        if METRICS_ENABLED:
+            CACHE_HIT_RATE.set_function(self.hit_rate)
+            CACHE_ENTRIES.set_function(self.memory_entries)
+
+    def key(self, text: str) -> str:
+        """Return the cache key for a processed text."""
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Look up cached results for several texts.
+
+        Args:
+            texts (Iterable[str]): Processed texts
+
+        Returns:
+            Dict[str, Dict]: Cached results for the texts that were found, keyed by text
+        """
+        found = {}
+        pending = {}
+        seen = set()
+        with self._lock:
+            for text in texts:
+                if text in seen:
+                    continue
+                seen.add(text)
+                key = self.key(text)
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    found[text] = value
+                else:
+                    pending[key] = text
+
+        if pending and self.db_path:
+            for key, value in self._disk_get(list(pending)).items():
+                found[pending.pop(key)] = value
+                self._remember(key, value)
+                with self._lock:
+                    self._stats['disk_hits'] += 1
+
+        with self._lock:
+            self._stats['misses'] += len(pending)
+
+        # Results are immutable; only the per-text mapping is copied
+        return {text: dict(value) for text, value in found.items()}
+
+    def put_many(self, results: Dict[str, Dict]):
+        """
+        Store results for several texts.
+
+        Args:
+            results (Dict[str, Dict]): Results keyed by processed text
+        """
+        if not results:
+            return
+        entries = {self.key(text): value for text, value in results.items()}
+        for key, value in entries.items():
+            self._remember(key, dict(value))
+        with self._lock:
+            self._stats['writes'] += len(entries)
+        if self.db_path:
+            self._disk_put(entries)
+
+    def stats(self) -> Dict:
+        """Return hit, miss and eviction counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        stats['hit_rate'] = _hit_rate(stats)
+        return stats
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups so far that were served from either tier."""
+        with self._lock:
+            return _hit_rate(self._stats)
+
+    def memory_entries(self) -> int:
+        """Number of entries in the memory tier."""
+        with self._lock:
+            return len(self._memory)
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            with self._db.connection() as connection:
+                connection.execute('DELETE FROM sentiment_cache')
+
+    def _remember(self, key: str, value: Dict):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, Dict]:
+        found = {}
+        try:
+            connection = self._db.connection()
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = connection.execute(
+                    f'SELECT key, value FROM sentiment_cache WHERE key IN ({placeholders})', chunk
+                )
+                for key, value in rows:
+                    found[key] = _decode(value)
+        except Exception as e:
+            logger.error(f"Error reading sentiment cache: {str(e)}")
+            with self._lock:
+                self._stats['errors'] += 1
+        return found
+
+    def _disk_put(self, entries: Dict[str, Dict]):
+        try:
+            now = time.time()
+            with self._db.connection() as connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO sentiment_cache (key, value, created) VALUES (?, ?, ?)',
+                    [(key, _encode(value), now) for key, value in entries.items()]
+                )
+        except Exception as e:
+            logger.error(f"Error writing sentiment cache: {str(e)}")
+            with self._lock:
+                self._stats['errors'] += 1
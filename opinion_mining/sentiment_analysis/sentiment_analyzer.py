@@ -1,70 +1,280 @@
-from transformers import pipeline
-from textblob import TextBlob
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
+from operator import attrgetter
 import numpy as np
+from .batch_scheduler import InferenceScheduler
+from .lexicon_scorer import LexiconScorer
+from .onnx_backend import OnnxSentimentPipeline, DEFAULT_MODEL_DIR
+from .result_cache import SentimentCache
+from ..records import Label, Review, Sentiment, SentimentResult
 from ..utils.logger import setup_logger
+from ..utils.metrics import count_missing, instrumented
 
 logger = setup_logger()
 
+DEFAULT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Weight of each method's score in the combined result, in the order the
+# scores are summed
+DEFAULT_WEIGHTS = {
+    'textblob': 0.3,
+    'transformer': 0.4,
+    'rating': 0.3
+}
+
+# (minimum rating, result), checked in order; results are shared by all reviews
+_RATING_SENTIMENTS = (
+    (4.5, SentimentResult(Label.POSITIVE, 1.0)),
+    (4.0, SentimentResult(Label.POSITIVE, 0.8)),
+    (3.5, SentimentResult(Label.NEUTRAL, 0.6)),
+    (3.0, SentimentResult(Label.NEUTRAL, 0.4)),
+    (2.0, SentimentResult(Label.NEGATIVE, 0.3))
+)
+_LOWEST_RATING_SENTIMENT = SentimentResult(Label.NEGATIVE, 0.1)
+
+# Paths recorded on each review's Sentiment: the full ensemble, or the
+# cascade's shortcut where the transformer could not change the label
+PATH_FULL = 'full'
+PATH_CHEAP = 'cheap'
+
+def combine_scores(label_ids: np.ndarray, scores: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Combine per-method results for a batch of reviews.
+    
+    Each method adds its weighted score to its label's column of a
+    (reviews x labels) matrix, in method order, and the highest column wins.
+    Ties go to the lowest Label value, as with max() over the labels in
+    Label order, so results match _combine_sentiments exactly.
+    
+    Args:
+        label_ids (np.ndarray): (reviews, methods) Label values, -1 where a method has no result
+        scores (np.ndarray): (reviews, methods) scores
+        weights (np.ndarray): (methods,) weights
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Combined Label values and scores per review
+    """
+    n = len(label_ids)
+    rows = np.arange(n)
+    matrix = np.zeros((n, len(Label)), dtype=np.float64)
+    for method in range(label_ids.shape[1]):
+        present = label_ids[:, method] >= 0
+        matrix[rows[present], label_ids[present, method]] += scores[present, method] * weights[method]
+    best = matrix.argmax(axis=1)
+    return best, matrix[rows, best]
+
+# Labels indexed by value
+_LABELS = tuple(Label)
+
+# Extreme outputs of the binary transformer (its top score is at least 0.5);
+# the combined label moves monotonically with the score in between
+_TRANSFORMER_EXTREMES = tuple(
+    SentimentResult(label, score)
+    for label in (Label.POSITIVE, Label.NEGATIVE)
+    for score in (0.5, 1.0)
+)
+
 class SentimentAnalyzer:
     """
     A class for analyzing sentiment in product reviews using multiple approaches.
     """
     
-    def __init__(self):
+    def __init__(self, model_name: str = DEFAULT_MODEL, batch_size: int = 32, backend: str = 'torch',
+                 onnx_model_dir: str = None, intra_op_threads: int = None, model_version: str = '',
+                 cache: SentimentCache = None, cascade: bool = False, weights: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            model_name (str): Hugging Face model name
+            batch_size (int): Number of texts per transformer forward pass
+            backend (str): 'torch' for the Hugging Face pipeline or 'onnx' for
+                the int8 quantized ONNX Runtime model
+            onnx_model_dir (str): Directory holding the ONNX export
+            intra_op_threads (int): ONNX Runtime intra-op threads
+            model_version (str): Weights version, used to key cached results
+            cache (SentimentCache): Optional cache of text-level results
+            cascade (bool): Run the transformer only for reviews whose label
+                TextBlob and the rating have not already decided
+            weights (Dict[str, float]): Combination weights overriding DEFAULT_WEIGHTS
+        """
+        unknown = set(weights or {}) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown sentiment methods in weights: {sorted(unknown)}")
+        self.model_name = model_name
+        self.model_version = model_version
+        self.backend = backend
+        self.cache = cache
+        self.cascade = cascade
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.batch_size = max(1, batch_size)
+        self.scheduler = None
+        try:
+            # Compile the TextBlob lexicon once for batch polarity scoring
+            self.lexicon_scorer = LexiconScorer()
+        except Exception as e:
+            logger.error(f"Error compiling sentiment lexicon: {str(e)}")
+            self.lexicon_scorer = None
         try:
             # Initialize the transformer pipeline for sentiment analysis
-            self.transformer_analyzer = pipeline(
-                "sentiment-analysis",
-                model="distilbert-base-uncased-finetuned-sst-2-english"
-            )
+            if backend == 'onnx':
+                self.transformer_analyzer = OnnxSentimentPipeline(
+                    model_name,
+                    model_dir=onnx_model_dir or DEFAULT_MODEL_DIR,
+                    intra_op_threads=intra_op_threads
+                )
+            else:
+                # transformers (and torch) load with the first analyzer, not with this module
+                from transformers import pipeline
+
+                self.transformer_analyzer = pipeline(
+                    "sentiment-analysis",
+                    model=model_name
+                )
         except Exception as e:
             logger.error(f"Error initializing transformer model: {str(e)}")
             self.transformer_analyzer = None
     
-    def analyze_sentiment(self, reviews: List[Dict]) -> List[Dict]:
+    def enable_microbatching(self, max_batch_size: int = 32, max_wait_ms: float = 5.0) -> InferenceScheduler:
+        """
+        Route transformer inference through a shared micro-batching scheduler.
+        
+        Texts from concurrent analyze_sentiment calls are then queued and run
+        through the model together.
+        
+        Args:
+            max_batch_size (int): Maximum number of texts per batch
+            max_wait_ms (float): Maximum time a text waits for a batch to fill
+            
+        Returns:
+            InferenceScheduler: The scheduler, e.g. for reading its metrics
+        """
+        self.close()
+        self.scheduler = InferenceScheduler(
+            self._run_transformer_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
+        return self.scheduler
+    
+    def close(self):
+        """Shut down the micro-batching scheduler, if any."""
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+            self.scheduler = None
+    
+    @instrumented('analyze', items=len,
+                  errors=lambda reviews: sum(1 for review in reviews if review.sentiment.combined is None))
+    def analyze_sentiment(self, reviews: List[Review]) -> List[Review]:
         """
         Analyze sentiment for a list of reviews using multiple methods.
         
         Args:
-            reviews (List[Dict]): List of review dictionaries
+            reviews (List[Review]): Preprocessed reviews
             
         Returns:
-            List[Dict]: List of reviews with sentiment analysis results
+            List[Review]: The same reviews with their sentiment set
         """
         analyzed_reviews = []
+        undecided = None
+        
+        if self.cascade:
+            # A text needs the transformer if it could flip the label of
+            # any review carrying that text
+            ratings = {}
+            for review in reviews:
+                ratings.setdefault(review.processed_text, set()).add(self._get_rating_sentiment(review.rating))
+            undecided = lambda text, textblob: any(
+                self._transformer_can_flip(textblob, rating) for rating in ratings[text]
+            )
+        
+        # Run the text-based methods over all reviews up front
+        text_results = self._analyze_texts([review.processed_text for review in reviews], undecided)
+        cheap = 0
+        analyzed = []
         
         for review in reviews:
             try:
                 # Get sentiment from different methods
-                textblob_sentiment = self._analyze_textblob(review['processed_text'])
-                transformer_sentiment = self._analyze_transformer(review['processed_text'])
+                text_result = text_results[review.processed_text]
+                textblob_sentiment = text_result['textblob']
+                transformer_sentiment = text_result['transformer']
                 
                 # Consider rating in sentiment analysis
-                rating_sentiment = self._get_rating_sentiment(review['rating'])
+                rating_sentiment = self._get_rating_sentiment(review.rating)
+                
+                # A missing transformer result was either skipped by the
+                # cascade or failed while the ensemble needed it
+                path = PATH_FULL
+                if (self.cascade and transformer_sentiment is None
+                        and not self._transformer_can_flip(textblob_sentiment, rating_sentiment)):
+                    path = PATH_CHEAP
+                    cheap += 1
                 
-                # Combine results with weighted approach
-                review['sentiment'] = {
-                    'textblob': textblob_sentiment,
-                    'transformer': transformer_sentiment,
-                    'rating': rating_sentiment,
-                    'combined': self._combine_sentiments(textblob_sentiment, transformer_sentiment, rating_sentiment)
-                }
-                analyzed_reviews.append(review)
+                review.sentiment = Sentiment(textblob_sentiment, transformer_sentiment, rating_sentiment, path=path)
+                analyzed.append(review)
                 
             except Exception as e:
-                logger.error(f"Error analyzing sentiment for review: {str(e)}")
-                review['sentiment'] = {
-                    'textblob': None,
-                    'transformer': None,
-                    'rating': None,
-                    'combined': None
-                }
-                analyzed_reviews.append(review)
+                logger.error(f"Error analyzing sentiment for review: {str(e)}", extra={'log_class': 'review_error'})
+                review.sentiment = Sentiment()
+            analyzed_reviews.append(review)
+        
+        # Combine results with weighted approach, for all reviews at once
+        for review, combined in zip(analyzed, self._combine_batch([review.sentiment for review in analyzed])):
+            review.sentiment = review.sentiment._replace(combined=combined)
+        
+        if self.cascade:
+            logger.info(f"Cascade decided {cheap} of {len(reviews)} reviews without the transformer")
                 
         return analyzed_reviews
     
-    def _analyze_textblob(self, text: str) -> Dict:
+    @property
+    def cache_namespace(self) -> str:
+        """Identity of the models whose results may be cached together."""
+        return f"{self.model_name}|{self.backend}|{self.model_version}"
+    
+    def _analyze_texts(self, texts: List[str],
+                       undecided: Optional[Callable[[str, Optional[SentimentResult]], bool]] = None
+                       ) -> Dict[str, Dict[str, Optional[SentimentResult]]]:
+        """
+        Run the text-based methods (TextBlob and transformer) over many texts.
+        
+        Each distinct text is analyzed once, texts found in the cache skip
+        both methods, and the transformer runs over the rest in batches.
+        
+        Args:
+            texts (List[str]): Processed texts (non-string entries are skipped)
+            undecided (Callable): Given a text and its TextBlob result, whether the
+                transformer is needed (default: always)
+            
+        Returns:
+            Dict[str, Dict]: {'textblob': ..., 'transformer': ...} results keyed by text;
+                the transformer result is None where it failed or was not needed
+        """
+        distinct = list(dict.fromkeys(text for text in texts if isinstance(text, str)))
+        results = self.cache.get_many(distinct) if self.cache is not None else {}
+        
+        pending = [text for text in distinct if text not in results]
+        textblob_results = dict(zip(pending, self._analyze_textblob_batch(pending)))
+        transformer_texts = pending
+        if undecided is not None:
+            transformer_texts = [text for text in pending if undecided(text, textblob_results[text])]
+        transformer_results = dict(zip(transformer_texts, self._analyze_transformer_batch(transformer_texts)))
+        fresh = {}
+        for text in pending:
+            fresh[text] = {
+                'textblob': textblob_results[text],
+                'transformer': transformer_results.get(text)
+            }
+        
+        if self.cache is not None:
+            # Failed (and skipped) analyses are retried next time rather than cached
+            self.cache.put_many({
+                text: result for text, result in fresh.items()
+                if result['textblob'] is not None and result['transformer'] is not None
+            })
+        results.update(fresh)
+        return results
+    
+    @instrumented('textblob_single', errors=count_missing)
+    def _analyze_textblob(self, text: str) -> Optional[SentimentResult]:
         """
         Analyze sentiment using TextBlob.
         
@@ -72,29 +282,56 @@ class SentimentAnalyzer:
             text (str): Input text
             
         Returns:
-            Dict: Sentiment analysis results
+            SentimentResult: Sentiment analysis results
         """
         try:
+            from textblob import TextBlob
+
             blob = TextBlob(text)
             polarity = blob.sentiment.polarity
             
             # Convert polarity to sentiment label with more nuanced thresholds
             if polarity > 0.3:
-                label = 'positive'
+                label = Label.POSITIVE
             elif polarity < -0.3:
-                label = 'negative'
+                label = Label.NEGATIVE
             else:
-                label = 'neutral'
+                label = Label.NEUTRAL
                 
-            return {
-                'label': label,
-                'score': abs(polarity)
-            }
+            return SentimentResult(label, abs(polarity))
         except Exception as e:
             logger.error(f"Error in TextBlob analysis: {str(e)}")
             return None
     
-    def _analyze_transformer(self, text: str) -> Dict:
+    @instrumented('textblob', items=len, errors=count_missing)
+    def _analyze_textblob_batch(self, texts: List[str]) -> List[Optional[SentimentResult]]:
+        """
+        Analyze sentiment for many texts with the compiled TextBlob lexicon.
+        
+        Produces the same results as _analyze_textblob, text for text.
+        
+        Args:
+            texts (List[str]): Input texts
+            
+        Returns:
+            List[SentimentResult]: Sentiment analysis results, one per input text
+        """
+        if self.lexicon_scorer is None or not texts:
+            return [self._analyze_textblob(text) for text in texts]
+        try:
+            polarity = self.lexicon_scorer.polarity(texts)
+        except Exception as e:
+            logger.error(f"Error in batched TextBlob analysis: {str(e)}")
+            return [self._analyze_textblob(text) for text in texts]
+        
+        # Same thresholds as _analyze_textblob
+        labels = np.select([polarity > 0.3, polarity < -0.3], [Label.POSITIVE, Label.NEGATIVE], Label.NEUTRAL)
+        return [
+            SentimentResult(Label(label), abs(value))
+            for label, value in zip(labels.tolist(), polarity.tolist())
+        ]
+    
+    def _analyze_transformer(self, text: str) -> Optional[SentimentResult]:
         """
         Analyze sentiment using the transformer model.
         
@@ -102,21 +339,86 @@ class SentimentAnalyzer:
             text (str): Input text
             
         Returns:
-            Dict: Sentiment analysis results
+            SentimentResult: Sentiment analysis results
         """
         try:
             if self.transformer_analyzer:
                 result = self.transformer_analyzer(text)[0]
-                return {
-                    'label': result['label'].lower(),
-                    'score': result['score']
-                }
+                return SentimentResult(Label.parse(result['label']), result['score'])
             return None
         except Exception as e:
             logger.error(f"Error in transformer analysis: {str(e)}")
             return None
     
-    def _get_rating_sentiment(self, rating: float) -> Dict:
+    @instrumented('transformer', items=len, errors=count_missing)
+    def _analyze_transformer_batch(self, texts: List[str]) -> List[Optional[SentimentResult]]:
+        """
+        Analyze sentiment for many texts using batched transformer inference.
+        
+        Args:
+            texts (List[str]): Input texts (non-string entries are skipped)
+            
+        Returns:
+            List[SentimentResult]: Sentiment analysis results, one per input text
+        """
+        scheduler = self.scheduler
+        if scheduler is None or not scheduler.running or not self.transformer_analyzer:
+            return self._run_transformer_batch(texts)
+        
+        results = [None] * len(texts)
+        indices = [i for i, text in enumerate(texts) if isinstance(text, str)]
+        try:
+            outputs = scheduler.infer([texts[i] for i in indices])
+            for i, output in zip(indices, outputs):
+                results[i] = output
+        except Exception as e:
+            logger.error(f"Error in scheduled transformer analysis: {str(e)}")
+        return results
+    
+    @instrumented('transformer_inference', items=len, errors=count_missing)
+    def _run_transformer_batch(self, texts: List[str]) -> List[Optional[SentimentResult]]:
+        """
+        Run texts through the transformer in length-bucketed batches.
+        
+        Texts are sorted by length so that each batch pads to a similar
+        length, and results are returned in the original order.
+        
+        Args:
+            texts (List[str]): Input texts (non-string entries are skipped)
+            
+        Returns:
+            List[SentimentResult]: Sentiment analysis results, one per input text
+        """
+        results = [None] * len(texts)
+        if not self.transformer_analyzer:
+            return results
+        
+        # Bucket by length to keep padding low
+        order = sorted(
+            (i for i, text in enumerate(texts) if isinstance(text, str)),
+            key=lambda i: len(texts[i])
+        )
+        
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            try:
+                outputs = self.transformer_analyzer(
+                    [texts[i] for i in batch],
+                    batch_size=len(batch)
+                )
+                for i, output in zip(batch, outputs):
+                    results[i] = SentimentResult(Label.parse(output['label']), output['score'])
+            except Exception as e:
+                # Fall back to one text at a time so a single bad text
+                # does not fail the rest of the batch
+                logger.error(f"Error in batched transformer analysis: {str(e)}")
+                for i in batch:
+                    results[i] = self._analyze_transformer(texts[i])
+                    
+        return results
+    
+    @instrumented('rating', errors=count_missing)
+    def _get_rating_sentiment(self, rating: float) -> Optional[SentimentResult]:
         """
         Convert numerical rating to sentiment.
         
@@ -124,87 +426,116 @@ class SentimentAnalyzer:
             rating (float): Numerical rating (0-5)
             
         Returns:
-            Dict: Sentiment analysis results
+            SentimentResult: Sentiment analysis results
         """
         try:
-            if rating >= 4.5:
-                label = 'positive'
-                score = 1.0
-            elif rating >= 4.0:
-                label = 'positive'
-                score = 0.8
-            elif rating >= 3.5:
-                label = 'neutral'
-                score = 0.6
-            elif rating >= 3.0:
-                label = 'neutral'
-                score = 0.4
-            elif rating >= 2.0:
-                label = 'negative'
-                score = 0.3
-            else:
-                label = 'negative'
-                score = 0.1
-                
-            return {
-                'label': label,
-                'score': score
-            }
+            for minimum, result in _RATING_SENTIMENTS:
+                if rating >= minimum:
+                    return result
+            return _LOWEST_RATING_SENTIMENT
         except Exception as e:
             logger.error(f"Error in rating sentiment analysis: {str(e)}")
             return None
     
-    def _combine_sentiments(self, textblob: Dict, transformer: Dict, rating: Dict) -> Dict:
+    def _transformer_can_flip(self, textblob: Optional[SentimentResult], rating: Optional[SentimentResult]) -> bool:
+        """
+        Check whether the transformer's output could change the combined label.
+        
+        The transformer adds its score to one of two labels, so it is enough
+        to try the extreme outputs: if none of them moves the label away from
+        the one TextBlob and the rating give on their own, no output can.
+        
+        Args:
+            textblob (SentimentResult): TextBlob sentiment results
+            rating (SentimentResult): Rating-based sentiment results
+            
+        Returns:
+            bool: False if the combined label is decided without the transformer
+        """
+        cheap = self._combine_sentiments(textblob, None, rating)
+        if cheap is None:
+            return True
+        for transformer in _TRANSFORMER_EXTREMES:
+            combined = self._combine_sentiments(textblob, transformer, rating)
+            if combined is None or combined.label != cheap.label:
+                return True
+        return False
+    
+    @instrumented('combine', items=len, errors=count_missing)
+    def _combine_batch(self, sentiments: List[Sentiment]) -> List[Optional[SentimentResult]]:
+        """
+        Combine the per-method results of many reviews with combine_scores.
+        
+        Args:
+            sentiments (List[Sentiment]): Per-method results of each review
+            
+        Returns:
+            List[SentimentResult]: Combined sentiment analysis results, one per review
+        """
+        if not sentiments:
+            return []
+        try:
+            n = len(sentiments)
+            label_ids = np.empty((n, len(DEFAULT_WEIGHTS)), dtype=np.int64)
+            scores = np.empty((n, len(DEFAULT_WEIGHTS)), dtype=np.float64)
+            for column, method in enumerate(DEFAULT_WEIGHTS):
+                results = list(map(attrgetter(method), sentiments))
+                label_ids[:, column] = np.fromiter(
+                    (-1 if result is None else result.label for result in results), dtype=np.int64, count=n
+                )
+                scores[:, column] = np.fromiter(
+                    (0.0 if result is None else result.score for result in results), dtype=np.float64, count=n
+                )
+            weights = np.array([self.weights[method] for method in DEFAULT_WEIGHTS], dtype=np.float64)
+            best, best_scores = combine_scores(label_ids, scores, weights)
+            return [SentimentResult(_LABELS[label], score) for label, score in zip(best.tolist(), best_scores.tolist())]
+        except Exception as e:
+            logger.error(f"Error combining sentiments in batch: {str(e)}")
+            return [
+                self._combine_sentiments(sentiment.textblob, sentiment.transformer, sentiment.rating)
+                for sentiment in sentiments
+            ]
+    
+    def _combine_sentiments(self, textblob: Optional[SentimentResult], transformer: Optional[SentimentResult],
+                            rating: Optional[SentimentResult]) -> Optional[SentimentResult]:
         """
         Combine sentiment analysis results from different methods.
         
         Args:
-            textblob (Dict): TextBlob sentiment results
-            transformer (Dict): Transformer sentiment results
-            rating (Dict): Rating-based sentiment results
+            textblob (SentimentResult): TextBlob sentiment results
+            transformer (SentimentResult): Transformer sentiment results
+            rating (SentimentResult): Rating-based sentiment results
             
         Returns:
-            Dict: Combined sentiment analysis results
+            SentimentResult: Combined sentiment analysis results
         """
         try:
-            # Initialize weights
-            weights = {
-                'textblob': 0.3,
-                'transformer': 0.4,
-                'rating': 0.3
-            }
+            weights = self.weights
             
             # Initialize sentiment scores
             sentiment_scores = {
-                'positive': 0.0,
-                'negative': 0.0,
-                'neutral': 0.0
+                Label.POSITIVE: 0.0,
+                Label.NEGATIVE: 0.0,
+                Label.NEUTRAL: 0.0
             }
             
             # Add TextBlob results
             if textblob:
-                sentiment_scores[textblob['label']] += textblob['score'] * weights['textblob']
+                sentiment_scores[textblob.label] += textblob.score * weights['textblob']
             
             # Add transformer results
             if transformer:
-                sentiment_scores[transformer['label']] += transformer['score'] * weights['transformer']
+                sentiment_scores[transformer.label] += transformer.score * weights['transformer']
             
             # Add rating results
             if rating:
-                sentiment_scores[rating['label']] += rating['score'] * weights['rating']
+                sentiment_scores[rating.label] += rating.score * weights['rating']
             
             # Get the sentiment with highest score
             max_sentiment = max(sentiment_scores.items(), key=lambda x: x[1])
             
-            return {
-                'label': max_sentiment[0],
-                'score': max_sentiment[1],
-                'details': {
-                    'textblob': textblob,
-                    'transformer': transformer,
-                    'rating': rating
-                }
-            }
+            # The per-method results are kept alongside on the review's Sentiment
+            return SentimentResult(*max_sentiment)
         except Exception as e:
             logger.error(f"Error combining sentiments: {str(e)}")
             return None 
\ No newline at end of file
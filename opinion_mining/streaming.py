@@ -0,0 +1,239 @@
+import contextvars
+import json
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from .records import Label, Review
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+_DONE = object()
+
+class NDJSONSink:
+    """
+    Writes analyzed reviews to a newline-delimited JSON file as they arrive.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, review: Review):
+        self._file.write(json.dumps(review.to_dict(), default=str) + '\n')
+
+    def close(self):
+        self._file.close()
+
+def result_record(index: int, review: Review) -> Dict:
+    """Compact JSON record of one analyzed review; index is its position in the input."""
+    return {
+        'index': index,
+        'processed_text': review.processed_text,
+        'sentiment': review.sentiment.to_dict() if review.sentiment is not None else None
+    }
+
+class RunningSummary:
+    """
+    Aggregate counts kept up to date as reviews stream past, so the final
+    summary never needs a second pass over the results.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.positive = 0
+        self.negative = 0
+        self.neutral = 0
+        self.failed = 0
+        self.rating_sum = 0.0
+
+    def update(self, review: Review):
+        self.total += 1
+        self.rating_sum += review.rating or 0.0
+        combined = review.sentiment.combined if review.sentiment is not None else None
+        label = combined.label if combined is not None else None
+        if label == Label.POSITIVE:
+            self.positive += 1
+        elif label == Label.NEGATIVE:
+            self.negative += 1
+        elif label == Label.NEUTRAL:
+            self.neutral += 1
+        else:
+            self.failed += 1
+
+    def as_dict(self) -> Dict:
+        return {
+            'total_reviews': self.total,
+            'positive_count': self.positive,
+            'negative_count': self.negative,
+            'neutral_count': self.neutral,
+            'failed_count': self.failed,
+            'avg_rating': round(self.rating_sum / self.total, 1) if self.total else 0.0
+        }
+
+class StreamingPipeline:
+    """
+    Bounded-memory scrape -> preprocess -> analyze -> sink pipeline.
+
+    Each stage runs in its own thread and hands batches to the next through
+    a bounded queue, so a slow stage applies back-pressure upstream and at
+    most ``queue_size`` batches wait between any two stages.
+    """
+
+    def __init__(self, processor, analyzer, batch_size: int = 64, queue_size: int = 4, detect_fake: bool = False):
+        """
+        Args:
+            processor (TextProcessor): Text processor
+            analyzer (SentimentAnalyzer): Sentiment analyzer
+            batch_size (int): Reviews per batch passed between stages
+            queue_size (int): Maximum batches waiting between two stages
+            detect_fake (bool): Run fake review detection in the preprocess
+                stage; near duplicates are only clustered within a batch
+        """
+        self.processor = processor
+        self.analyzer = analyzer
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.detect_fake = detect_fake
+
+    def run(self, reviews: Iterable[Review], sink: Optional[Callable[[Review], None]] = None) -> Dict:
+        """
+        Stream reviews through the pipeline.
+
+        Args:
+            reviews (Iterable[Review]): Review source, consumed lazily
+            sink (Callable): Called with each analyzed review, in input order
+
+        Returns:
+            Dict: Aggregate counts over all analyzed reviews
+        """
+        summary = RunningSummary()
+        for review in self.iter_results(reviews):
+            if sink is not None:
+                sink(review)
+            summary.update(review)
+        return summary.as_dict()
+
+    def iter_results(self, reviews: Iterable[Review]) -> Iterator[Review]:
+        """
+        Stream reviews through the pipeline and yield analyzed reviews as they complete.
+
+        Args:
+            reviews (Iterable[Review]): Review source, consumed lazily
+
+        Yields:
+            Review: Analyzed reviews, in input order
+        """
+        stop = threading.Event()
+        errors = []
+        scraped = queue.Queue(maxsize=self.queue_size)
+        processed = queue.Queue(maxsize=self.queue_size)
+        analyzed = queue.Queue(maxsize=self.queue_size)
+
+        # Each stage runs in a copy of the caller's context, so its log
+        # records keep the caller's request id
+        stages = [
+            threading.Thread(target=contextvars.copy_context().run,
+                             args=(self._produce, reviews, scraped, stop, errors), name='pipeline-scrape'),
+            threading.Thread(target=contextvars.copy_context().run,
+                             args=(self._transform, self._preprocess_stage(), scraped, processed, stop, errors),
+                             name='pipeline-preprocess'),
+            threading.Thread(target=contextvars.copy_context().run,
+                             args=(self._transform, self.analyzer.analyze_sentiment, processed, analyzed, stop, errors),
+                             name='pipeline-analyze')
+        ]
+        for stage in stages:
+            stage.daemon = True
+            stage.start()
+
+        try:
+            while True:
+                batch = analyzed.get()
+                if batch is _DONE:
+                    break
+                for review in batch:
+                    yield review
+        finally:
+            # Unblock upstream stages if the consumer stopped early
+            stop.set()
+            for stage in stages:
+                stage.join()
+
+        if errors:
+            raise errors[0]
+
+    def _preprocess_stage(self) -> Callable[[List[Review]], List[Review]]:
+        if not self.detect_fake:
+            return self.processor.preprocess_reviews
+        # Cluster ids restart with every batch; offset them so they stay
+        # unique across the stream
+        next_cluster = 0
+
+        def preprocess(batch: List[Review]) -> List[Review]:
+            nonlocal next_cluster
+            reviews = self.processor.detect_fake_reviews(self.processor.preprocess_reviews(batch))
+            clusters = [review.duplicate_cluster_id for review in reviews if review.duplicate_cluster_id is not None]
+            if clusters:
+                for review in reviews:
+                    if review.duplicate_cluster_id is not None:
+                        review.duplicate_cluster_id += next_cluster
+                next_cluster += max(clusters) + 1
+            return reviews
+        return preprocess
+
+    def _produce(self, reviews: Iterable[Review], out: queue.Queue, stop: threading.Event, errors: List):
+        try:
+            batch = []
+            for review in reviews:
+                if stop.is_set():
+                    return
+                batch.append(review)
+                if len(batch) >= self.batch_size:
+                    self._put(out, batch, stop)
+                    batch = []
+            if batch:
+                self._put(out, batch, stop)
+        except Exception as e:
+            logger.error(f"Error in pipeline stage scrape: {str(e)}")
+            errors.append(e)
+            stop.set()
+        finally:
+            self._put(out, _DONE, stop, force=True)
+
+    def _transform(self, fn: Callable[[List[Review]], List[Review]], source: queue.Queue, out: queue.Queue,
+                   stop: threading.Event, errors: List):
+        try:
+            while True:
+                batch = source.get()
+                if batch is _DONE or stop.is_set():
+                    return
+                self._put(out, fn(batch), stop)
+        except Exception as e:
+            logger.error(f"Error in pipeline stage {threading.current_thread().name}: {str(e)}")
+            errors.append(e)
+            stop.set()
+        finally:
+            self._drain(source)
+            self._put(out, _DONE, stop, force=True)
+
+    def _put(self, out: queue.Queue, item, stop: threading.Event, force: bool = False):
+        # Block while the next stage is busy, but give up once the pipeline stops
+        while True:
+            if stop.is_set() and not force:
+                return
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if stop.is_set():
+                    # Make room so the end-of-stream marker always gets through
+                    self._drain(out, keep_done=False)
+
+    def _drain(self, source: queue.Queue, keep_done: bool = True):
+        while True:
+            try:
+                item = source.get_nowait()
+            except queue.Empty:
+                return
+            if item is _DONE and keep_done:
+                return
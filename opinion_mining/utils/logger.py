@@ -1,37 +1,198 @@
+import atexit
+import copy
+import json
 import logging
+import math
 import sys
-from datetime import datetime
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from fractions import Fraction
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from typing import Dict, Optional
 import os
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Id of the request (or job) being handled by the current thread; set by the
+# web app and attached to every record
+request_id: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+# Keeps the async listener alive and lets forked workers restart it
+_listener: Optional[QueueListener] = None
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id to each record as ``request_id``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Thin out records by message class.
+
+    Records logged with ``extra={'log_class': ...}`` (e.g. per-review lines)
+    are sampled and/or rate limited per class; records without a class, or
+    whose class is not configured, always pass.
+    """
+
+    def __init__(self, sample_rates: Optional[Dict[str, float]] = None,
+                 rate_limits: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            sample_rates (Dict[str, float]): Class -> fraction of records kept,
+                from 0 (drop them all) to 1; e.g. 0.1 keeps every 10th record
+            rate_limits (Dict[str, float]): Class -> records kept per second; the
+                number dropped is appended to the next record kept
+
+        Raises:
+            ValueError: If a sample rate is not between 0 and 1
+        """
+        super().__init__()
+        self.sample_rates: Dict[str, Fraction] = {}
+        for log_class, rate in (sample_rates or {}).items():
+            if not 0 <= rate <= 1:
+                raise ValueError(f"Sample rate of log class {log_class!r} must be between 0 and 1, not {rate}")
+            # Exact arithmetic keeps the kept fraction from drifting
+            self.sample_rates[log_class] = Fraction(rate).limit_denominator(10 ** 6)
+        self.rate_limits = dict(rate_limits or {})
+        self._seen: Dict[str, int] = {}
+        # class -> [window start, records kept in window, records suppressed]
+        self._windows: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        log_class = getattr(record, 'log_class', None)
+        if log_class is None:
+            return True
+        with self._lock:
+            rate = self.sample_rates.get(log_class)
+            if rate is not None:
+                seen = self._seen.get(log_class, 0)
+                self._seen[log_class] = seen + 1
+                # Of the first n records, ceil(n * rate) are kept, starting
+                # with the first
+                if math.ceil((seen + 1) * rate) == math.ceil(seen * rate):
+                    return False
+            limit = self.rate_limits.get(log_class)
+            if limit is None:
+                return True
+            now = time.monotonic()
+            window = self._windows.get(log_class)
+            if window is None or now - window[0] >= 1.0:
+                suppressed = window[2] if window else 0
+                window = self._windows[log_class] = [now, 0, 0]
+            else:
+                suppressed = 0
+            if window[1] >= limit:
+                window[2] += 1
+                return False
+            window[1] += 1
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None)
+        }
+        log_class = getattr(record, 'log_class', None)
+        if log_class is not None:
+            entry['log_class'] = log_class
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+class _DeferredQueueHandler(QueueHandler):
+    # The stock QueueHandler formats records before queueing them; only the
+    # message arguments are merged here, so timestamps, JSON and tracebacks
+    # are formatted on the listener thread
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def _json_env(name: str) -> Optional[Dict[str, float]]:
+    value = os.environ.get(name)
+    return {key: float(rate) for key, rate in json.loads(value).items()} if value else None
+
+def _start_listener(queue_handler: QueueHandler, handlers) -> QueueListener:
+    global _listener
+    queue_handler.queue = Queue()
+    _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def _stop_listener():
+    # Drains the queue, so records logged before exit are still written
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 def setup_logger():
     """
     Set up and configure the logger for the application.
-    
+
+    LOG_ASYNC moves formatting and writes to a background thread, LOG_FORMAT
+    selects 'text' or 'json' output, and LOG_SAMPLE_RATES / LOG_RATE_LIMITS
+    (JSON objects keyed by log class) thin out per-review records.
+
     Returns:
         logging.Logger: Configured logger instance
     """
     # Create logger
     logger = logging.getLogger('opinion_mining')
-    
+
     # Only add handlers if they haven't been added already
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        
+
         # Create logs directory if it doesn't exist
         if not os.path.exists('logs'):
             os.makedirs('logs')
-        
+
         # Create handlers
         console_handler = logging.StreamHandler(sys.stdout)
         file_handler = logging.FileHandler(f'logs/opinion_mining_{datetime.now().strftime("%Y%m%d")}.log')
-        
+
         # Create formatters and add it to handlers
-        log_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        if os.environ.get('LOG_FORMAT', 'text').lower() == 'json':
+            log_format = JsonFormatter()
+        else:
+            log_format = logging.Formatter(LOG_FORMAT)
         console_handler.setFormatter(log_format)
         file_handler.setFormatter(log_format)
-        
+
+        # Filters run in the logging thread, before records are queued
+        logger.addFilter(RequestIdFilter())
+        sample_rates, rate_limits = _json_env('LOG_SAMPLE_RATES'), _json_env('LOG_RATE_LIMITS')
+        if sample_rates or rate_limits:
+            logger.addFilter(SamplingFilter(sample_rates, rate_limits))
+
         # Add handlers to the logger
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
-    
-    return logger 
\ No newline at end of file
+        if os.environ.get('LOG_ASYNC', '').lower() in ('1', 'true', 'yes'):
+            handlers = (console_handler, file_handler)
+            queue_handler = _DeferredQueueHandler(Queue())
+            _start_listener(queue_handler, handlers)
+            # The listener thread does not survive fork (e.g. gunicorn --preload)
+            os.register_at_fork(after_in_child=lambda: _start_listener(queue_handler, handlers))
+            atexit.register(_stop_listener)
+            logger.addHandler(queue_handler)
+        else:
+            logger.addHandler(console_handler)
+            logger.addHandler(file_handler)
+
+    return logger
@@ -0,0 +1,252 @@
+import functools
+import inspect
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Read once at import: when off, instrumented() returns functions unchanged,
+# so disabled instrumentation costs nothing per call
+ENABLED = os.environ.get('METRICS', '1').lower() not in ('0', 'false', 'no')
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic count per label combination."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple[str, ...] = ()) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in values]
+
+class Gauge:
+    """
+    Current value per label combination, either set directly or read from a
+    function each time the metrics are rendered.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._functions: Dict[Tuple[str, ...], Callable] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, labels: Tuple[str, ...] = ()):
+        with self._lock:
+            self._functions.pop(labels, None)
+            self._values[labels] = value
+
+    def set_function(self, function: Callable[[], float], labels: Tuple[str, ...] = ()):
+        """
+        Report function() as the value; a bound method is held weakly, so the
+        gauge stops reporting it once its object is gone.
+        """
+        reference = weakref.WeakMethod(function) if inspect.ismethod(function) else (lambda: function)
+        with self._lock:
+            self._values.pop(labels, None)
+            self._functions[labels] = reference
+
+    def value(self, labels: Tuple[str, ...] = ()) -> Optional[float]:
+        return dict(self._collect()).get(labels)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in sorted(self._collect())]
+
+    def _collect(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            values = list(self._values.items())
+            functions = list(self._functions.items())
+        for labels, reference in functions:
+            function = reference()
+            if function is None:
+                with self._lock:
+                    if self._functions.get(labels) is reference:
+                        del self._functions[labels]
+                continue
+            values.append((labels, function()))
+        return values
+
+class Histogram:
+    """Observations per label combination, counted into fixed buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, labels: Tuple[str, ...] = ()) -> int:
+        with self._lock:
+            state = self._values.get(labels)
+            return state[2] if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((labels, (list(state[0]), state[1], state[2])) for labels, state in self._values.items())
+        lines = []
+        for labels, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """Named metrics of this process, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def _get_or_create(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    'opinion_mining_stage_duration_seconds', 'Time spent in each pipeline stage', ('stage',)
+)
+STAGE_ITEMS = metrics.counter(
+    'opinion_mining_stage_items_total', 'Reviews or texts processed by each pipeline stage', ('stage',)
+)
+STAGE_BATCH_SIZE = metrics.histogram(
+    'opinion_mining_stage_batch_size', 'Reviews or texts per call of each pipeline stage', ('stage',),
+    buckets=SIZE_BUCKETS
+)
+STAGE_ERRORS = metrics.counter(
+    'opinion_mining_stage_errors_total', 'Failed calls and failed items of each pipeline stage', ('stage',)
+)
+
+def count_missing(results) -> int:
+    """Number of failed (None) results in a list, or 1 for a single None result."""
+    if results is None:
+        return 1
+    if isinstance(results, list):
+        return sum(1 for result in results if result is None)
+    return 0
+
+def instrumented(stage: str, items: Optional[Callable] = None, errors: Optional[Callable] = None):
+    """
+    Decorator recording a stage's latency, throughput, batch sizes and errors.
+
+    Args:
+        stage (str): Stage label of the recorded metrics
+        items (Callable): Given the result, the number of reviews or texts it
+            covers; counted towards throughput and the batch size histogram
+        errors (Callable): Given the result, the number of failed items (e.g.
+            count_missing for methods that log errors and return None)
+
+    Returns:
+        Callable: The decorator; with METRICS=0 it returns functions unchanged
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+        labels = (stage,)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                STAGE_SECONDS.observe(time.perf_counter() - start, labels)
+                STAGE_ERRORS.inc(labels)
+                raise
+            STAGE_SECONDS.observe(time.perf_counter() - start, labels)
+            if items is not None:
+                count = items(result)
+                STAGE_ITEMS.inc(labels, count)
+                STAGE_BATCH_SIZE.observe(count, labels)
+            if errors is not None:
+                failed = errors(result)
+                if failed:
+                    STAGE_ERRORS.inc(labels, failed)
+            return result
+        return wrapper
+    return decorate
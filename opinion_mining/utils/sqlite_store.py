@@ -0,0 +1,35 @@
+import os
+import sqlite3
+import threading
+
+class SQLiteConnections:
+    """
+    Per-thread connections to a SQLite database in WAL mode.
+
+    SQLite connections may not be shared across threads, and WAL lets
+    several processes (e.g. gunicorn workers) read while one writes.
+    """
+
+    def __init__(self, path: str, schema: str = ''):
+        """
+        Args:
+            path (str): Database file; parent directories are created
+            schema (str): SQL script run once to create tables
+        """
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if schema:
+            with self.connection() as connection:
+                connection.executescript(schema)
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name="opinion_mining",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=[
         "numpy>=1.21.0",
         "pandas>=1.3.0",
@@ -16,5 +16,14 @@ setup(
         "transformers>=4.11.3",
         "torch>=1.9.0"
     ],
+    extras_require={
+        "onnx": [
+            "onnx>=1.10.0",
+            "onnxruntime>=1.10.0"
+        ],
+        "arrow": [
+            "pyarrow>=12.0.0"
+        ]
+    },
     python_requires=">=3.8",
 ) 
\ No newline at end of file
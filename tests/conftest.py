@@ -0,0 +1,100 @@
+import hashlib
+import pytest
+from opinion_mining.records import Label, Sentiment, SentimentResult
+from opinion_mining.preprocessing import nltk_resources
+
+@pytest.fixture(scope='session')
+def processor():
+    """A TextProcessor, skipping the test when the NLTK data is not installed."""
+    missing = nltk_resources.missing_resources()
+    if missing:
+        pytest.skip(f"NLTK resources {missing} are not installed")
+    from opinion_mining.preprocessing.text_processor import TextProcessor
+
+    return TextProcessor()
+
+def _review_html(review) -> str:
+    badge = '<span data-hook="avp-badge">Verified Purchase</span>' if review.verified else ''
+    return (
+        '<div data-hook="review">'
+        f'<i data-hook="review-star-rating"><span>{review.rating} out of 5 stars</span></i>'
+        f'<a data-hook="review-title"><span>{review.title}</span></a>'
+        f'<span data-hook="review-date">Reviewed in the United States on {review.date}</span>'
+        f'{badge}<span data-hook="review-body"><span>{review.text}</span></span>'
+        '</div>'
+    )
+
+@pytest.fixture
+def review_page():
+    """Render Review records as an Amazon review page."""
+    def render(reviews) -> bytes:
+        body = ''.join(_review_html(review) for review in reviews)
+        return f'<html><body><div id="cm_cr-review_list">{body}</div></body></html>'.encode('utf-8')
+    return render
+
+class FakeSentimentPipeline:
+    """Deterministic stand-in for the transformer pipeline, with scores spread over 0.5-1.0."""
+
+    def __init__(self):
+        self.texts = 0
+
+    def __call__(self, inputs, batch_size=None, **kwargs):
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        self.texts += len(texts)
+        results = []
+        for text in texts:
+            digest = int(hashlib.sha1(text.encode('utf-8')).hexdigest(), 16)
+            results.append({'label': 'POSITIVE' if digest % 2 else 'NEGATIVE', 'score': 0.5 + (digest % 1001) / 2000})
+        return results
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    """A SentimentAnalyzer whose transformer is a FakeSentimentPipeline."""
+    pytest.importorskip('textblob')
+    from opinion_mining.sentiment_analysis import sentiment_analyzer
+
+    # The ONNX loader is replaced, so no model is looked for on disk
+    monkeypatch.setattr(sentiment_analyzer, 'OnnxSentimentPipeline', lambda *args, **kwargs: FakeSentimentPipeline())
+    analyzer = sentiment_analyzer.SentimentAnalyzer(backend='onnx')
+    assert isinstance(analyzer.transformer_analyzer, FakeSentimentPipeline)
+    return analyzer
+
+class StubAnalyzer:
+    """Labels reviews by rating alone, recording the batches it was given."""
+
+    def __init__(self):
+        self.batches = []
+
+    def analyze_sentiment(self, reviews):
+        self.batches.append(len(reviews))
+        for review in reviews:
+            label = Label.POSITIVE if review.rating >= 4 else Label.NEGATIVE if review.rating <= 2 else Label.NEUTRAL
+            result = SentimentResult(label, 1.0)
+            review.sentiment = Sentiment(rating=result, combined=result, path='cheap')
+        return reviews
+
+@pytest.fixture
+def stub_analyzer():
+    return StubAnalyzer()
+
+class StubProcessor:
+    """Lowercases review texts, standing in for TextProcessor without NLTK data."""
+
+    def preprocess_reviews(self, reviews):
+        for review in reviews:
+            review.processed_text = review.text.lower()
+        return reviews
+
+@pytest.fixture
+def stub_processor():
+    return StubProcessor()
+
+@pytest.fixture
+def api_client(monkeypatch, stub_processor, stub_analyzer):
+    """Flask test client whose API endpoints use stub_processor and stub_analyzer."""
+    from opinion_mining import api
+    from opinion_mining.app import app
+
+    monkeypatch.setattr(api, 'get_processor', lambda: stub_processor)
+    monkeypatch.setattr(api, 'get_analyzer', lambda: stub_analyzer)
+    return app.test_client()
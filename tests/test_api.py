@@ -0,0 +1,94 @@
+import json
+import pytest
+
+REVIEWS = [
+    {'text': 'Great battery life', 'rating': 5},
+    {'text': 'Stopped working after a week', 'rating': 1},
+    {'text': 'It is okay', 'rating': 3},
+    {'text': 'Comfortable and well made', 'rating': 4.5, 'title': 'Nice', 'verified': True},
+    {'text': 'No rating given'}
+]
+LABELS = ['positive', 'negative', 'neutral', 'positive', 'negative']
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def ndjson_body(items):
+    return '\n'.join(json.dumps(item) for item in items) + '\n'
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    # Results cross several pipeline batches
+    monkeypatch.setenv('STREAM_BATCH_SIZE', '2')
+
+def check_results(lines):
+    assert [line['index'] for line in lines[:-1]] == list(range(len(REVIEWS)))
+    assert [line['processed_text'] for line in lines[:-1]] == [review['text'].lower() for review in REVIEWS]
+    assert [line['sentiment']['combined']['label'] for line in lines[:-1]] == LABELS
+    assert lines[-1] == {'summary': {
+        'total_reviews': 5, 'positive_count': 2, 'negative_count': 2, 'neutral_count': 1, 'failed_count': 0,
+        'avg_rating': 2.7
+    }}
+
+@pytest.mark.parametrize('body', [REVIEWS, {'reviews': REVIEWS}])
+def test_json_body(api_client, body):
+    response = api_client.post('/api/v1/analyze', json=body)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    check_results(ndjson(response))
+
+def test_ndjson_body(api_client, stub_analyzer):
+    # Blank lines are skipped
+    body = ndjson_body(REVIEWS[:2]) + '\n' + ndjson_body(REVIEWS[2:])
+    response = api_client.post('/api/v1/analyze', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    check_results(ndjson(response))
+    assert stub_analyzer.batches == [2, 2, 1]
+
+def test_wrong_content_type(api_client):
+    response = api_client.post('/api/v1/analyze', data='Great battery life', content_type='text/plain')
+    assert response.status_code == 415
+    assert 'Unsupported content type' in response.get_json()['error']
+
+@pytest.mark.parametrize('body, status', [
+    (b'[{"text": "unterminated"', 400),
+    (b'{"text": "not a list"}', 400),
+    (b'[{"text": 5}]', 400),
+    (b'[{"text": "ok", "rating": "five"}]', 400),
+    (b'[{"text": "ok", "rating": true}]', 400)
+])
+def test_invalid_json_bodies(api_client, body, status):
+    response = api_client.post('/api/v1/analyze', data=body, content_type='application/json')
+    assert response.status_code == status
+    assert 'error' in response.get_json()
+
+def test_too_many_reviews(api_client, monkeypatch):
+    monkeypatch.setenv('API_MAX_REVIEWS', '4')
+    response = api_client.post('/api/v1/analyze', json=REVIEWS)
+    assert response.status_code == 413
+    assert response.get_json() == {'error': 'Request has more than 4 reviews'}
+
+    # NDJSON is checked as it is read, so the stream ends with the error
+    response = api_client.post('/api/v1/analyze', data=ndjson_body(REVIEWS), content_type='application/x-ndjson')
+    assert response.status_code == 200
+    lines = ndjson(response)
+    assert lines[-1] == {'error': 'Request has more than 4 reviews', 'status': 413}
+
+@pytest.mark.parametrize('content_type', ['application/json', 'application/x-ndjson'])
+def test_body_too_large(api_client, monkeypatch, content_type):
+    monkeypatch.setenv('API_MAX_BODY_BYTES', '64')
+    response = api_client.post('/api/v1/analyze', data=ndjson_body(REVIEWS), content_type=content_type)
+    assert response.status_code == 413
+    assert response.get_json() == {'error': 'Request body exceeds 64 bytes'}
+
+def test_malformed_ndjson_line_ends_the_stream(api_client):
+    body = ndjson_body(REVIEWS[:3]) + '{"text": "cut off\n' + ndjson_body(REVIEWS[3:])
+    response = api_client.post('/api/v1/analyze', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    lines = ndjson(response)
+    error = lines[-1]
+    assert error['status'] == 400
+    assert error['error'].startswith('Invalid JSON in review 3')
+    # Whatever was analyzed before the bad line was sent in order, and no summary follows
+    assert [line['index'] for line in lines[:-1]] == list(range(len(lines) - 1))
+    assert not any('summary' in line for line in lines)
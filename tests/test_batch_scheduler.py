@@ -0,0 +1,98 @@
+import threading
+import time
+import pytest
+from opinion_mining.sentiment_analysis.batch_scheduler import InferenceScheduler
+
+class RecordingModel:
+    """Upper-cases texts, recording each batch it runs."""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.batches = []
+        self.delay = delay
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        if self.fail_on is not None and self.fail_on in texts:
+            raise RuntimeError(f"model failed on {self.fail_on}")
+        return [{'label': text.upper()} for text in texts]
+
+@pytest.fixture
+def schedulers():
+    started = []
+
+    def start(model, **kwargs):
+        scheduler = InferenceScheduler(model, **kwargs)
+        started.append(scheduler)
+        return scheduler
+    yield start
+    for scheduler in started:
+        scheduler.shutdown()
+
+def test_full_batches_do_not_wait(schedulers):
+    model = RecordingModel()
+    scheduler = schedulers(model, max_batch_size=4, max_wait_ms=10000)
+    started = time.monotonic()
+    results = scheduler.infer([f'text {index}' for index in range(8)])
+    assert time.monotonic() - started < 5
+    assert [len(batch) for batch in model.batches] == [4, 4]
+    assert results == [{'label': f'TEXT {index}'} for index in range(8)]
+
+def test_partial_batches_flush_after_max_wait(schedulers):
+    model = RecordingModel()
+    scheduler = schedulers(model, max_batch_size=100, max_wait_ms=100)
+    started = time.monotonic()
+    assert scheduler.infer(['a', 'b', 'c']) == [{'label': 'A'}, {'label': 'B'}, {'label': 'C'}]
+    assert time.monotonic() - started >= 0.09
+    assert model.batches == [['a', 'b', 'c']]
+
+def test_concurrent_callers_get_their_own_results(schedulers):
+    model = RecordingModel(delay=0.002)
+    scheduler = schedulers(model, max_batch_size=16, max_wait_ms=5)
+    results = {}
+
+    def caller(number):
+        texts = [f'caller {number} text {index}' for index in range(10)]
+        results[number] = (texts, scheduler.infer(texts))
+
+    threads = [threading.Thread(target=caller, args=(number,)) for number in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for texts, outputs in results.values():
+        assert outputs == [{'label': text.upper()} for text in texts]
+    assert sorted(text for batch in model.batches for text in batch) == \
+        sorted(text for texts, _ in results.values() for text in texts)
+    assert max(len(batch) for batch in model.batches) <= 16
+    # Callers shared batches
+    assert len(model.batches) < 12 * 10
+
+def test_batch_failure_reaches_every_caller(schedulers):
+    model = RecordingModel(fail_on='bad')
+    scheduler = schedulers(model, max_batch_size=100, max_wait_ms=200)
+    # Three callers within one batch window
+    futures = [scheduler.submit(['good 1', 'good 2']), scheduler.submit(['bad']), scheduler.submit(['good 3'])]
+    for caller in futures:
+        for future in caller:
+            with pytest.raises(RuntimeError, match='model failed on bad'):
+                future.result(timeout=5)
+    assert len(model.batches) == 1
+    assert scheduler.metrics()['errors'] == 1
+    # The scheduler keeps serving
+    assert scheduler.infer(['fine']) == [{'label': 'FINE'}]
+
+def test_shutdown_drains_queued_texts(schedulers):
+    model = RecordingModel(delay=0.01)
+    scheduler = schedulers(model, max_batch_size=2, max_wait_ms=0)
+    futures = scheduler.submit([f'text {index}' for index in range(10)])
+    scheduler.shutdown()
+    assert all(future.done() for future in futures)
+    assert [future.result() for future in futures] == [{'label': f'TEXT {index}'} for index in range(10)]
+    assert not scheduler.running
+    with pytest.raises(RuntimeError, match='shut down'):
+        scheduler.submit(['late'])
@@ -0,0 +1,56 @@
+import json
+import pytest
+from benchmarks.corpus import make_corpus, make_reviews
+from benchmarks.suite import compare, main
+
+def suite(*results):
+    return {'results': list(results)}
+
+def result(case, size, throughput=100.0, p95=10.0, peak_rss_mb=50.0):
+    return {
+        'case': case,
+        'size': size,
+        'throughput': throughput,
+        'latency_ms': {'p50': 5.0, 'p95': p95, 'p99': 20.0},
+        'peak_rss_mb': peak_rss_mb
+    }
+
+def test_compare_reports_slowdowns_beyond_threshold():
+    baseline = suite(result('textblob', 10), result('rating', 10))
+    current = suite(result('textblob', 10, throughput=80.0), result('rating', 10, throughput=95.0))
+    assert compare(baseline, current, threshold=0.1) == ['textblob (size 10): throughput +25.0% worse']
+
+def test_compare_reports_cases_skipped_or_missing_now():
+    baseline = suite(result('textblob', 10), result('transformer', 10), result('predict', 10))
+    current = suite(result('textblob', 10), {'case': 'transformer', 'size': 10, 'skipped': 'No module named torch'})
+    assert compare(baseline, current) == [
+        'transformer (size 10): skipped in the current run (No module named torch)',
+        'predict (size 10): missing from the current run'
+    ]
+
+def test_compare_ignores_cases_skipped_in_the_baseline():
+    baseline = suite({'case': 'transformer', 'size': 10, 'skipped': 'No module named torch'})
+    assert compare(baseline, suite()) == []
+    assert compare(baseline, suite(result('transformer', 10))) == []
+
+def test_reviews_share_the_corpus_texts():
+    assert [review.text for review in make_reviews(50, seed=3)] == make_corpus(50, seed=3)
+
+def test_predict_case_fails_when_the_page_reports_an_error(monkeypatch):
+    pytest.importorskip('textblob')
+    import opinion_mining.app
+    from benchmarks.suite import _case_predict
+
+    def missing_data():
+        raise LookupError("Resource stopwords not found")
+    monkeypatch.setattr(opinion_mining.app, 'get_processor', missing_data)
+    units, run = _case_predict(make_reviews(2, seed=1), {'max_requests': 2})
+    with pytest.raises(RuntimeError, match='/predict failed: .*stopwords'):
+        run(units[0])
+
+def test_report_on_stdout_is_not_mixed_with_case_logs(processor, capfd):
+    pytest.importorskip('textblob')
+    # /predict logs every request
+    assert main(['run', '--cases', 'predict', '--sizes', '2']) == 0
+    report = json.loads(capfd.readouterr().out)
+    assert [(result['case'], result['reviews']) for result in report['results']] == [('predict', 2)]
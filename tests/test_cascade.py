@@ -0,0 +1,21 @@
+from opinion_mining.sentiment_analysis.sentiment_analyzer import PATH_CHEAP, PATH_FULL
+from benchmarks.cascade import make_reviews
+
+def analyze(analyzer, reviews, cascade: bool):
+    analyzer.cascade = cascade
+    before = analyzer.transformer_analyzer.texts
+    analyzed = analyzer.analyze_sentiment([review.copy() for review in reviews])
+    return analyzed, analyzer.transformer_analyzer.texts - before
+
+def test_cascade_labels_match_full_ensemble(analyzer):
+    reviews = make_reviews(3000)
+    full, full_texts = analyze(analyzer, reviews, cascade=False)
+    cascade, cascade_texts = analyze(analyzer, reviews, cascade=True)
+
+    assert [review.sentiment.combined.label for review in cascade] == \
+        [review.sentiment.combined.label for review in full]
+    assert {review.sentiment.path for review in full} == {PATH_FULL}
+
+    cheap = [review for review in cascade if review.sentiment.path == PATH_CHEAP]
+    assert cheap and all(review.sentiment.transformer is None for review in cheap)
+    assert cascade_texts < full_texts
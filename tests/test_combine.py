@@ -0,0 +1,31 @@
+import pytest
+from opinion_mining.records import Label, Sentiment, SentimentResult
+from benchmarks.combine import make_sentiments
+
+def reference(analyzer, sentiments):
+    return [analyzer._combine_sentiments(s.textblob, s.transformer, s.rating) for s in sentiments]
+
+def test_combine_batch_matches_per_review_combine(analyzer):
+    sentiments = make_sentiments(20000)
+    assert analyzer._combine_batch(sentiments) == reference(analyzer, sentiments)
+
+@pytest.mark.parametrize('weights', [
+    {'textblob': 0.3, 'transformer': 0.4, 'rating': 0.3},
+    {'textblob': 0.5, 'transformer': 0.5, 'rating': 0.5},
+    {'textblob': 1.0, 'transformer': 0.0, 'rating': 1.0}
+])
+def test_ties_go_to_the_lowest_label(analyzer, weights):
+    analyzer.weights = dict(weights)
+    positive, negative, neutral = (SentimentResult(label, 0.5) for label in (Label.POSITIVE, Label.NEGATIVE, Label.NEUTRAL))
+    sentiments = [
+        Sentiment(positive, None, negative),
+        Sentiment(negative, None, positive),
+        Sentiment(neutral, None, negative),
+        Sentiment(negative, neutral, positive),
+        Sentiment(SentimentResult(Label.NEUTRAL, 0.0), None, None),
+        Sentiment(None, None, None)
+    ]
+    combined = analyzer._combine_batch(sentiments)
+    assert combined == reference(analyzer, sentiments)
+    if weights['textblob'] == weights['rating']:
+        assert [result.label for result in combined[:3]] == [Label.POSITIVE, Label.POSITIVE, Label.NEGATIVE]
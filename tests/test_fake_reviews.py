@@ -0,0 +1,12 @@
+from benchmarks.fake_reviews import make_reviews
+
+def test_fake_review_mask_matches_per_review_checks(processor):
+    reviews = make_reviews(5000)
+    expected = [processor._check_fake_review(review) for review in reviews]
+
+    assert processor._fake_review_mask(reviews).tolist() == expected
+    assert processor.fake_review_flags(reviews)['is_potentially_fake'].tolist() == expected
+
+def test_fake_rule_is_set_for_flagged_reviews(processor):
+    frame = processor.fake_review_flags(make_reviews(2000, seed=7))
+    assert (frame['fake_rule'].notna() == frame['is_potentially_fake']).all()
@@ -0,0 +1,143 @@
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from opinion_mining.data_collection.http_cache import CacheMiss, CachedResponse, ResponseCache
+from opinion_mining.data_collection.http_fetcher import HttpFetcher
+
+pytest.importorskip('requests')
+
+PATH = '/reviews?pageNumber=2'
+
+class VersionedPage(BaseHTTPRequestHandler):
+    """Serves one page whose ETag follows server.version, answering 304 to a matching If-None-Match."""
+
+    def do_GET(self):
+        server = self.server
+        etag = f'"v{server.version}"'
+        server.log.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        body = f'<html><body>version {server.version}</body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', 'Fri, 15 Mar 2024 10:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), VersionedPage)
+    httpd.version = 1
+    httpd.log = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def make_fetcher(cache):
+    return HttpFetcher(requests_per_second=100.0, burst=10, max_retries=0, cache=cache)
+
+def test_store_and_get(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    body = b'<html>' + b'review ' * 1000 + b'</html>'
+
+    assert cache.get('http://example.com/a') is None
+    cache.store('http://example.com/a', body, etag='"abc"', last_modified='Fri, 15 Mar 2024 10:00:00 GMT')
+    entry = cache.get('http://example.com/a')
+
+    assert entry.body == body
+    assert (entry.etag, entry.last_modified) == ('"abc"', 'Fri, 15 Mar 2024 10:00:00 GMT')
+    assert entry.fetched_at == pytest.approx(time.time(), abs=5)
+    # Bodies are stored compressed
+    stored, = cache._db.connection().execute('SELECT body FROM responses').fetchone()
+    assert len(stored) < len(body) and zlib.decompress(stored) == body
+
+def test_ttl_rules_and_freshness(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    now = time.time()
+
+    assert cache.ttl_for('http://example.com/reviews?pageNumber=1') == 3600.0
+    assert cache.ttl_for('http://example.com/reviews?pageNumber=12') == 86400.0
+    assert cache.is_fresh('http://example.com/reviews?pageNumber=1', CachedResponse(b'', None, None, now - 60))
+    assert not cache.is_fresh('http://example.com/reviews?pageNumber=1', CachedResponse(b'', None, None, now - 7200))
+    assert cache.is_fresh('http://example.com/reviews?pageNumber=2', CachedResponse(b'', None, None, now - 7200))
+
+    custom = ResponseCache(str(tmp_path / 'custom.db'), ttl_rules=[(r'/static/', 10)], default_ttl=0)
+    assert custom.ttl_for('http://example.com/static/a.html') == 10.0
+    assert custom.ttl_for('http://example.com/reviews?pageNumber=1') == 0.0
+
+def test_conditional_headers():
+    assert ResponseCache.conditional_headers(CachedResponse(b'', None, None, 0.0)) == {}
+    assert ResponseCache.conditional_headers(
+        CachedResponse(b'', '"abc"', 'Fri, 15 Mar 2024 10:00:00 GMT', 0.0)
+    ) == {'If-None-Match': '"abc"', 'If-Modified-Since': 'Fri, 15 Mar 2024 10:00:00 GMT'}
+
+def test_etag_revalidation(server, tmp_path):
+    url = f'http://127.0.0.1:{server.server_address[1]}{PATH}'
+    cache = ResponseCache(str(tmp_path / 'cache.db'), ttl_rules=[], default_ttl=0)
+    fetcher = make_fetcher(cache)
+
+    try:
+        first = fetcher.fetch(url)
+        recorded = cache.get(url)
+        time.sleep(0.01)
+        unchanged = fetcher.fetch(url)
+        revalidated = cache.get(url)
+        server.version = 2
+        changed = fetcher.fetch(url)
+    finally:
+        fetcher.close()
+
+    assert first == unchanged == b'<html><body>version 1</body></html>'
+    assert changed == b'<html><body>version 2</body></html>'
+    assert server.log == [(PATH, None), (PATH, '"v1"'), (PATH, '"v1"')]
+    # A 304 keeps the recorded body and only refreshes its fetch time
+    assert revalidated.body == recorded.body and revalidated.etag == recorded.etag
+    assert revalidated.fetched_at > recorded.fetched_at
+    assert cache.get(url).body == changed and cache.get(url).etag == '"v2"'
+    assert fetcher.stats() == {'downloads': 2, 'cache_hits': 0, 'not_modified': 1}
+
+def test_fresh_entries_skip_the_network(server, tmp_path):
+    url = f'http://127.0.0.1:{server.server_address[1]}{PATH}'
+    fetcher = make_fetcher(ResponseCache(str(tmp_path / 'cache.db')))
+
+    try:
+        bodies = [fetcher.fetch(url) for _ in range(3)]
+    finally:
+        fetcher.close()
+
+    assert len(set(bodies)) == 1
+    assert server.log == [(PATH, None)]
+    assert fetcher.stats() == {'downloads': 1, 'cache_hits': 2, 'not_modified': 0}
+
+def test_offline_replay(server, tmp_path):
+    url = f'http://127.0.0.1:{server.server_address[1]}{PATH}'
+    db_path = str(tmp_path / 'cache.db')
+    recorder = make_fetcher(ResponseCache(db_path, ttl_rules=[], default_ttl=0))
+    try:
+        recorded = recorder.fetch(url)
+    finally:
+        recorder.close()
+
+    server.version = 2
+    replay = make_fetcher(ResponseCache(db_path, ttl_rules=[], default_ttl=0, offline=True))
+    try:
+        # Stale entries are replayed as recorded, without revalidation
+        assert replay.fetch(url) == recorded
+        with pytest.raises(CacheMiss, match='pageNumber=3'):
+            replay.fetch(url.replace('pageNumber=2', 'pageNumber=3'))
+    finally:
+        replay.close()
+
+    assert server.log == [(PATH, None)]
+    assert replay.stats() == {'downloads': 0, 'cache_hits': 1, 'not_modified': 0}
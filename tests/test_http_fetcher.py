@@ -0,0 +1,98 @@
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from opinion_mining.data_collection.http_cache import ResponseCache
+from opinion_mining.data_collection.http_fetcher import HttpFetcher
+from opinion_mining.data_collection.review_parser import parse_review_page
+from opinion_mining.records import Review
+
+pytest.importorskip('requests')
+
+RATE = 5.0
+RETRY_AFTER = 1
+
+class ReviewPages(BaseHTTPRequestHandler):
+    """Serves canned review pages with ETags; throttles the first request to each throttled path."""
+
+    def do_GET(self):
+        server = self.server
+        etag = self.headers.get('If-None-Match')
+        with server.lock:
+            server.log.append((time.monotonic(), self.path, etag))
+            throttled = self.path in server.throttle
+            server.throttle.discard(self.path)
+        if throttled:
+            self.send_response(429)
+            self.send_header('Retry-After', str(RETRY_AFTER))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = server.pages.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        page_etag = f'"{self.path.rsplit("=", 1)[1]}-v1"'
+        if etag == page_etag:
+            self.send_response(304)
+            self.send_header('ETag', page_etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', page_etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server(review_page):
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ReviewPages)
+    httpd.lock = threading.Lock()
+    httpd.log = []
+    httpd.throttle = {'/reviews?pageNumber=1'}
+    httpd.pages = {
+        f'/reviews?pageNumber={page}': review_page([
+            Review(rating=5.0, title=f'Page {page} review {index}', text='Works great',
+                   date=f"{date(2024, 3, 20 - index):%B %d, %Y}", verified=True)
+            for index in range(3)
+        ])
+        for page in (1, 2, 3)
+    }
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_rate_limit_retry_after_and_revalidation(server, tmp_path):
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    # A TTL of 0 makes every cached page stale, so each refetch is a conditional GET
+    cache = ResponseCache(str(tmp_path / 'cache.db'), ttl_rules=[], default_ttl=0)
+    fetcher = HttpFetcher(requests_per_second=RATE, burst=1, max_retries=2, cache=cache)
+    paths = [f'/reviews?pageNumber={page}' for page in (1, 2, 3)]
+
+    try:
+        bodies = [fetcher.fetch(base + path) for path in paths]
+        revalidated = [fetcher.fetch(base + path) for path in paths]
+    finally:
+        fetcher.close()
+
+    assert bodies == revalidated == [server.pages[path] for path in paths]
+    assert [len(parse_review_page(body)) for body in bodies] == [3, 3, 3]
+
+    log = server.log
+    # The throttled page is retried once, then each page is downloaded and revalidated
+    assert [path for _, path, _ in log] == [paths[0]] + paths + paths
+    assert [etag for _, _, etag in log] == [None] * 4 + [f'"{page}-v1"' for page in (1, 2, 3)]
+
+    gaps = [later - earlier for (earlier, _, _), (later, _, _) in zip(log, log[1:])]
+    # Retry-After is honoured, and no two requests are closer than the rate allows
+    assert gaps[0] >= RETRY_AFTER - 0.05
+    assert min(gaps) >= 1 / RATE - 0.05
+    assert fetcher.stats() == {'downloads': 3, 'cache_hits': 0, 'not_modified': 3}
@@ -0,0 +1,32 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import pytest
+from benchmarks.import_time import DEFAULT_BUDGET_MS, DEFAULT_REPEAT, LAZY_MODULES, measure
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_app_import_loads_no_heavy_dependencies(tmp_path):
+    pytest.importorskip('flask')
+    code = (
+        'import json, sys\n'
+        'import opinion_mining.app\n'
+        f'print(json.dumps(sorted(name for name in {LAZY_MODULES!r} if name in sys.modules)))\n'
+    )
+    # A fresh interpreter, run elsewhere so the app's log directory lands in tmp_path
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop('WARM_START', None)
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+@pytest.mark.skipif(bool(os.environ.get('SKIP_IMPORT_TIME_BUDGET')), reason='SKIP_IMPORT_TIME_BUDGET is set')
+def test_app_import_stays_within_budget():
+    pytest.importorskip('flask')
+    # One untimed import writes the bytecode caches
+    measure()
+    median = statistics.median(measure()[0] for _ in range(DEFAULT_REPEAT))
+    assert median <= DEFAULT_BUDGET_MS, f"importing the app took {median:.0f} ms (budget {DEFAULT_BUDGET_MS:.0f} ms)"
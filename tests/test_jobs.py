@@ -0,0 +1,44 @@
+import pytest
+from opinion_mining.jobs import FAILED, KIND_REVIEWS, KIND_URL, RUNNING, SUCCEEDED, JobLost, JobStore
+
+def records(start, count):
+    return [{'index': index, 'label': 'positive'} for index in range(start, start + count)]
+
+def test_status_queries_leave_out_the_payload(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    submitted = store.submit(KIND_URL, {'product_url': 'https://example.com/p', 'max_reviews': 5})
+
+    job = store.get(submitted.id)
+    assert job.payload is None
+    assert job.to_dict()['product_url'] == 'https://example.com/p'
+
+    claimed = store.claim('worker-a')
+    assert claimed.payload == {'product_url': 'https://example.com/p', 'max_reviews': 5}
+    assert (claimed.status, claimed.worker, claimed.attempts) == (RUNNING, 'worker-a', 1)
+
+def test_only_the_current_attempt_writes(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    store = JobStore(path)
+    # Presumes every running job dead, so its claim takes the job over
+    impatient = JobStore(path, stale_after=-1.0)
+    store.submit(KIND_REVIEWS, {'reviews': [{'text': 'fine', 'rating': 4}] * 3}, total=3)
+
+    first = store.claim('worker-a')
+    store.add_results(first, records(0, 2))
+    second = impatient.claim('worker-b')
+    assert (second.id, second.attempts) == (first.id, 2)
+
+    with pytest.raises(JobLost):
+        store.add_results(first, records(2, 1))
+    assert store.finish(first, {'total': 3}) is False
+    assert store.fail(first, 'boom') is False
+
+    store.add_results(second, records(0, 3))
+    assert store.finish(second, {'total': 3}) is True
+
+    job = store.get(first.id)
+    assert (job.status, job.worker, job.processed, job.summary) == (SUCCEEDED, 'worker-b', 3, {'total': 3})
+    assert len(list(store.iter_results(first.id))) == 3
+    # Finished jobs cannot be changed by their last owner either
+    assert store.fail(second, 'late') is False
+    assert store.get(first.id).status != FAILED
@@ -0,0 +1,82 @@
+import json
+import time
+import pytest
+from opinion_mining import api
+from opinion_mining.jobs import JobStore, JobWorkerPool
+
+RATINGS = [5.0, 1.0, 3.0, 4.0, 2.0]
+LABELS = ['positive', 'negative', 'neutral', 'positive', 'negative']
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    monkeypatch.setattr(api, 'get_job_store', lambda: store)
+    # Submitting only wakes workers; none run until a test starts them
+    monkeypatch.setattr(api, 'get_job_workers', lambda: JobWorkerPool(store, None, workers=0))
+    return store
+
+@pytest.fixture
+def start_workers(store, stub_processor, stub_analyzer):
+    pools = []
+
+    def start():
+        components = {'processor': stub_processor, 'analyzer': stub_analyzer}.get
+        pools.append(JobWorkerPool(store, components, workers=1, poll_interval=0.05, batch_size=2))
+    yield start
+    for pool in pools:
+        pool.close()
+
+def test_job_lifecycle(api_client, start_workers):
+    reviews = [{'text': f'Review number {index}', 'rating': rating} for index, rating in enumerate(RATINGS)]
+    response = api_client.post('/jobs', json={'reviews': reviews})
+    assert response.status_code == 202
+    body = response.get_json()
+    job_id, token = body['job']['id'], body['token']
+    assert response.headers['Location'] == body['links']['status'] == f'/jobs/{job_id}'
+    assert (body['job']['status'], body['job']['total'], body['job']['processed']) == ('queued', 5, 0)
+
+    # Results are not available before the job has run
+    response = api_client.get(body['links']['results'], headers=bearer(token))
+    assert response.status_code == 409
+    assert response.get_json()['job']['status'] == 'queued'
+
+    start_workers()
+    deadline = time.monotonic() + 10
+    while True:
+        status = api_client.get(f'/jobs/{job_id}', headers=bearer(token)).get_json()['job']
+        if status['status'] in ('succeeded', 'failed') or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert (status['status'], status['processed'], status['attempts']) == ('succeeded', 5, 1)
+    assert status['summary']['total_reviews'] == 5
+
+    lines = ndjson(api_client.get(f'/jobs/{job_id}/results', headers=bearer(token)))
+    assert [line['index'] for line in lines[:-1]] == list(range(5))
+    assert [line['sentiment']['combined']['label'] for line in lines[:-1]] == LABELS
+    assert lines[-1] == {'summary': status['summary']}
+
+    lines = ndjson(api_client.get(f'/jobs/{job_id}/results?offset=1&limit=2', headers=bearer(token)))
+    assert [line['index'] for line in lines[:-1]] == [1, 2]
+    assert [line['processed_text'] for line in lines[:-1]] == ['review number 1', 'review number 2']
+    assert 'summary' in lines[-1]
+
+    response = api_client.get(f'/jobs/{job_id}/results?offset=-1', headers=bearer(token))
+    assert response.status_code == 400
+
+def test_jobs_are_private_to_their_submitter(api_client, store):
+    body = api_client.post('/jobs', json=[{'text': 'Works fine', 'rating': 4}]).get_json()
+    job_id = body['job']['id']
+    other = api_client.post('/jobs', json=[{'text': 'Broke quickly', 'rating': 1}]).get_json()['token']
+
+    for path in (f'/jobs/{job_id}', f'/jobs/{job_id}/results'):
+        assert api_client.get(path).status_code == 403
+        assert api_client.get(path, headers=bearer(other)).status_code == 403
+        assert api_client.get(path, headers=bearer(body['token'])).status_code in (200, 409)
+    assert api_client.get('/jobs/0123456789abcdef', headers=bearer(other)).status_code == 404
+    assert api_client.get('/jobs/0123456789abcdef/results', headers=bearer(other)).status_code == 404
@@ -0,0 +1,33 @@
+import re
+import numpy as np
+import pytest
+from benchmarks.corpus import make_corpus
+
+textblob = pytest.importorskip('textblob')
+
+from opinion_mining.sentiment_analysis.lexicon_scorer import DEFAULT_TOLERANCE, LexiconScorer, check_parity
+
+@pytest.fixture(scope='module')
+def scorer():
+    return LexiconScorer()
+
+def test_matches_textblob_on_processed_corpus(scorer):
+    # Shaped like TextProcessor output: lowercase letters and spaces
+    texts = [re.sub(r'[^a-z\s]', '', text.lower()) for text in make_corpus(2000)]
+    expected = np.array([textblob.TextBlob(text).sentiment.polarity for text in texts])
+    assert np.abs(scorer.polarity(texts) - expected).max() <= DEFAULT_TOLERANCE
+
+def test_matches_textblob_on_negations_and_intensifiers(scorer):
+    texts = [
+        'not good', 'not very good', 'very very bad', 'no good at all', 'never great but not terrible',
+        'extremely happy', 'not', 'very', '', '   ', 'good good bad',
+        # Punctuation, emoticons and contractions go through TextBlob itself
+        "I don't like it :(", 'Great!!! :)', 'Not bad, actually.'
+    ]
+    expected = np.array([textblob.TextBlob(text).sentiment.polarity for text in texts])
+    assert np.abs(scorer.polarity(texts) - expected).max() <= DEFAULT_TOLERANCE
+
+def test_check_parity_on_default_corpus(scorer):
+    report = check_parity(scorer)
+    assert report['label_agreement'] == 1.0
+    assert report['max_score_diff'] <= DEFAULT_TOLERANCE
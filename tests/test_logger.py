@@ -0,0 +1,80 @@
+import json
+import logging
+import sys
+from datetime import datetime
+import pytest
+from opinion_mining.utils import logger as logger_module
+from opinion_mining.utils.logger import JsonFormatter, RequestIdFilter, SamplingFilter, request_id
+
+def make_record(message='Processed review %d', args=(1,), log_class=None, exc_info=None):
+    record = logging.LogRecord('opinion_mining', logging.INFO, __file__, 1, message, args, exc_info)
+    if log_class is not None:
+        record.log_class = log_class
+    return record
+
+def kept(log_filter, count, log_class='review'):
+    return [index for index in range(count) if log_filter.filter(make_record(log_class=log_class))]
+
+@pytest.mark.parametrize('rate, count, expected', [
+    (1, 100, 100), (0, 100, 0), (0.1, 100, 10), (0.4, 100, 40), (0.3, 1000, 300), (1 / 3, 99, 33),
+    (0.25, 10, 3), (0.001, 5, 1)
+])
+def test_sampling_keeps_the_configured_fraction(rate, count, expected):
+    assert len(kept(SamplingFilter(sample_rates={'review': rate}), count)) == expected
+
+def test_sampling_spreads_kept_records_evenly():
+    assert kept(SamplingFilter(sample_rates={'review': 0.1}), 30) == [0, 10, 20]
+    assert kept(SamplingFilter(sample_rates={'review': 0.4}), 10) == [0, 2, 5, 7]
+    assert kept(SamplingFilter(sample_rates={'review': 0.5}), 6) == [0, 2, 4]
+
+@pytest.mark.parametrize('rate', [2, 1.5, -0.1])
+def test_sample_rates_outside_zero_to_one_are_rejected(rate):
+    with pytest.raises(ValueError, match='between 0 and 1'):
+        SamplingFilter(sample_rates={'review': rate})
+
+def test_records_of_other_classes_always_pass():
+    log_filter = SamplingFilter(sample_rates={'review': 0})
+    assert kept(log_filter, 3, log_class=None) == [0, 1, 2]
+    assert kept(log_filter, 3, log_class='request') == [0, 1, 2]
+    assert kept(log_filter, 3) == []
+
+def test_rate_limit_reports_suppressed_records(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(logger_module.time, 'monotonic', lambda: now[0])
+    log_filter = SamplingFilter(rate_limits={'review': 2})
+    assert kept(log_filter, 5) == [0, 1]
+
+    now[0] += 1.0
+    record = make_record(log_class='review')
+    assert log_filter.filter(record)
+    assert record.getMessage() == 'Processed review 1 (3 similar messages suppressed)'
+
+def test_json_formatter():
+    record = make_record(log_class='review')
+    token = request_id.set('abc123')
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id.reset(token)
+    entry = json.loads(JsonFormatter().format(record))
+    logged_at = entry.pop('time')
+    assert logged_at.endswith('+00:00')
+    assert datetime.fromisoformat(logged_at).timestamp() == pytest.approx(record.created)
+    assert entry == {
+        'level': 'INFO',
+        'logger': 'opinion_mining',
+        'message': 'Processed review 1',
+        'request_id': 'abc123',
+        'log_class': 'review'
+    }
+
+def test_json_formatter_includes_tracebacks():
+    try:
+        raise ValueError('bad rating')
+    except ValueError:
+        record = make_record('Error: %s', ('bad rating',), exc_info=sys.exc_info())
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry['message'] == 'Error: bad rating'
+    assert entry['request_id'] is None
+    assert 'log_class' not in entry
+    assert entry['exception'].startswith('Traceback') and 'ValueError: bad rating' in entry['exception']
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from opinion_mining.utils.metrics import (
+    ENABLED, STAGE_BATCH_SIZE, STAGE_ERRORS, STAGE_ITEMS, STAGE_SECONDS, MetricsRegistry, count_missing, instrumented
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+needs_metrics = pytest.mark.skipif(not ENABLED, reason='METRICS is disabled in this environment')
+
+def test_render_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests served', ('method',))
+    latency = registry.histogram('latency_seconds', 'Request latency', buckets=(0.1, 1.0))
+    registry.gauge('queue_depth', 'Queued items').set(3)
+    requests.inc(('GET',))
+    requests.inc(('say "hi"\n',), 2)
+    for value in (0.05, 0.1, 0.5, 5.0):
+        latency.observe(value)
+
+    assert registry.render() == (
+        '# HELP requests_total Requests served\n'
+        '# TYPE requests_total counter\n'
+        'requests_total{method="GET"} 1\n'
+        'requests_total{method="say \\"hi\\"\\n"} 2\n'
+        '# HELP latency_seconds Request latency\n'
+        '# TYPE latency_seconds histogram\n'
+        'latency_seconds_bucket{le="0.1"} 2\n'
+        'latency_seconds_bucket{le="1.0"} 3\n'
+        'latency_seconds_bucket{le="+Inf"} 4\n'
+        'latency_seconds_sum 5.65\n'
+        'latency_seconds_count 4\n'
+        '# HELP queue_depth Queued items\n'
+        '# TYPE queue_depth gauge\n'
+        'queue_depth 3\n'
+    )
+    with pytest.raises(ValueError, match='already registered as a counter'):
+        registry.gauge('requests_total', 'Requests served')
+
+@needs_metrics
+def test_instrumented_records_the_stage():
+    labels = ('test_instrumented',)
+
+    @instrumented(labels[0], items=len, errors=count_missing)
+    def stage(texts, fail=False):
+        """Upper-case texts, failing on None."""
+        if fail:
+            raise RuntimeError('stage failed')
+        return [text.upper() if text is not None else None for text in texts]
+
+    assert stage.__name__ == 'stage' and stage.__doc__ == 'Upper-case texts, failing on None.'
+    assert stage(['a', 'b', None]) == ['A', 'B', None]
+    assert stage(['c']) == ['C']
+    with pytest.raises(RuntimeError):
+        stage([], fail=True)
+
+    assert STAGE_SECONDS.count(labels) == 3
+    assert STAGE_BATCH_SIZE.count(labels) == 2
+    assert STAGE_ITEMS.value(labels) == 4
+    # One failed item, plus the call that raised
+    assert STAGE_ERRORS.value(labels) == 2
+
+@needs_metrics
+def test_metrics_endpoint(api_client):
+    before = STAGE_SECONDS.count(('predict',))
+    assert api_client.get('/predict').status_code == 200
+
+    response = api_client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type == 'text/plain; version=0.0.4; charset=utf-8'
+    body = response.get_data(as_text=True)
+    assert '# TYPE opinion_mining_stage_duration_seconds histogram\n' in body
+    assert f'opinion_mining_stage_duration_seconds_count{{stage="predict"}} {before + 1}\n' in body
+    assert 'opinion_mining_stage_duration_seconds_bucket{stage="predict",le="+Inf"}' in body
+
+def test_metrics_can_be_disabled(tmp_path):
+    pytest.importorskip('flask')
+    code = (
+        'import json\n'
+        'from opinion_mining.app import app\n'
+        'from opinion_mining.utils.metrics import STAGE_SECONDS, instrumented\n'
+        'def stage():\n'
+        '    return 1\n'
+        'client = app.test_client()\n'
+        'client.get("/predict")\n'
+        'response = client.get("/metrics")\n'
+        'print(json.dumps([instrumented("stage")(stage) is stage, STAGE_SECONDS.count(("predict",)),\n'
+        '                  response.status_code]))\n'
+    )
+    # METRICS is read at import, so the app is loaded in a fresh interpreter
+    env = dict(os.environ, PYTHONPATH=ROOT, METRICS='0')
+    env.pop('WARM_START', None)
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == [True, 0, 404]
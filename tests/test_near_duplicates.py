@@ -0,0 +1,45 @@
+import pytest
+from opinion_mining.preprocessing.near_duplicates import NearDuplicateDetector
+from opinion_mining.records import Review
+
+BATTERY = 'The battery lasts all day and the screen is bright and sharp even in direct sunlight'
+SHIPPING = 'Shipping took three weeks and the box arrived crushed with a torn manual inside'
+FABRIC = 'Comfortable fit and the fabric still looks new after many washes in hot water'
+
+def test_near_identical_texts_share_a_cluster():
+    texts = [
+        BATTERY,
+        SHIPPING,
+        BATTERY.upper() + '!!',
+        FABRIC,
+        BATTERY.replace('sunlight', 'sun light'),
+        SHIPPING + ' again'
+    ]
+    # Numbered in order of first appearance
+    assert NearDuplicateDetector().cluster(texts) == [0, 1, 0, None, 0, 1]
+
+def test_distinct_and_short_texts_are_not_clustered():
+    detector = NearDuplicateDetector()
+    assert detector.cluster([BATTERY, SHIPPING, FABRIC]) == [None, None, None]
+    # Shorter than min_tokens (and than a shingle), even when identical
+    assert detector.cluster(['Great product', 'Great product', 'great  product!']) == [None, None, None]
+    assert detector.cluster([None, '', BATTERY, BATTERY]) == [None, None, 0, 0]
+    assert detector.cluster([BATTERY]) == [None]
+
+def test_signatures_do_not_depend_on_the_hashing_batch():
+    texts = [BATTERY, SHIPPING, FABRIC, BATTERY + ' too', 'short one', SHIPPING]
+    whole, whole_valid = NearDuplicateDetector().signatures(texts)
+    batched, batched_valid = NearDuplicateDetector(batch_size=2).signatures(texts)
+    assert (whole == batched).all()
+    assert whole_valid.tolist() == batched_valid.tolist() == [True, True, True, True, False, True]
+
+def test_bands_must_divide_the_signature():
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(num_perm=64, bands=10)
+
+def test_detect_fake_reviews_flags_clustered_reviews(processor):
+    # Verified, mid ratings and varied words: no per-review rule fires
+    texts = [BATTERY, SHIPPING, BATTERY + ' honestly', FABRIC]
+    reviews = processor.detect_fake_reviews([Review(rating=4.0, text=text, verified=True) for text in texts])
+    assert [review.duplicate_cluster_id for review in reviews] == [0, None, 0, None]
+    assert [review.is_potentially_fake for review in reviews] == [True, False, True, False]
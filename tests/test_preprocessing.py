@@ -0,0 +1,32 @@
+import re
+from nltk.tokenize import NLTKWordTokenizer
+from benchmarks.corpus import make_corpus
+
+def reference_preprocess(processor, text: str) -> str:
+    """The original per-text implementation: regex, word_tokenize and uncached lemmatization."""
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    # word_tokenize splits sentences with punkt first, but the regex has
+    # already removed every sentence boundary, so this is the same tokenizer
+    # without needing the punkt data
+    tokens = NLTKWordTokenizer().tokenize(text)
+    tokens = [processor.lemmatizer.lemmatize(token) for token in tokens if token not in processor.stop_words]
+    return ' '.join(tokens)
+
+def test_preprocess_texts_matches_reference(processor):
+    corpus = make_corpus(2000)
+    expected = [reference_preprocess(processor, text) for text in corpus]
+    assert processor.preprocess_texts(corpus) == expected
+
+def test_tokenizer_splits_match_word_tokenize(processor):
+    # Words the Treebank tokenizer splits in two, mixed with stopwords and punctuation
+    texts = [
+        "I cannot believe it, gonna return it!",
+        "Lemme say: you gotta try this... wanna buy two",
+        "GIMME another one; Cannot stop using it",
+        "",
+        "   "
+    ]
+    expected = [reference_preprocess(processor, text) for text in texts]
+    assert processor.preprocess_texts(texts) == expected
+    assert [processor._preprocess_text(text) for text in texts] == expected
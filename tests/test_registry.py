@@ -0,0 +1,90 @@
+import threading
+import time
+import pytest
+from opinion_mining.registry import ComponentRegistry
+
+def test_warm_up_skips_components_registered_without_warm_start():
+    built, warmed = [], []
+    registry = ComponentRegistry()
+    registry.register('model', lambda: built.append('model') or 'model', warmed.append)
+    registry.register('workers', lambda: built.append('workers') or 'workers', warm_start=False)
+
+    registry.warm_up()
+    assert (built, warmed, registry.loaded()) == (['model'], ['model'], ['model'])
+
+    # Still built on first use, or when warmed explicitly
+    assert registry.get('workers') == 'workers'
+    registry.warm_up(['workers'])
+    assert built == ['model', 'workers']
+
+class Component:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def counting_factory(delay=0.0):
+    built = []
+
+    def factory():
+        time.sleep(delay)
+        built.append(Component(len(built)))
+        return built[-1]
+    return factory, built
+
+def test_reload_swaps_in_a_new_instance_and_closes_the_old_one():
+    factory, built = counting_factory()
+    warmed = []
+    registry = ComponentRegistry()
+    registry.register('model', factory, warmed.append)
+
+    old = registry.get('model')
+    new = registry.reload('model')
+    assert (old.number, new.number) == (0, 1)
+    assert registry.get('model') is new
+    assert old.closed and not new.closed
+    # get() builds without warming; reload() warms before swapping in
+    assert warmed == [new]
+
+def test_evict_forces_a_rebuild():
+    factory, built = counting_factory()
+    registry = ComponentRegistry()
+    registry.register('model', factory)
+    registry.register('other', factory)
+
+    first = registry.get('model')
+    other = registry.get('other')
+    registry.evict('model')
+    assert first.closed and not other.closed
+    assert registry.loaded() == ['other']
+    assert registry.get('model').number == 2
+
+    registry.evict()
+    assert registry.loaded() == []
+    assert all(component.closed for component in built)
+
+def test_concurrent_gets_build_once():
+    factory, built = counting_factory(delay=0.05)
+    registry = ComponentRegistry()
+    registry.register('model', factory)
+
+    barrier = threading.Barrier(16)
+    instances = []
+
+    def get():
+        barrier.wait()
+        instances.append(registry.get('model'))
+
+    threads = [threading.Thread(target=get) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1
+    assert len(instances) == 16 and all(instance is built[0] for instance in instances)
+
+def test_unknown_components_are_rejected():
+    with pytest.raises(KeyError):
+        ComponentRegistry().get('missing')
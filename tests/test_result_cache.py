@@ -0,0 +1,72 @@
+from opinion_mining.records import Label, SentimentResult
+from opinion_mining.sentiment_analysis.result_cache import SentimentCache
+
+def result(label=Label.POSITIVE, score=0.9):
+    return {'textblob': SentimentResult(label, 0.5), 'transformer': SentimentResult(label, score)}
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = SentimentCache(max_entries=2)
+    cache.put_many({'a': result(), 'b': result()})
+    # Reading a makes b the least recently used entry
+    assert list(cache.get_many(['a'])) == ['a']
+    cache.put_many({'c': result()})
+
+    assert sorted(cache.get_many(['a', 'b', 'c'])) == ['a', 'c']
+    stats = cache.stats()
+    assert (stats['memory_entries'], stats['evictions'], stats['memory_hits'], stats['misses']) == (2, 1, 3, 1)
+    assert cache.hit_rate() == 0.75
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    SentimentCache(namespace='model|torch|v1', db_path=path).put_many({'great phone': result(score=0.8)})
+
+    cache = SentimentCache(namespace='model|torch|v1', db_path=path)
+    assert cache.get_many(['great phone', 'other']) == {'great phone': result(score=0.8)}
+    assert cache.get_many(['great phone']) == {'great phone': result(score=0.8)}
+    stats = cache.stats()
+    assert (stats['disk_hits'], stats['memory_hits'], stats['misses']) == (1, 1, 1)
+
+def test_model_versions_do_not_share_entries(tmp_path, analyzer):
+    path = str(tmp_path / 'cache.db')
+    analyzer.model_version = 'v1'
+    SentimentCache(namespace=analyzer.cache_namespace, db_path=path).put_many({'great phone': result()})
+    assert SentimentCache(namespace=analyzer.cache_namespace, db_path=path).get_many(['great phone'])
+
+    analyzer.model_version = 'v2'
+    assert SentimentCache(namespace=analyzer.cache_namespace, db_path=path).get_many(['great phone']) == {}
+
+class CrashingPipeline:
+    """Fails every batch containing 'crash', and each such text on its own."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.calls = []
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append(inputs)
+        texts = [inputs] if isinstance(inputs, str) else inputs
+        if any('crash' in text for text in texts):
+            raise RuntimeError('model crashed')
+        return self.pipeline(inputs, **kwargs)
+
+def test_failed_results_are_not_cached(analyzer):
+    analyzer.cache = SentimentCache(namespace=analyzer.cache_namespace)
+    analyzer.transformer_analyzer = CrashingPipeline(analyzer.transformer_analyzer)
+    texts = ['battery lasts all day', 'crash on startup', 'screen is sharp']
+
+    first = analyzer._analyze_texts(texts)
+    assert first['crash on startup']['transformer'] is None
+    assert sorted(analyzer.cache.get_many(texts)) == ['battery lasts all day', 'screen is sharp']
+
+    # Only the failed text is analyzed again, as a batch and then on its own
+    analyzer.transformer_analyzer.calls = []
+    second = analyzer._analyze_texts(texts)
+    assert analyzer.transformer_analyzer.calls == [['crash on startup'], 'crash on startup']
+    assert second['battery lasts all day'] == first['battery lasts all day']
+
+def test_nothing_is_cached_without_a_model(analyzer):
+    analyzer.cache = SentimentCache(namespace=analyzer.cache_namespace)
+    analyzer.transformer_analyzer = None
+    results = analyzer._analyze_texts(['battery lasts all day'])
+    assert results['battery lasts all day']['textblob'] is not None
+    assert analyzer.cache.stats()['writes'] == 0
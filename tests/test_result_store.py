@@ -0,0 +1,69 @@
+import pytest
+from opinion_mining.records import Label, Review, Sentiment, SentimentResult
+
+pa = pytest.importorskip('pyarrow')
+from opinion_mining.result_store import ResultWriter, iter_result_batches, read_results, text_hash
+
+LABELS = (Label.POSITIVE, Label.NEGATIVE, Label.NEUTRAL)
+
+def analyzed_reviews(count: int):
+    reviews = []
+    for index in range(count):
+        label = LABELS[index % 3]
+        # Every fourth review has no transformer result (cheap cascade path)
+        transformer = None if index % 4 == 0 else SentimentResult(label, 0.75)
+        reviews.append(Review(
+            rating=float(1 + index % 5), title=f'title {index}', text=f'review text {index}',
+            date='2024-03-15', verified=index % 2 == 0,
+            is_potentially_fake=index < 2, duplicate_cluster_id=0 if index < 2 else None,
+            sentiment=Sentiment(SentimentResult(label, 0.5), transformer, SentimentResult(label, 1.0),
+                                SentimentResult(label, 0.25), 'cheap' if transformer is None else 'full')
+        ))
+    return reviews
+
+@pytest.mark.parametrize('filename', ['results.parquet', 'results.arrow'])
+def test_round_trip(tmp_path, filename):
+    path = str(tmp_path / filename)
+    reviews = analyzed_reviews(7)
+    with ResultWriter(path, row_group_size=3) as writer:
+        writer.write_many(reviews)
+    assert writer.rows_written == 7
+
+    table = read_results(path)
+    assert table.num_rows == 7
+    assert table.column('text_hash').to_pylist() == [text_hash(review.text) for review in reviews]
+    assert table.column('rating').to_pylist() == [review.rating for review in reviews]
+    assert table.column('verified').to_pylist() == [review.verified for review in reviews]
+    assert table.column('is_potentially_fake').to_pylist() == [True, True] + [False] * 5
+    assert table.column('duplicate_cluster_id').to_pylist() == [0, 0] + [None] * 5
+    assert table.column('sentiment_path').to_pylist() == [review.sentiment.path for review in reviews]
+
+    # Labels are dictionary encoded, with each label's index being its Label value
+    combined = table.column('combined_label').combine_chunks()
+    assert pa.types.is_dictionary(combined.type)
+    assert combined.to_pylist() == [str(LABELS[index % 3]) for index in range(7)]
+    assert combined.indices.to_pylist() == [int(LABELS[index % 3]) for index in range(7)]
+    assert table.column('transformer_label').to_pylist()[:2] == [None, 'negative']
+    assert table.column('transformer_score').to_pylist()[:2] == [None, 0.75]
+
+@pytest.mark.parametrize('filename', ['results.parquet', 'results.arrow'])
+def test_batches_follow_row_groups(tmp_path, filename):
+    path = str(tmp_path / filename)
+    with ResultWriter(path, row_group_size=3) as writer:
+        writer.write_many(analyzed_reviews(7))
+
+    batches = list(iter_result_batches(path, columns=['rating', 'combined_label']))
+    assert [batch.num_rows for batch in batches] == [3, 3, 1]
+    assert all(batch.schema.names == ['rating', 'combined_label'] for batch in batches)
+    assert [value for batch in batches for value in batch.column('rating').to_pylist()] == \
+        [float(1 + index % 5) for index in range(7)]
+    if filename.endswith('.parquet'):
+        assert pa.parquet.ParquetFile(path).num_row_groups == 3
+
+def test_read_selected_columns(tmp_path):
+    path = str(tmp_path / 'results.arrow')
+    with ResultWriter(path) as writer:
+        writer.write_many(analyzed_reviews(4))
+    table = read_results(path, columns=['combined_label', 'combined_score'])
+    assert table.column_names == ['combined_label', 'combined_score']
+    assert table.column('combined_score').to_pylist() == [0.25] * 4
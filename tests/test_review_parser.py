@@ -0,0 +1,102 @@
+from datetime import date, datetime
+import pytest
+from opinion_mining.data_collection.review_parser import clean_text, extract_rating, parse_review_date, parse_review_page
+
+# Hand-written rather than rendered, to cover the markup the renderer never
+# produces: nested tags, entities, stray whitespace, missing or repeated
+# fields and matching hooks outside any review container
+CANNED_PAGE = b'''<html><head><title>Customer reviews</title></head><body>
+<span data-hook="review-body">Not a review, just a matching hook</span>
+<div id="cm_cr-review_list">
+  <div data-hook="review" id="R1">
+    <div class="a-row">
+      <i data-hook="review-star-rating" class="a-icon-star"><span>4.0 out of 5 stars</span></i>
+      <a data-hook="review-title" href="/gp/customer-reviews/R1">
+        <span>Great   value,  <b>really</b></span>
+      </a>
+    </div>
+    <span data-hook="review-date">Reviewed in the United States on March 15, 2024</span>
+    <span data-hook="avp-badge">Verified Purchase</span>
+    <span data-hook="review-body"><span>Works well.<br/>Battery lasts
+        all day &amp; charges fast.</span></span>
+    <span data-hook="review-body">A second body is ignored</span>
+  </div>
+  <div data-hook="review" id="R2">
+    <i data-hook="review-star-rating"><span>1 out of 5 stars</span></i>
+    <a data-hook="review-title"><span>Broke in a week</span></a>
+    <span data-hook="review-date">Reviewed in the United States on January 2, 2023</span>
+    <span data-hook="review-body"><span>Stopped &lt;charging&gt; after 7 days.</span></span>
+  </div>
+  <div data-hook="review" id="R3">
+    <a data-hook="review-title"><span>No rating or body</span></a>
+  </div>
+  <div data-hook="review" id="R4">
+    <i data-hook="review-star-rating"><span>out of five stars</span></i>
+    <span data-hook="review-date">2024-03-15</span>
+    <span data-hook="review-body">Title-less review</span>
+    <span class="badge" data-hook="avp-badge"></span>
+  </div>
+</div>
+</body></html>'''
+
+FIELDS = ('rating', 'title', 'text', 'date', 'verified')
+
+def scraped_fields(review):
+    return {field: review[field] for field in FIELDS}
+
+def legacy_extract(content):
+    """The per-field find() extraction the scraper used before the single-pass parser."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    return [
+        {
+            'rating': extract_rating(review.find('i', {'data-hook': 'review-star-rating'})),
+            'title': clean_text(review.find('a', {'data-hook': 'review-title'})),
+            'text': clean_text(review.find('span', {'data-hook': 'review-body'})),
+            'date': clean_text(review.find('span', {'data-hook': 'review-date'})),
+            'verified': bool(review.find('span', {'data-hook': 'avp-badge'}))
+        }
+        for review in soup.find_all('div', {'data-hook': 'review'})
+    ]
+
+def test_parser_matches_the_legacy_extraction():
+    pytest.importorskip('bs4')
+    reviews = parse_review_page(CANNED_PAGE)
+
+    assert [scraped_fields(review) for review in reviews] == legacy_extract(CANNED_PAGE)
+    assert scraped_fields(reviews[0]) == {
+        'rating': 4.0,
+        'title': 'Great value, really',
+        'text': 'Works well.Battery lasts all day & charges fast.',
+        'date': 'Reviewed in the United States on March 15, 2024',
+        'verified': True
+    }
+    assert [review.rating for review in reviews] == [4.0, 1.0, 0.0, 0.0]
+    assert reviews[1].text == 'Stopped after 7 days.'
+    assert scraped_fields(reviews[2]) == {'rating': 0.0, 'title': 'No rating or body', 'text': '', 'date': '', 'verified': False}
+    # An empty badge still marks the review as verified, as find() did
+    assert reviews[3].verified
+
+def test_parser_accepts_str_content():
+    pytest.importorskip('bs4')
+    assert parse_review_page(CANNED_PAGE.decode('utf-8')) == parse_review_page(CANNED_PAGE)
+
+def test_page_without_reviews():
+    pytest.importorskip('bs4')
+    assert parse_review_page(b'<html><body><p>No reviews yet</p></body></html>') == []
+
+@pytest.mark.parametrize('text, expected', [
+    ('Reviewed in the United States on March 15, 2024', date(2024, 3, 15)),
+    ('March 5, 2024', date(2024, 3, 5)),
+    ('2024-03-15', date(2024, 3, 15)),
+    ('2024-03-15T10:30:00', date(2024, 3, 15)),
+    (datetime(2024, 3, 15, 10, 30), date(2024, 3, 15)),
+    (date(2024, 3, 15), date(2024, 3, 15)),
+    ('Reviewed in the United States on Smarch 15, 2024', None),
+    ('2024-13-45', None),
+    ('', None),
+    (None, None)
+])
+def test_parse_review_date(text, expected):
+    assert parse_review_date(text) == expected
@@ -0,0 +1,96 @@
+import threading
+from datetime import date, timedelta
+import pytest
+from opinion_mining.data_collection.checkpoints import CheckpointStore, review_hash
+from opinion_mining.data_collection.review_parser import parse_review_page
+from opinion_mining.data_collection.review_scraper import ReviewScraper
+from opinion_mining.records import Review
+
+PRODUCT_URL = 'https://www.amazon.com/product-reviews/B000TEST'
+PAGE_SIZE = 10
+
+def make_reviews(prefix: str, count: int, newest: date):
+    return [
+        Review(rating=float(1 + index % 5), title=f'{prefix}{index}', text=f'review text {prefix}{index}',
+               date=f"{(newest - timedelta(days=index)):%B %d, %Y}", verified=index % 2 == 0)
+        for index in range(count)
+    ]
+
+class CannedFetcher:
+    """Serves the current review list, newest first, PAGE_SIZE reviews per page."""
+
+    def __init__(self, review_page, reviews):
+        self.review_page = review_page
+        self.reviews = list(reviews)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str) -> bytes:
+        with self._lock:
+            self.requests += 1
+        page = int(url.rsplit('pageNumber=', 1)[1])
+        return self.review_page(self.reviews[(page - 1) * PAGE_SIZE:page * PAGE_SIZE])
+
+@pytest.mark.parametrize('max_reviews', [10, 15, 7])
+def test_bounded_crawls_resume_without_repeats(tmp_path, review_page, max_reviews):
+    reviews = make_reviews('T', 25, date(2024, 3, 31))
+    fetcher = CannedFetcher(review_page, reviews)
+    store = CheckpointStore(str(tmp_path / 'checkpoints.db'))
+    scraper = ReviewScraper(live=True, fetcher=fetcher, checkpoints=store)
+
+    titles = []
+    for _ in range(10):
+        batch = scraper.collect_reviews(PRODUCT_URL, max_reviews=max_reviews, incremental=True)
+        assert len(batch) <= max_reviews
+        titles.extend(review.title for review in batch)
+
+    assert titles == [review.title for review in reviews]
+
+    # The crawl reached the end, so the newest page became the high-water mark
+    checkpoint = store.load(PRODUCT_URL)
+    page_one = parse_review_page(review_page(reviews[:PAGE_SIZE]))
+    assert checkpoint.seen == tuple(review_hash(review) for review in page_one)
+    assert checkpoint.newest_date == '2024-03-31'
+    assert (checkpoint.page, checkpoint.offset, checkpoint.pending_seen) == (0, 0, ())
+
+    # Only reviews posted since are returned, even when they fill a whole page
+    fetcher.reviews = make_reviews('N', 12, date(2024, 4, 12)) + reviews
+    titles = []
+    for _ in range(3):
+        titles.extend(review.title for review in scraper.collect_reviews(PRODUCT_URL, max_reviews=max_reviews, incremental=True))
+    assert titles == [f'N{index}' for index in range(12)]
+    assert store.load(PRODUCT_URL).newest_date == '2024-04-12'
+
+def test_since_crawl_moves_the_high_water_mark(tmp_path, review_page):
+    fetcher = CannedFetcher(review_page, make_reviews('T', 25, date(2024, 3, 31)))
+    scraper = ReviewScraper(live=True, fetcher=fetcher, checkpoints=CheckpointStore(str(tmp_path / 'checkpoints.db')))
+
+    since = [review.title for review in scraper.collect_reviews(PRODUCT_URL, max_reviews=100, since='2024-03-27',
+                                                                 incremental=True)]
+    assert since == [f'T{index}' for index in range(5)]
+    # The reviews returned above are not returned again
+    assert scraper.collect_reviews(PRODUCT_URL, max_reviews=100, incremental=True) == []
+
+    fetcher.reviews = make_reviews('N', 3, date(2024, 4, 3)) + fetcher.reviews
+    assert [review.title for review in scraper.collect_reviews(PRODUCT_URL, max_reviews=100, incremental=True)] == \
+        ['N0', 'N1', 'N2']
+
+def test_crawls_are_not_incremental_by_default(tmp_path, review_page):
+    fetcher = CannedFetcher(review_page, make_reviews('T', 25, date(2024, 3, 31)))
+    store = CheckpointStore(str(tmp_path / 'checkpoints.db'))
+    scraper = ReviewScraper(live=True, fetcher=fetcher, checkpoints=store)
+
+    scraper.collect_reviews(PRODUCT_URL, max_reviews=100, incremental=True)
+    # e.g. /predict, sharing the scraper with incremental jobs
+    for _ in range(2):
+        assert [review.title for review in scraper.collect_reviews(PRODUCT_URL, max_reviews=10)] == \
+            [f'T{index}' for index in range(10)]
+    assert store.load(PRODUCT_URL).newest_date == '2024-03-31'
+
+def test_limit_without_checkpoints(review_page):
+    fetcher = CannedFetcher(review_page, make_reviews('T', 25, date(2024, 3, 31)))
+    scraper = ReviewScraper(live=True, fetcher=fetcher)
+
+    assert [review.title for review in scraper.iter_reviews(PRODUCT_URL, max_reviews=12)] == \
+        [f'T{index}' for index in range(12)]
+    assert len(scraper.collect_reviews(PRODUCT_URL, max_reviews=100)) == 25
@@ -0,0 +1,71 @@
+import zlib
+import pytest
+from opinion_mining.records import Label, Review, SentimentResult
+
+TEXTS = [
+    'a much longer review text than the rest',
+    'short',
+    None,
+    'medium length text',
+    'tiny',
+    'another review of some length',
+    'x',
+    'the longest review text of them all, by quite a margin'
+]
+
+def expected(text: str) -> SentimentResult:
+    return SentimentResult(Label.POSITIVE if len(text) % 2 else Label.NEGATIVE, zlib.crc32(text.encode('utf-8')) / 2 ** 32)
+
+class EchoPipeline:
+    """Answers each text with a result derived from the text itself, recording the batches it was given."""
+
+    def __init__(self, poison=None):
+        self.poison = poison
+        self.batches = []
+
+    def __call__(self, inputs, batch_size=None, **kwargs):
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        self.batches.append(texts)
+        if self.poison in texts:
+            raise ValueError(f"cannot analyze {self.poison!r}")
+        return [{'label': expected(text).label.name, 'score': expected(text).score} for text in texts]
+
+@pytest.fixture
+def echo(analyzer):
+    analyzer.transformer_analyzer = EchoPipeline()
+    analyzer.batch_size = 3
+    return analyzer.transformer_analyzer
+
+def test_results_follow_input_order(analyzer, echo):
+    results = analyzer._run_transformer_batch(TEXTS)
+
+    assert results == [expected(text) if text is not None else None for text in TEXTS]
+    # Batches of batch_size, filled shortest text first
+    assert [len(batch) for batch in echo.batches] == [3, 3, 1]
+    flattened = [text for batch in echo.batches for text in batch]
+    assert flattened == sorted((text for text in TEXTS if text is not None), key=len)
+
+def test_failed_batch_falls_back_per_text(analyzer, echo):
+    echo.poison = 'short'
+    results = analyzer._run_transformer_batch(TEXTS)
+
+    assert results == [expected(text) if text not in (None, 'short') else None for text in TEXTS]
+    # The first batch failed and was retried one text at a time
+    assert echo.batches[:4] == [['x', 'tiny', 'short'], ['x'], ['tiny'], ['short']]
+
+def test_distinct_texts_are_analyzed_once(analyzer, echo):
+    texts = TEXTS + ['short', 'x', TEXTS[0], None, 'x']
+    results = analyzer._analyze_texts(texts)
+
+    assert sorted(text for batch in echo.batches for text in batch) == sorted(text for text in TEXTS if text is not None)
+    assert set(results) == {text for text in texts if text is not None}
+    assert all(results[text]['transformer'] == expected(text) for text in results)
+
+def test_reviews_get_their_own_text_results(analyzer, echo):
+    texts = ['short', 'medium length text', 'x', 'short', 'another review of some length', 'x']
+    reviews = [Review(rating=3.0, text=text, processed_text=text) for text in texts]
+    analyzed = analyzer.analyze_sentiment(reviews)
+
+    assert [review.processed_text for review in analyzed] == texts
+    assert [review.sentiment.transformer for review in analyzed] == [expected(text) for text in texts]
+    assert sum(len(batch) for batch in echo.batches) == len(set(texts))
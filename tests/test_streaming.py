@@ -0,0 +1,125 @@
+import threading
+import time
+import pytest
+from opinion_mining.main import run_streaming
+from opinion_mining.records import Review
+from opinion_mining.streaming import RunningSummary, StreamingPipeline
+
+TEMPLATES = [
+    'The battery lasts all day and the screen is bright and sharp',
+    'Shipping took three weeks and the box arrived crushed and torn',
+    'Comfortable fit and the fabric still looks new after many washes'
+]
+
+class StubScraper:
+    def __init__(self, reviews):
+        self.reviews = reviews
+
+    def iter_reviews(self, product_url=None, incremental=False):
+        return iter(self.reviews)
+
+def test_streaming_run_stores_fake_review_columns(tmp_path, monkeypatch, processor, stub_analyzer):
+    pytest.importorskip('pyarrow')
+    from opinion_mining.result_store import read_results
+
+    monkeypatch.setenv('STREAM_BATCH_SIZE', '2')
+    # Each pair of near duplicates fills one batch
+    texts = [TEMPLATES[0], TEMPLATES[0] + ' indeed', TEMPLATES[1], TEMPLATES[1] + ' sadly', TEMPLATES[2]]
+    reviews = [Review(rating=4.0, text=text, verified=True) for text in texts]
+    path = str(tmp_path / 'results.parquet')
+    summary = run_streaming(StubScraper(reviews), processor, stub_analyzer, 'https://example.com/p', path)
+    assert summary['total_reviews'] == 5
+
+    table = read_results(path, columns=['is_potentially_fake', 'duplicate_cluster_id'])
+    # Cluster ids stay unique across batches
+    assert table.column('duplicate_cluster_id').to_pylist() == [0, 0, 1, 1, None]
+    assert table.column('is_potentially_fake').to_pylist() == [True, True, True, True, False]
+
+def numbered_reviews(count):
+    return [Review(rating=float(1 + index % 5), text=f'Review {index}') for index in range(count)]
+
+def pipeline_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('pipeline-')]
+
+def wait_for_pipeline_threads(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while pipeline_threads() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pipeline_threads()
+
+def test_results_keep_input_order(stub_processor, stub_analyzer):
+    pipeline = StreamingPipeline(stub_processor, stub_analyzer, batch_size=3, queue_size=1)
+    results = list(pipeline.iter_results(iter(numbered_reviews(20))))
+    assert [review.text for review in results] == [f'Review {index}' for index in range(20)]
+    assert [review.processed_text for review in results] == [f'review {index}' for index in range(20)]
+    assert stub_analyzer.batches == [3] * 6 + [2]
+
+def test_run_summarizes_every_review(stub_processor, stub_analyzer):
+    written = []
+    pipeline = StreamingPipeline(stub_processor, stub_analyzer, batch_size=4)
+    summary = pipeline.run(numbered_reviews(10), sink=written.append)
+    # Ratings 1-5 repeat: 1, 2 negative, 3 neutral, 4, 5 positive
+    assert summary == {
+        'total_reviews': 10, 'positive_count': 4, 'negative_count': 4, 'neutral_count': 2, 'failed_count': 0,
+        'avg_rating': 3.0
+    }
+    assert [review.text for review in written] == [f'Review {index}' for index in range(10)]
+
+def test_summary_counts_reviews_without_a_label():
+    summary = RunningSummary()
+    summary.update(Review(rating=4.0))
+    assert summary.as_dict()['failed_count'] == 1
+    assert RunningSummary().as_dict()['avg_rating'] == 0.0
+
+def endless_reviews():
+    index = 0
+    while True:
+        yield Review(rating=3.0, text=f'Review {index}')
+        index += 1
+
+def test_consumer_stopping_early_releases_the_stages(stub_processor, stub_analyzer):
+    pipeline = StreamingPipeline(stub_processor, stub_analyzer, batch_size=2, queue_size=1)
+    results = pipeline.iter_results(endless_reviews())
+    assert [next(results).text for _ in range(3)] == ['Review 0', 'Review 1', 'Review 2']
+    # Every queue is full by now; closing must not leave a stage blocked on one
+    time.sleep(0.2)
+    closer = threading.Thread(target=results.close)
+    closer.start()
+    closer.join(timeout=5)
+    assert not closer.is_alive()
+    assert wait_for_pipeline_threads() == []
+
+def test_sink_stopping_early_releases_the_stages(stub_processor, stub_analyzer):
+    def sink(review):
+        if review.text == 'Review 5':
+            raise IOError('disk full')
+
+    pipeline = StreamingPipeline(stub_processor, stub_analyzer, batch_size=2, queue_size=1)
+    with pytest.raises(IOError, match='disk full'):
+        pipeline.run(endless_reviews(), sink=sink)
+    assert wait_for_pipeline_threads() == []
+
+class FailingAnalyzer:
+    def __init__(self, fail_on_batch):
+        self.fail_on_batch = fail_on_batch
+        self.batches = 0
+
+    def analyze_sentiment(self, reviews):
+        self.batches += 1
+        if self.batches == self.fail_on_batch:
+            raise RuntimeError('model crashed')
+        return reviews
+
+def failing_source():
+    yield from numbered_reviews(5)
+    raise ValueError('connection reset')
+
+@pytest.mark.parametrize('fail_on_batch, reviews, error', [
+    (2, endless_reviews, RuntimeError),
+    (0, failing_source, ValueError)
+])
+def test_stage_errors_reach_run(stub_processor, fail_on_batch, reviews, error):
+    pipeline = StreamingPipeline(stub_processor, FailingAnalyzer(fail_on_batch), batch_size=2, queue_size=1)
+    with pytest.raises(error):
+        pipeline.run(reviews())
+    assert wait_for_pipeline_threads() == []